@@ -0,0 +1,194 @@
+"""
+Minimal in-process stand-ins for the discord.py objects the cogs and views touch.
+Every REST call awaits `api.call()`, which simulates Discord API latency, so
+benchmarks see realistic interleaving without a gateway connection.
+"""
+import asyncio
+import itertools
+import random
+import time
+
+_ids = itertools.count(10**17)
+
+def next_id():
+    return next(_ids)
+
+class FakeAPI:
+    """Simulated Discord REST API: latency with jitter, plus a call counter."""
+    def __init__(self, latency=0.02, jitter=0.5, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    async def call(self):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency * (1 + self._random.uniform(-self.jitter, self.jitter)))
+
+class FakeUser:
+    def __init__(self, user_id, name=None):
+        self.id = user_id
+        self.name = name or f"user{user_id}"
+        self.display_name = self.name
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __eq__(self, other):
+        return isinstance(other, FakeUser) and other.id == self.id
+
+class FakeMessage:
+    def __init__(self, channel, content=None, embed=None, view=None, file=None):
+        self.id = next_id()
+        self.channel = channel
+        self.content = content
+        self.embed = embed
+        self.view = view
+        self.file = file
+
+    async def delete(self):
+        await self.channel.api.call()
+        self.channel.messages.pop(self.id, None)
+
+class FakeChannel:
+    def __init__(self, api, guild, name, channel_id=None):
+        self.api = api
+        self.guild = guild
+        self.id = channel_id or next_id()
+        self.name = name
+        self.mention = f"<#{self.id}>"
+        self.messages = {}
+        self.deleted = False
+
+    async def send(self, content=None, embed=None, view=None, file=None, **kwargs):
+        await self.api.call()
+        message = FakeMessage(self, content, embed, view, file)
+        self.messages[message.id] = message
+        return message
+
+    async def fetch_message(self, message_id):
+        await self.api.call()
+        return self.messages[message_id]
+
+    async def delete(self, reason=None):
+        await self.api.call()
+        self.deleted = True
+        self.guild.channels.pop(self.id, None)
+
+class FakeGuild:
+    def __init__(self, api, guild_id=None):
+        self.api = api
+        self.id = guild_id or next_id()
+        self.members = {}
+        self.channels = {}
+        self.default_role = FakeUser(self.id, "@everyone")
+        self.me = FakeUser(next_id(), "bot")
+
+    def add_member(self, user):
+        self.members[user.id] = user
+
+    def add_channel(self, name):
+        channel = FakeChannel(self.api, self, name)
+        self.channels[channel.id] = channel
+        return channel
+
+    def get_member(self, user_id):
+        return self.members.get(user_id)
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    async def create_text_channel(self, name, overwrites=None, category=None, reason=None):
+        await self.api.call()
+        return self.add_channel(name)
+
+class FakeResponse:
+    """InteractionResponse stand-in that records when the interaction was first acknowledged."""
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self._done = False
+        self.first_response_at = None
+        self.messages = []
+
+    def is_done(self):
+        return self._done
+
+    async def _respond(self):
+        if self._done:
+            raise RuntimeError("Interaction has already been responded to")
+        await self._interaction.api.call()
+        self._done = True
+        self.first_response_at = time.perf_counter()
+
+    async def defer(self, ephemeral=False, thinking=False):
+        await self._respond()
+
+    async def send_message(self, content=None, **kwargs):
+        await self._respond()
+        self.messages.append(content)
+
+    async def edit_message(self, **kwargs):
+        await self._respond()
+
+    async def send_modal(self, modal):
+        await self._respond()
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self.messages = []
+
+    async def send(self, content=None, **kwargs):
+        await self._interaction.api.call()
+        self.messages.append((content, kwargs))
+
+class FakeInteraction:
+    def __init__(self, api, user, guild=None, channel=None):
+        self.api = api
+        self.id = next_id()
+        self.user = user
+        self.guild = guild
+        self.guild_id = guild.id if guild else None
+        self.channel = channel
+        self.channel_id = channel.id if channel else None
+        self.message = None
+        self.extras = {}
+        self.created_at = time.perf_counter()
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+class FakeBot:
+    """The slice of commands.Bot used by the cogs under benchmark."""
+    def __init__(self, api):
+        self.api = api
+        self.guilds = {}
+        self.user = FakeUser(next_id(), "bot")
+
+    def add_guild(self, guild):
+        self.guilds[guild.id] = guild
+
+    def get_guild(self, guild_id):
+        return self.guilds.get(guild_id)
+
+    def get_channel(self, channel_id):
+        for guild in self.guilds.values():
+            channel = guild.get_channel(channel_id)
+            if channel:
+                return channel
+        return None
+
+    async def fetch_channel(self, channel_id):
+        await self.api.call()
+        channel = self.get_channel(channel_id)
+        if channel is None:
+            raise LookupError(f"Unknown channel {channel_id}")
+        return channel
+
+    async def wait_until_ready(self):
+        return
+
+    def get_cog(self, name):
+        return None
@@ -0,0 +1,177 @@
+"""
+End-to-end benchmark: drives a mix of listing creation, matching, autocomplete, /tisk rendering
+and trade completion through the real cogs against a temporary DB and a fake Discord layer.
+
+Usage:
+    python benchmarks/run.py                                  # default mix, prints a report
+    python benchmarks/run.py --mix write_heavy -c 16 -n 2000
+    python benchmarks/run.py --save-baseline                  # writes benchmarks/baselines/<mix>.json
+    python benchmarks/run.py --compare                        # exit code 1 on regression vs. the baseline
+
+Timings depend on the machine, so baselines are not committed (benchmarks/baselines/ is ignored).
+Record one locally with --save-baseline, on the same machine and with the same options, before
+making a change, then run --compare after it.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database
+from benchmarks.fake_discord import FakeAPI
+from benchmarks.scenario import MIXES, OPERATIONS, SKIP, World
+from services.stats import StatsRegistry
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+DEFAULT_TOLERANCE = 0.25 # allowed relative p95 increase / throughput drop before flagging a regression
+
+async def run_benchmark(mix='default', operations=1000, concurrency=8, api_latency=0.02, seed=0,
+                        species=200, users=100, listings=400):
+    weights = MIXES[mix]
+    names = list(weights)
+    rng = random.Random(seed)
+    latency = StatsRegistry(window=operations)
+    first_response = StatsRegistry(window=operations)
+    remaining = operations
+    skipped = 0
+
+    with tempfile.TemporaryDirectory() as workdir:
+        original_db = database.DB_NAME
+        world = World(FakeAPI(latency=api_latency, seed=seed), workdir, seed=seed, species=species, users=users, listings=listings)
+        try:
+            await world.setup()
+
+            async def worker():
+                nonlocal remaining, skipped
+                while remaining > 0:
+                    remaining -= 1
+                    name = rng.choices(names, weights=[weights[n] for n in names])[0]
+                    started = time.perf_counter()
+                    error = False
+                    result = None
+                    try:
+                        result = await OPERATIONS[name](world, rng)
+                    except Exception as e:
+                        error = True
+                        logging.getLogger('discord').error(f"Benchmark operation {name} failed: {e}")
+                    if result is SKIP:
+                        skipped += 1
+                        continue
+                    latency.add(name, time.perf_counter() - started, error=error)
+                    if result is not None and result.response.first_response_at:
+                        first_response.add(name, result.response.first_response_at - result.created_at)
+
+            started = time.perf_counter()
+            await asyncio.gather(*[worker() for _ in range(concurrency)])
+            duration = time.perf_counter() - started
+        finally:
+            await world.close()
+            database.DB_NAME = original_db
+
+    report = {
+        'config': {'mix': mix, 'operations': operations, 'concurrency': concurrency, 'api_latency': api_latency,
+                   'seed': seed, 'species': species, 'users': users, 'listings': listings},
+        'duration': duration,
+        'throughput': sum(stats.count for _, stats in latency.items()) / duration,
+        'skipped': skipped,
+        'api_calls': world.api.calls,
+        'operations': {},
+    }
+    for name, stats in latency.items():
+        entry = stats.snapshot()
+        entry['throughput'] = stats.count / duration
+        entry['first_response'] = first_response.get(name).percentiles() if first_response.get(name).count else None
+        report['operations'][name] = entry
+    return report
+
+def format_report(report):
+    ms = lambda seconds: f"{seconds * 1000:8.1f}"
+    config = report['config']
+    lines = [
+        f"mix={config['mix']} ops={config['operations']} concurrency={config['concurrency']} api_latency={config['api_latency'] * 1000:.0f}ms",
+        f"duration {report['duration']:.2f}s, throughput {report['throughput']:.1f} ops/s, skipped {report['skipped']}, API calls {report['api_calls']}",
+        "",
+        f"{'operation':<16}{'count':>7}{'err':>5}{'ops/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'ack p95':>9}",
+    ]
+    for name, stats in sorted(report['operations'].items()):
+        ack = ms(stats['first_response']['p95']) if stats['first_response'] else f"{'-':>8}"
+        lines.append(
+            f"{name:<16}{stats['count']:>7}{stats['errors']:>5}{stats['throughput']:>9.1f}"
+            f"{ms(stats['p50'])} {ms(stats['p95'])} {ms(stats['p99'])} {ms(stats['max'])} {ack}"
+        )
+    return "\n".join(lines)
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Returns a list of regression descriptions (empty if none)."""
+    regressions = []
+    for name, base in baseline['operations'].items():
+        current = report['operations'].get(name)
+        if not current:
+            continue
+        if base['p95'] and current['p95'] > base['p95'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95'] * 1000:.1f} ms -> {current['p95'] * 1000:.1f} ms")
+        if base['throughput'] and current['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['throughput']:.1f} -> {current['throughput']:.1f} ops/s")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end bot benchmark with a fake Discord layer.")
+    parser.add_argument('--mix', choices=sorted(MIXES), default='default')
+    parser.add_argument('-n', '--operations', type=int, default=1000)
+    parser.add_argument('-c', '--concurrency', type=int, default=8)
+    parser.add_argument('--api-latency', type=float, default=20, help="Simulated Discord API latency in ms")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--species', type=int, default=200)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--listings', type=int, default=400)
+    parser.add_argument('--baseline', help="Baseline file (default: benchmarks/baselines/<mix>.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="Record this run as the local baseline")
+    parser.add_argument('--compare', action='store_true', help="Compare with a baseline recorded on this machine")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--json', help="Also write the report to this file")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Keep bot logging (noisy)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    logging.getLogger('discord').setLevel(logging.INFO if args.verbose else logging.CRITICAL)
+
+    report = asyncio.run(run_benchmark(args.mix, args.operations, args.concurrency, args.api_latency / 1000, args.seed,
+                                       args.species, args.users, args.listings))
+    print(format_report(report))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{args.mix}.json")
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {baseline_path}")
+
+    if args.compare:
+        try:
+            with open(baseline_path, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            print(f"\nNo baseline at {baseline_path}, run with --save-baseline first.")
+            sys.exit(2)
+        if baseline['config'] != report['config']:
+            print("\nWarning: baseline was recorded with a different configuration.")
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions vs. baseline:\n" + "\n".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions vs. baseline.")
+
+if __name__ == "__main__":
+    main()
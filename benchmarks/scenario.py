@@ -0,0 +1,164 @@
+"""
+Benchmark world (temporary DB, fake guild, cogs under test) and the operations the load mix is made of.
+"""
+import os
+import random
+import time
+from io import BytesIO
+from PIL import Image
+import database
+import views.trade
+from cogs.listings import Listings
+from cogs.printing import Printing
+from data.pokemon_source import POKEMON_NAMES
+from services.qr_cache import qr_cache
+from services.sprites import SpriteStore, sprite_filename
+from benchmarks.fake_discord import FakeBot, FakeGuild, FakeInteraction, FakeUser
+
+TEAMS = ["Mystic", "Valor", "Instinct"]
+REGIONS = ["Praha", "Brno", "Ostrava", "Plzeň", "Olomouc"]
+
+def _sprite_png(seed):
+    img = Image.new("RGBA", (96, 96), ((seed * 37) % 256, (seed * 91) % 256, (seed * 53) % 256, 255))
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+class World:
+    """Seeded benchmark state: species, users with accounts, initial listings, and the cogs wired to fakes."""
+    def __init__(self, api, workdir, seed=0, species=200, users=100, listings=400):
+        self.api = api
+        self.workdir = workdir
+        self.random = random.Random(seed)
+        self.species_count = species
+        self.user_count = users
+        self.listing_count = listings
+        self.species = [] # (species_id, name)
+        self.accounts = [] # account dicts
+        self.trades_in_progress = set()
+        self._restore = (qr_cache.cache_dir, views.trade.CHANNEL_DELETE_DELAY)
+
+    async def setup(self):
+        database.DB_NAME = os.path.join(self.workdir, "bench.db")
+        await database.init_db()
+
+        # Sprites/QR codes go to the work dir, so rendering never touches the network or data/
+        self.sprites = SpriteStore(os.path.join(self.workdir, "sprites"), os.path.join(self.workdir, "sprites", "manifest.json"))
+        qr_cache.cache_dir = os.path.join(self.workdir, "qr")
+
+        dex = sorted(POKEMON_NAMES.items(), key=lambda item: item[1])[:self.species_count]
+        for name, num in dex:
+            url, shiny_url = f"bench://{num}", f"bench://{num}/shiny"
+            species_id = await database.upsert_pokemon_species(num, name, "Normal", "Normal", image_url=url, shiny_image_url=shiny_url)
+            self.species.append((species_id, name))
+            self.sprites._store_sync(sprite_filename(num, "Normal", None, False), url, _sprite_png(num))
+            self.sprites._store_sync(sprite_filename(num, "Normal", None, True), shiny_url, _sprite_png(num + 7))
+
+        self.bot = FakeBot(self.api)
+        self.guild = FakeGuild(self.api)
+        self.bot.add_guild(self.guild)
+        self.channel = self.guild.add_channel("obchody")
+
+        for i in range(self.user_count):
+            user = FakeUser(1000 + i)
+            self.guild.add_member(user)
+            await database.add_user_account(
+                user_id=user.id,
+                friend_code=f"{self.random.randrange(10**11, 10**12)}",
+                team=self.random.choice(TEAMS),
+                region=self.random.choice(REGIONS),
+                account_name=f"Trainer{i}",
+            )
+            self.accounts.extend(await database.get_user_accounts(user.id))
+
+        for _ in range(self.listing_count):
+            account = self.random.choice(self.accounts)
+            species_id, _ = self.random.choice(self.species)
+            await database.add_listing(account['user_id'], account['id'], self.random.choice(["HAVE", "WANT"]), species_id,
+                                       is_shiny=self.random.random() < 0.1, guild_id=self.guild.id)
+
+        self.listings = Listings(self.bot)
+        self.printing = Printing(self.bot)
+        self.printing.generator.sprites = self.sprites
+        views.trade.CHANNEL_DELETE_DELAY = 0
+
+    async def close(self):
+        qr_cache.cache_dir, views.trade.CHANNEL_DELETE_DELAY = self._restore
+        if hasattr(self, 'printing'):
+            await self.printing.generator.sprites.close()
+
+    def interaction(self, user_id, channel=None):
+        return FakeInteraction(self.api, self.guild.get_member(user_id), self.guild, channel or self.channel)
+
+# --- Operations: each returns an interaction (for time to first response), None, or SKIP ---
+
+SKIP = object()
+
+async def op_create_listing(world, rng):
+    account = rng.choice(world.accounts)
+    species_id, name = rng.choice(world.species)
+    interaction = world.interaction(account['user_id'])
+    await world.listings.create_listing_final(
+        interaction, account['id'], rng.choice(["HAVE", "WANT"]), species_id, name,
+        rng.random() < 0.1, False, False, False, False, False, False,
+        None, count=rng.randint(1, 3),
+    )
+    return interaction
+
+async def op_match(world, rng):
+    jobs = await database.claim_match_jobs(time.time(), limit=1)
+    if not jobs:
+        return SKIP
+    try:
+        await world.listings._process_match_job(jobs[0])
+    finally:
+        await database.complete_match_job(jobs[0]['listing_id'])
+    return None
+
+async def op_autocomplete(world, rng):
+    _, name = rng.choice(world.species)
+    interaction = world.interaction(rng.choice(world.accounts)['user_id'])
+    await world.listings.pokemon_autocomplete(interaction, name[:rng.randint(1, 4)].lower())
+    return None
+
+async def op_print(world, rng):
+    account = rng.choice(world.accounts)
+    interaction = world.interaction(account['user_id'])
+    await interaction.response.defer()
+    await world.printing.generate_and_send(interaction, account, rng.choice(["HAVE", "WANT"]))
+    return interaction
+
+async def op_complete_trade(world, rng):
+    async with database.get_db() as db:
+        async with db.execute("SELECT t.id, t.channel_id, l.user_id FROM trades t JOIN listings l ON l.id = t.listing_a_id WHERE t.status = 'OPEN' AND t.channel_id IS NOT NULL") as cursor:
+            trades = [t for t in await cursor.fetchall() if t['id'] not in world.trades_in_progress]
+    if not trades:
+        return SKIP
+    trade = rng.choice(trades)
+    channel = world.guild.get_channel(trade['channel_id'])
+    if channel is None:
+        return SKIP
+
+    world.trades_in_progress.add(trade['id'])
+    try:
+        interaction = world.interaction(trade['user_id'], channel)
+        view = views.trade.TradeView()
+        await views.trade.TradeView.complete_trade(view, interaction, None)
+    finally:
+        world.trades_in_progress.discard(trade['id'])
+    return interaction
+
+OPERATIONS = {
+    'create_listing': op_create_listing,
+    'match': op_match,
+    'autocomplete': op_autocomplete,
+    'print': op_print,
+    'complete_trade': op_complete_trade,
+}
+
+# Relative weights; roughly a busy evening on the server
+MIXES = {
+    'default': {'create_listing': 25, 'match': 25, 'autocomplete': 35, 'print': 5, 'complete_trade': 10},
+    'write_heavy': {'create_listing': 45, 'match': 40, 'autocomplete': 5, 'complete_trade': 10},
+    'render': {'print': 80, 'autocomplete': 20},
+}
@@ -1,17 +1,105 @@
-from discord.ext import commands
+from discord.ext import commands, tasks
 import discord
 import os
 import sys
 import logging
 import asyncio
+import tempfile
+import datetime
 import database
 import services.pokemon_sync as pokemon_sync
+from services.sprites import get_sprite_store
+from services.db_metrics import db_metrics
+from services.metrics import track_loop
+from services.loop_watchdog import loop_watchdog
+from services.cluster import leader
+from services.backup import (backup_changes, backup_database, backup_taken_at, bundle_segments, iter_upload_parts, last_delivered,
+                             list_backups, list_segments, record_delivered, restore_backup)
+from services.interaction_metrics import interaction_metrics, INTERACTION_DEADLINE
 
 logger = logging.getLogger('discord')
 
+DAILY_BACKUP_INTERVAL = datetime.timedelta(hours=24)
+
 class Admin(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.sprite_warmup_task = None
+        self.db_stats_snapshot.start()
+        self.daily_backup.start()
+        self.changes_backup.start()
+
+    def cog_unload(self):
+        self.db_stats_snapshot.cancel()
+        self.daily_backup.cancel()
+        self.changes_backup.cancel()
+
+    @tasks.loop(hours=1)
+    @track_loop('daily_backup')
+    async def daily_backup(self):
+        """
+        Keeps a rotating set of local daily backups. Checked hourly against the newest daily
+        snapshot, so restarts and leader handovers don't take extra ones.
+        """
+        if not leader.is_leader:
+            return
+        latest = list_backups(label="daily")
+        if latest and datetime.datetime.now() - backup_taken_at(latest[0]) < DAILY_BACKUP_INTERVAL:
+            return
+        try:
+            await backup_database(label="daily")
+        except Exception as e:
+            logger.error(f"Daily backup failed: {e}")
+
+    @tasks.loop(hours=1)
+    @track_loop('changes_backup')
+    async def changes_backup(self):
+        """Incremental backup between the daily snapshots: only the rows changed since the last segment."""
+        if not leader.is_leader:
+            return
+        try:
+            await backup_changes()
+        except Exception as e:
+            logger.error(f"Incremental backup failed: {e}")
+
+    async def _send_backup(self, destination, path, content):
+        """Uploads a backup, split into parts if it exceeds the upload limit."""
+        base = os.path.basename(path)
+        parts = iter_upload_parts(path)
+        sent = 0
+        while True:
+            part = await asyncio.to_thread(next, parts, None)
+            if part is None:
+                break
+            part_name, data = part
+            await destination.send(content=content if sent == 0 else None, file=discord.File(data, filename=part_name))
+            sent += 1
+        if sent > 1:
+            await destination.send(f"Backup split into {sent} parts, join them with `cat {base}.0* > {base}`.")
+
+    @tasks.loop(minutes=5)
+    @track_loop('db_stats_snapshot')
+    async def db_stats_snapshot(self):
+        """Persists the query timings so they survive restarts and can be diffed."""
+        try:
+            await asyncio.to_thread(db_metrics.write_snapshot)
+        except Exception as e:
+            logger.error(f"Failed to write DB stats snapshot: {e}")
+
+    async def _warm_sprites(self, channel):
+        """Background job: downloads sprites for every species/costume/shiny variant."""
+        try:
+            species = await database.get_all_pokemon_species()
+            downloaded, missing, dropped = await get_sprite_store().warm(species)
+            await channel.send(f"🖼️ Sprite warm-up done: {downloaded} downloaded, {missing} unavailable, {dropped} corrupt removed.")
+        except Exception as e:
+            logger.error(f"Sprite warm-up failed: {e}")
+
+    def _start_sprite_warmup(self, channel):
+        if self.sprite_warmup_task and not self.sprite_warmup_task.done():
+            logger.info("Sprite warm-up already running, skipping.")
+            return
+        self.sprite_warmup_task = asyncio.create_task(self._warm_sprites(channel))
 
     @commands.command()
     @commands.has_permissions(administrator=True)
@@ -102,30 +190,26 @@ class Admin(commands.Cog):
         logger.info("Starting bot update...")
 
         db_file = database.DB_NAME
-        backup_file = f"{db_file}.bak"
         owner = None
 
         try:
-            # 1. Send backup to owner
+            # 1. Local backup for rollback (consistent snapshot, kept in the retention set)
             app_info = await self.bot.application_info()
             owner = app_info.owner
 
             if os.path.exists(db_file):
+                info = await backup_database(label="pre-update")
+                logger.info(f"Local backup created at {info.path}")
+
+                # 2. Send backup to owner
                 try:
-                    await owner.send(
-                        content="Automatic backup before updatebot.",
-                        file=discord.File(db_file)
-                    )
-                    await msg.edit(content="Backup sent to owner's DM. Creating local backup...")
+                    await self._send_backup(owner, info.path, "Automatic backup before updatebot.")
+                    record_delivered(info.path)
+                    await msg.edit(content="Backup created and sent to owner's DM.")
                     logger.info(f"Pre-update database backup sent to {owner}.")
                 except discord.Forbidden:
                     await msg.edit(content="Could not send DM to owner for backup, but continuing update...")
                     logger.error("Could not send DM to owner for pre-update backup.")
-
-                # 2. Create local backup for rollback
-                import shutil
-                shutil.copy2(db_file, backup_file)
-                logger.info(f"Local backup created at {backup_file}")
             else:
                 await msg.edit(content="No database file found to backup. Continuing update...")
 
@@ -197,19 +281,13 @@ class Admin(commands.Cog):
             logger.info(f"Git rollback successful: {stdout.decode()}")
             await msg.edit(content="Git rollback successful. Restoring database...")
 
-            # 2. Restore database from backup
-            db_file = database.DB_NAME
-            backup_file = f"{db_file}.bak"
-            import shutil
-
-            if os.path.exists(backup_file):
-                # We could move it, but copy is safer if they want to rollback again, though HEAD@{1} logic might get messy.
-                # Actually, simple move is fine for a rollback. Let's just copy so the backup remains.
-                shutil.copy2(backup_file, db_file)
-                logger.info(f"Database restored from {backup_file}")
-                await msg.edit(content="Database restored from backup. Installing dependencies...")
+            # 2. Restore database from the newest pre-update backup (the backup itself is kept)
+            backups = list_backups(label="pre-update")
+            if backups:
+                await asyncio.to_thread(restore_backup, backups[0], rebase=True)
+                await msg.edit(content=f"Database restored from `{os.path.basename(backups[0])}`. Installing dependencies...")
             else:
-                logger.warning(f"No local backup found at {backup_file}.")
+                logger.warning("No pre-update backup found.")
                 await msg.edit(content="Warning: No local database backup found to restore. Installing dependencies...")
 
             # 3. Re-install dependencies
@@ -235,8 +313,12 @@ class Admin(commands.Cog):
             await msg.edit(content=f"An error occurred during rollback: {e}")
 
     @commands.command()
-    async def backup(self, ctx):
-        """Sends a backup of the database to the bot owner."""
+    async def backup(self, ctx, mode: str = "changes"):
+        """
+        Sends a backup of the database to the bot owner.
+        Usage: !backup        (changes since the last full backup sent to the owner; a full backup if none was sent)
+               !backup full   (full snapshot)
+        """
         # Check if user is owner
         is_owner = await self.bot.is_owner(ctx.author)
         if not is_owner:
@@ -253,11 +335,25 @@ class Admin(commands.Cog):
             app_info = await self.bot.application_info()
             owner = app_info.owner
 
-            await owner.send(
-                content="Here is the database backup.",
-                file=discord.File(db_file)
-            )
-            await ctx.send("Backup sent to owner's DM.")
+            # Changes only make sense on top of a snapshot the owner actually has
+            base = last_delivered()
+            if mode != "full" and base:
+                await backup_changes()
+                segments = list_segments(since=base)
+                if not segments:
+                    return await ctx.send(f"No changes since the full backup `{os.path.basename(base)}`.")
+                with tempfile.TemporaryDirectory() as tmp:
+                    bundle = await asyncio.to_thread(bundle_segments, segments, tmp)
+                    await self._send_backup(owner, bundle, f"Changes since the full backup `{os.path.basename(base)}` "
+                                                           f"(restore with `python scripts/restore_backup.py`).")
+                await ctx.send(f"Incremental backup ({len(segments)} segments) sent to owner's DM.")
+                logger.info(f"Incremental database backup sent to {owner}.")
+                return
+
+            info = await backup_database(label="manual")
+            await self._send_backup(owner, info.path, f"Here is the database backup ({info.db_size / 1024 / 1024:.1f} MiB, gzip).")
+            record_delivered(info.path)
+            await ctx.send(f"Backup `{info.filename}` sent to owner's DM.")
             logger.info(f"Database backup sent to {owner}.")
 
         except discord.Forbidden:
@@ -267,6 +363,141 @@ class Admin(commands.Cog):
             await ctx.send(f"An error occurred: {e}")
             logger.error(f"Backup failed: {e}")
 
+    @commands.command()
+    async def startup(self, ctx):
+        """Shows how long each startup phase took."""
+        is_owner = await self.bot.is_owner(ctx.author)
+        if not is_owner:
+            app_info = await self.bot.application_info()
+            if ctx.author.id != app_info.owner.id:
+                return await ctx.send("You do not have permission to use this command.")
+
+        timings = getattr(self.bot, 'startup_timings', None)
+        if not timings:
+            return await ctx.send("No startup timings recorded.")
+        await ctx.send(f"**Startup timings**\n```\n{self.bot.format_startup_timings()}\n```")
+
+    @commands.command()
+    async def matchqueue(self, ctx):
+        """Shows the background match queue length and wait times."""
+        is_owner = await self.bot.is_owner(ctx.author)
+        if not is_owner:
+            app_info = await self.bot.application_info()
+            if ctx.author.id != app_info.owner.id:
+                return await ctx.send("You do not have permission to use this command.")
+
+        listings_cog = self.bot.get_cog('Listings')
+        if not listings_cog:
+            return await ctx.send("Listings cog is not loaded.")
+
+        stats = await listings_cog.match_queue.stats()
+        await ctx.send(
+            f"**Match queue** ({stats['workers']} workers)\n"
+            f"Queued: {stats['queued']} (due {stats['due']}, in progress {stats['in_progress']}, retrying {stats['retrying']})\n"
+            f"Oldest job: {stats['oldest_age']:.1f}s\n"
+            f"Processed: {stats['processed']}, failed attempts: {stats['failed']}, dropped: {stats['dropped']}\n"
+            f"Wait p50/p95/max: {stats['wait_p50']:.2f}s / {stats['wait_p95']:.2f}s / {stats['wait_max']:.2f}s\n"
+            f"Run p50/p95: {stats['run_p50']:.2f}s / {stats['run_p95']:.2f}s"
+        )
+
+    @commands.command()
+    async def dbstats(self, ctx, limit: int = 10):
+        """Shows the slowest database statements, connection/commit times and recent slow queries."""
+        is_owner = await self.bot.is_owner(ctx.author)
+        if not is_owner:
+            app_info = await self.bot.application_info()
+            if ctx.author.id != app_info.owner.id:
+                return await ctx.send("You do not have permission to use this command.")
+
+        ms = lambda seconds: f"{seconds * 1000:.1f}"
+        lines = ["total ms | count | p50/p95/p99/max ms | rows | helper | sql"]
+        for name, stats in db_metrics.statements.top(limit):
+            lines.append(
+                f"{ms(stats['total'])} | {stats['count']} | "
+                f"{ms(stats['p50'])}/{ms(stats['p95'])}/{ms(stats['p99'])}/{ms(stats['max'])} | "
+                f"{stats['rows']} | {name[:140]}"
+            )
+        connect = db_metrics.connect.snapshot()
+        commit = db_metrics.commit.snapshot()
+        lines.append("")
+        lines.append(f"connect: {connect['count']}x p50/p95/p99 {ms(connect['p50'])}/{ms(connect['p95'])}/{ms(connect['p99'])} ms")
+        lines.append(f"commit:  {commit['count']}x p50/p95/p99 {ms(commit['p50'])}/{ms(commit['p95'])}/{ms(commit['p99'])} ms")
+
+        slow = list(db_metrics.slow_queries)[-5:]
+        if slow:
+            lines.append("")
+            lines.append("recent slow queries:")
+            for entry in reversed(slow):
+                lines.append(f"{ms(entry['seconds'])} ms {entry['helper']}: {entry['sql'][:160]}")
+                for detail in entry['plan'] or []:
+                    lines.append(f"    {detail}")
+
+        text = "\n".join(lines)
+        if len(text) > 1900:
+            text = text[:1900] + "\n…"
+        await ctx.send(f"**Database timings**\n```\n{text}\n```")
+
+    @commands.command()
+    async def latency(self, ctx, limit: int = 15):
+        """Shows command/view latency percentiles, slowest first response first."""
+        is_owner = await self.bot.is_owner(ctx.author)
+        if not is_owner:
+            app_info = await self.bot.application_info()
+            if ctx.author.id != app_info.owner.id:
+                return await ctx.send("You do not have permission to use this command.")
+
+        snapshot = interaction_metrics.snapshot()
+        if not snapshot:
+            return await ctx.send("No interactions recorded yet.")
+
+        ms = lambda seconds: f"{seconds * 1000:.0f}"
+        rows = sorted(snapshot.items(), key=lambda item: item[1]['first_response']['p95'], reverse=True)[:limit]
+        lines = ["name | count/err | first resp p50/p95/p99 ms | defer p95 | total p95 | late/unanswered"]
+        for name, stats in rows:
+            first = stats['first_response']
+            lines.append(
+                f"{name} | {stats['count']}/{stats['errors']} | "
+                f"{ms(first['p50'])}/{ms(first['p95'])}/{ms(first['p99'])} | "
+                f"{ms(stats['defer']['p95'])} | {ms(stats['p95'])} | {stats['late']}/{stats['unanswered']}"
+            )
+
+        text = "\n".join(lines)
+        if len(text) > 1900:
+            text = text[:1900] + "\n…"
+        await ctx.send(f"**Interaction latency** (deadline {INTERACTION_DEADLINE:.0f}s)\n```\n{text}\n```")
+
+    @commands.command()
+    async def blockers(self, ctx, argument: str = None):
+        """
+        Shows the code that blocked the event loop the longest.
+        Usage:
+        !blockers        - Top 5 blockers with the stack of their latest stall.
+        !blockers reset  - Clears the collected blockers.
+        """
+        is_owner = await self.bot.is_owner(ctx.author)
+        if not is_owner:
+            app_info = await self.bot.application_info()
+            if ctx.author.id != app_info.owner.id:
+                return await ctx.send("You do not have permission to use this command.")
+
+        if argument == "reset":
+            loop_watchdog.reset()
+            return await ctx.send("Blocker statistics cleared.")
+
+        top = loop_watchdog.top(5)
+        if not top:
+            return await ctx.send(f"No event loop stalls over {loop_watchdog.threshold * 1000:.0f} ms recorded.")
+
+        await ctx.send(f"**Event loop blockers** ({loop_watchdog.blocks} stalls over {loop_watchdog.threshold * 1000:.0f} ms)")
+        for blocker in top:
+            stack = "".join(blocker.stack[-6:])
+            if len(stack) > 1500:
+                stack = "…" + stack[-1500:]
+            await ctx.send(
+                f"`{blocker.key}` - {blocker.count}x, total {blocker.total:.2f}s, max {blocker.max:.2f}s\n"
+                f"```\n{stack}```"
+            )
+
     @commands.command()
     async def scrape(self, ctx, argument: str = None):
         """
@@ -315,9 +546,26 @@ class Admin(commands.Cog):
                 await msg.edit(content=f"✅ Scraped data for Pokemon ID {target_id}.")
             else:
                 await msg.edit(content=f"✅ Finished scraping {pokemon_sync.MAX_POKEMON_ID} Pokemon.")
+
+            self.bot.species_count = await database.count_pokemon_species()
+
+            # Pre-download sprites in the background so /tisk doesn't have to
+            self._start_sprite_warmup(ctx.channel)
         except Exception as e:
             logger.error(f"Scrape command failed: {e}")
             await msg.edit(content=f"❌ An error occurred during scraping: {e}")
 
+    @daily_backup.before_loop
+    async def before_daily_backup(self):
+        await self.bot.wait_until_ready()
+
+    @changes_backup.before_loop
+    async def before_changes_backup(self):
+        await self.bot.wait_until_ready()
+
+    @db_stats_snapshot.before_loop
+    async def before_db_stats_snapshot(self):
+        await self.bot.wait_until_ready()
+
 async def setup(bot):
     await bot.add_cog(Admin(bot))
@@ -5,16 +5,65 @@ import database
 import logging
 import datetime
 import re
+import asyncio
+import time
+from services.message_purge import purge_messages
+from services.metrics import Gauge, track_loop
+from services.cluster import leader, owns_guild
 
 logger = logging.getLogger('discord')
 
+LEDGER_BATCH = 1000
+# Delete attempts before a ledger message that keeps failing transiently is given up on
+LEDGER_MAX_ATTEMPTS = 5
+# Max concurrent Discord API calls shared by all channel workers
+API_CONCURRENCY = 4
+# Max messages read from channel history per channel and tick
+HISTORY_SCAN_LIMIT = 500
+
+LEDGER_PENDING = Gauge('bot_autodelete_ledger_pending', 'Autodelete ledger rows waiting to be written.')
+
 class AutoDelete(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # channel_id -> duration_minutes
+        self.channels = {}
+        # Ledger rows seen by on_message, not yet written to DB
+        self.pending = []
+        # channel_id -> unix time since when on_message is recording that channel.
+        # Anything older has to be found by a (watermarked) history sweep.
+        self.listening_since = {}
+        self.api_budget = asyncio.Semaphore(API_CONCURRENCY)
+        LEDGER_PENDING.set_function(lambda: len(self.pending))
         self.autodelete_task.start()
+        self.ledger_flush_task.start()
+
+    async def cog_load(self):
+        configs = await database.get_autodelete_configs()
+        self.channels = {c['channel_id']: c['duration_minutes'] for c in configs}
+        now = int(time.time())
+        self.listening_since = {channel_id: now for channel_id in self.channels}
 
-    def cog_unload(self):
+    async def cog_unload(self):
         self.autodelete_task.cancel()
+        self.ledger_flush_task.cancel()
+        await self.flush_ledger()
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        """Records messages posted in autodelete channels."""
+        if message.channel.id in self.channels:
+            self.pending.append((message.id, message.channel.id, int(message.created_at.timestamp())))
+
+    async def flush_ledger(self):
+        if not self.pending:
+            return
+        rows, self.pending = self.pending, []
+        try:
+            await database.add_autodelete_messages(rows)
+        except Exception as e:
+            logger.error(f"Error writing autodelete ledger: {e}")
+            self.pending = rows + self.pending
 
     def parse_duration(self, s: str) -> int:
         """Parses duration string like '1h 30m' into minutes."""
@@ -64,6 +113,9 @@ class AutoDelete(commands.Cog):
 
         if cas == "off":
             await database.delete_autodelete_config(channel.id)
+            await database.clear_autodelete_channel(channel.id)
+            self.channels.pop(channel.id, None)
+            self.listening_since.pop(channel.id, None)
             await interaction.response.send_message(f"✅ Automatické mazání pro kanál {channel.mention} bylo vypnuto.", ephemeral=True)
             logger.info(f"User {interaction.user.id} disabled autodelete for channel {channel.id}")
             return
@@ -86,6 +138,8 @@ class AutoDelete(commands.Cog):
             return
 
         await database.set_autodelete_config(channel.id, interaction.guild_id, minutes)
+        self.channels[channel.id] = minutes
+        self.listening_since.setdefault(channel.id, int(time.time()))
 
         duration_desc = f"{minutes} minut"
         if minutes >= 60:
@@ -96,43 +150,125 @@ class AutoDelete(commands.Cog):
         await interaction.response.send_message(f"✅ Automatické mazání pro kanál {channel.mention} nastaveno na zprávy starší než **{duration_desc}**.", ephemeral=True)
         logger.info(f"User {interaction.user.id} set autodelete for channel {channel.id} to {minutes}m")
 
+    @tasks.loop(seconds=30)
+    @track_loop('ledger_flush_task')
+    async def ledger_flush_task(self):
+        await self.flush_ledger()
+
+    async def _resolve_channel(self, channel_id):
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            # Not in cache, try fetch once (may be deleted or no access)
+            try:
+                async with self.api_budget:
+                    channel = await self.bot.fetch_channel(channel_id)
+            except Exception:
+                return None
+        return channel
+
+    async def _sweep_ledger(self, channel, cutoff_ts):
+        """Deletes exactly the due messages recorded in the ledger."""
+        total = 0
+        due = await database.get_due_autodelete_messages(channel.id, cutoff_ts, limit=LEDGER_BATCH)
+        while due:
+            deleted, failed = await purge_messages(channel, due, reason="AutoDelete Task", budget=self.api_budget)
+            # Forget what is gone or can never be deleted; transient failures (rate limit, 5xx) stay for the next tick
+            gone = set(deleted) | set(failed)
+            await database.delete_autodelete_messages(list(gone))
+            total += len(deleted)
+            retry = [m for m in due if m not in gone]
+            if retry:
+                dropped = await database.retry_autodelete_messages(retry, LEDGER_MAX_ATTEMPTS)
+                if dropped:
+                    logger.warning(f"AutoDelete: gave up on {dropped} messages in channel {channel.id} after {LEDGER_MAX_ATTEMPTS} attempts")
+                break # Discord is pushing back, leave the rest of the channel for the next tick
+            if len(due) < LEDGER_BATCH:
+                break
+            due = await database.get_due_autodelete_messages(channel.id, cutoff_ts, limit=LEDGER_BATCH)
+        return total
+
+    async def _sweep_history(self, channel, config, cutoff_ts):
+        """
+        Deletes expired messages the ledger never saw (posted before the listener started).
+        Only scans history between the persisted watermark and the time the listener
+        started, so cleared history is never rescanned.
+        """
+        swept_until = config['swept_until'] or 0
+        end_ts = min(cutoff_ts, self.listening_since.get(channel.id, cutoff_ts))
+        if swept_until >= end_ts:
+            return 0
+
+        after = datetime.datetime.fromtimestamp(swept_until, datetime.timezone.utc) if swept_until else None
+        before = datetime.datetime.fromtimestamp(end_ts, datetime.timezone.utc)
+
+        scanned = [] # (id, created unix time), oldest first
+        async with self.api_budget:
+            async for msg in channel.history(limit=HISTORY_SCAN_LIMIT, after=after, before=before, oldest_first=True):
+                scanned.append((msg.id, int(msg.created_at.timestamp())))
+
+        ids = [message_id for message_id, _ in scanned]
+        deleted, failed = await purge_messages(channel, ids, reason="AutoDelete Task", budget=self.api_budget) if ids else ([], [])
+
+        # Scan hit the limit -> resume after the last message next time
+        watermark = scanned[-1][1] if len(scanned) >= HISTORY_SCAN_LIMIT else end_ts
+        # A transient failure (rate limit, 5xx) holds the watermark just before that message, so it is rescanned
+        gone = set(deleted) | set(failed)
+        retry_ts = next((ts for message_id, ts in scanned if message_id not in gone), None)
+        if retry_ts is not None:
+            watermark = min(watermark, retry_ts - 1)
+        if watermark > swept_until:
+            await database.set_autodelete_watermark(channel.id, watermark)
+        return len(deleted)
+
+    async def _sweep_channel(self, config, now_ts):
+        channel_id = config['channel_id']
+        try:
+            channel = await self._resolve_channel(channel_id)
+            if not channel or not isinstance(channel, discord.TextChannel):
+                return
+
+            cutoff_ts = now_ts - config['duration_minutes'] * 60
+            total = await self._sweep_ledger(channel, cutoff_ts)
+            total += await self._sweep_history(channel, config, cutoff_ts)
+
+            if total > 0:
+                logger.info(f"AutoDelete: Deleted {total} messages in channel {channel.name} ({channel.id})")
+        except Exception as e:
+            logger.error(f"Error in autodelete task for channel {channel_id}: {e}")
+
+    def _owns(self, config):
+        """Each shard process sweeps the channels of its own guilds (it is the one recording their ledger)."""
+        if config['guild_id']:
+            return owns_guild(self.bot, config['guild_id'])
+        return leader.is_leader
+
+    def _needs_history_sweep(self, config, now_ts):
+        cutoff_ts = now_ts - config['duration_minutes'] * 60
+        end_ts = min(cutoff_ts, self.listening_since.get(config['channel_id'], cutoff_ts))
+        return (config['swept_until'] or 0) < end_ts
+
     @tasks.loop(minutes=5)
+    @track_loop('autodelete_task')
     async def autodelete_task(self):
-        configs = await database.get_autodelete_configs()
+        await self.flush_ledger()
+
+        configs = [c for c in await database.get_autodelete_configs() if self._owns(c)]
         if not configs:
             return
 
-        for config in configs:
-            try:
-                channel_id = config['channel_id']
-                duration = config['duration_minutes']
-
-                channel = self.bot.get_channel(channel_id)
-                if not channel:
-                    # Maybe fetch? But task runs often, fetching might be rate limit risky if deleted.
-                    # Just skip if not in cache or try fetch once.
-                    try:
-                        channel = await self.bot.fetch_channel(channel_id)
-                    except:
-                        # Channel deleted or no access
-                        # Optionally delete config?
-                        continue
-
-                if not isinstance(channel, discord.TextChannel):
-                    continue
-
-                # Calculate cutoff time (UTC)
-                cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=duration)
-
-                # Purge
-                # Limit is important. If many messages, we delete in batches.
-                deleted = await channel.purge(limit=100, before=cutoff, reason="AutoDelete Task")
-
-                if len(deleted) > 0:
-                    logger.info(f"AutoDelete: Deleted {len(deleted)} messages in channel {channel.name} ({channel.id})")
-
-            except Exception as e:
-                logger.error(f"Error in autodelete task for channel {config['channel_id']}: {e}")
+        now_ts = int(time.time())
+        backlog = await database.get_autodelete_backlog(now_ts)
+
+        # Skip channels with nothing to do, biggest backlog gets the API budget first
+        work = [c for c in configs if backlog.get(c['channel_id'], 0) > 0 or self._needs_history_sweep(c, now_ts)]
+        work.sort(key=lambda c: backlog.get(c['channel_id'], 0), reverse=True)
+
+        # One worker per channel, all sharing self.api_budget
+        await asyncio.gather(*[self._sweep_channel(c, now_ts) for c in work])
+
+    @ledger_flush_task.before_loop
+    async def before_ledger_flush_task(self):
+        await self.bot.wait_until_ready()
 
     @autodelete_task.before_loop
     async def before_autodelete_task(self):
@@ -2,12 +2,22 @@ import discord
 from discord.ext import commands, tasks
 import database
 import logging
+import asyncio
+from collections import defaultdict
+from services.message_purge import delete_messages_by_id
+from services.trade_sessions import trade_sessions
+from services.metrics import track_loop
+from services.cluster import leader
 
 logger = logging.getLogger('discord')
 
+# Max concurrent Discord API calls of the cleanup jobs
+API_CONCURRENCY = 4
+
 class Cleanup(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.api_budget = asyncio.Semaphore(API_CONCURRENCY)
         self.cleanup_trades.start()
         self.cleanup_departed_users_task.start()
 
@@ -27,111 +37,100 @@ class Cleanup(commands.Cog):
         await database.remove_user_departure(member.id)
         logger.info(f"User {member.id} joined guild {member.guild.id}. Departure record removed.")
 
+    async def _delete_trade_channel(self, trade):
+        channel_id = trade['channel_id']
+        if not channel_id:
+            return
+        try:
+            channel = self.bot.get_channel(channel_id)
+            async with self.api_budget:
+                if not channel:
+                    # Try to fetch if not in cache
+                    channel = await self.bot.fetch_channel(channel_id)
+                await channel.delete(reason="Trade expired (7 days)")
+            logger.info(f"Deleted expired trade channel {channel_id}")
+        except discord.NotFound:
+            logger.warning(f"Channel {channel_id} not found for expired trade {trade['id']}")
+        except Exception as e:
+            logger.error(f"Error fetching/deleting channel {channel_id}: {e}")
+
     @tasks.loop(hours=24) # Run once a day
+    @track_loop('cleanup_trades')
     async def cleanup_trades(self):
+        if not leader.is_leader:
+            return
         logger.info("Starting trade cleanup...")
         try:
-            expired = await database.get_expired_trades(days=7)
+            # Close trades + reactivate listings in one transaction
+            expired, reactivated = await database.close_expired_trades(days=7)
             if not expired:
                 logger.info("No expired trades found.")
                 return
 
-            logger.info(f"Found {len(expired)} expired trades.")
+            logger.info(f"Closed {len(expired)} expired trades, reactivated {len(reactivated)} listings.")
             for trade in expired:
-                try:
-                    # Close trade in DB
-                    await database.close_trade(trade['id'])
-
-                    # Revert listings
-                    await database.update_listing_status(trade['listing_a_id'], 'ACTIVE')
-                    await database.update_listing_status(trade['listing_b_id'], 'ACTIVE')
-
-                    # Delete channel
-                    channel_id = trade['channel_id']
-                    if channel_id:
-                        channel = self.bot.get_channel(channel_id)
-                        if channel:
-                            await channel.delete(reason="Trade expired (7 days)")
-                            logger.info(f"Deleted expired trade channel {channel_id}")
-                        else:
-                            # Try to fetch if not in cache
-                            try:
-                                channel = await self.bot.fetch_channel(channel_id)
-                                await channel.delete(reason="Trade expired (7 days)")
-                                logger.info(f"Deleted expired trade channel {channel_id} (fetched)")
-                            except discord.NotFound:
-                                logger.warning(f"Channel {channel_id} not found for expired trade {trade['id']}")
-                            except Exception as e:
-                                logger.error(f"Error fetching/deleting channel {channel_id}: {e}")
-                except Exception as e:
-                    logger.error(f"Error cleaning up trade {trade['id']}: {e}")
+                trade_sessions.invalidate(trade['channel_id'])
+
+            # Delete channels concurrently (bounded by the API budget)
+            await asyncio.gather(*[self._delete_trade_channel(trade) for trade in expired])
+
+            # Feed the reactivated stock back to the matcher
+            listings_cog = self.bot.get_cog('Listings')
+            if listings_cog:
+                await listings_cog.match_queue.enqueue_many(
+                    (l['id'], l['guild_id']) for l in reactivated if l['guild_id']
+                )
         except Exception as e:
             logger.error(f"Error in cleanup task: {e}")
 
+    async def _resolve_channel(self, channel_id):
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            try:
+                async with self.api_budget:
+                    channel = await self.bot.fetch_channel(channel_id)
+            except Exception:
+                return None
+        return channel
+
+    async def _delete_channel_messages(self, channel_id, message_ids):
+        try:
+            channel = await self._resolve_channel(channel_id)
+            if not channel:
+                return 0
+            deleted = await delete_messages_by_id(channel, message_ids, reason="Departed user cleanup", budget=self.api_budget)
+            return len(deleted)
+        except Exception as e:
+            logger.error(f"Error deleting departed user messages in channel {channel_id}: {e}")
+            return 0
+
     @tasks.loop(hours=1)
+    @track_loop('cleanup_departed_users_task')
     async def cleanup_departed_users_task(self):
         """Cleans up listings of users who departed > 24h ago."""
+        if not leader.is_leader:
+            return
         logger.info("Running departed users cleanup...")
         try:
-            departed_users = await database.get_departed_users(hours=24)
-            if not departed_users:
+            # 1. DB: one join + delete in a single transaction
+            deleted, departed = await database.purge_departed_user_listings(hours=24)
+            if not departed:
                 return
 
-            logger.info(f"Found {len(departed_users)} users who left > 24h ago.")
-
-            for dep in departed_users:
-                user_id = dep['user_id']
-                guild_id = dep['guild_id']
-
-                # Fetch all listings for this user
-                listings = await database.get_user_listings(user_id)
-
-                if listings:
-                    for listing in listings:
-                        should_delete = False
-
-                        # Check Guild ID in DB (if populated)
-                        if listing['guild_id'] is not None:
-                            if listing['guild_id'] == guild_id:
-                                should_delete = True
-
-                        # Fallback: Check Channel Guild
-                        elif listing['channel_id']:
-                            try:
-                                channel = self.bot.get_channel(listing['channel_id'])
-                                if not channel:
-                                    channel = await self.bot.fetch_channel(listing['channel_id'])
-
-                                if channel and channel.guild.id == guild_id:
-                                    should_delete = True
-                            except:
-                                # Can't confirm guild
-                                pass
-
-                        if should_delete:
-                            try:
-                                # Delete Discord Message
-                                if listing['channel_id'] and listing['message_id']:
-                                    try:
-                                        channel = self.bot.get_channel(listing['channel_id'])
-                                        if not channel:
-                                            channel = await self.bot.fetch_channel(listing['channel_id'])
-                                        if channel:
-                                            msg = await channel.fetch_message(listing['message_id'])
-                                            await msg.delete()
-                                    except Exception as e:
-                                        pass # Ignore errors
-
-                                # Delete Listing from DB
-                                await database.delete_listing(listing['id'])
-                                logger.info(f"Deleted listing {listing['id']} for departed user {user_id}")
-
-                            except Exception as e:
-                                logger.error(f"Error deleting listing {listing['id']} for departed user {user_id}: {e}")
-
-                # Remove from departure table
-                await database.remove_user_departure(user_id)
-                logger.info(f"Cleaned up for departed user {user_id}.")
+            logger.info(f"Cleaned up {departed} users who left > 24h ago ({len(deleted)} listings deleted).")
+
+            # 2. Discord: delete listing messages, grouped per channel (bulk delete), channels in parallel
+            by_channel = defaultdict(list)
+            for listing in deleted:
+                if listing['channel_id'] and listing['message_id']:
+                    by_channel[listing['channel_id']].append(listing['message_id'])
+
+            if by_channel:
+                results = await asyncio.gather(*[
+                    self._delete_channel_messages(channel_id, message_ids)
+                    for channel_id, message_ids in by_channel.items()
+                ])
+                logger.info(f"Deleted {sum(results)} listing messages of departed users in {len(by_channel)} channels.")
 
         except Exception as e:
             logger.error(f"Error in cleanup_departed_users_task: {e}")
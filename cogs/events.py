@@ -6,6 +6,8 @@ import datetime
 import pytz
 import database
 import services.scraper as scraper
+from services.metrics import track_loop
+from services.cluster import leader, owns_guild
 
 logger = logging.getLogger('discord')
 
@@ -156,7 +158,10 @@ class Events(commands.Cog):
     # --- Tasks ---
 
     @tasks.loop(time=datetime.time(hour=3, minute=0, tzinfo=TZ_PRAGUE))
+    @track_loop('scrape_task')
     async def scrape_task(self):
+        if not leader.is_leader:
+            return
         logger.info("Running daily scrape task.")
         await self._run_scrape()
 
@@ -186,36 +191,54 @@ class Events(commands.Cog):
         return count
 
     @tasks.loop(minutes=1)
+    @track_loop('notification_task')
     async def notification_task(self):
+        if not leader.is_leader:
+            return
         now_ts = datetime.datetime.now(datetime.timezone.utc).timestamp()
 
         # 2h Warning: [now + 90min, now + 130min]
         events_2h = await database.get_events_for_notification(now_ts + 90*60, now_ts + 130*60, '2h')
+        # 5m Warning: [now + 4min, now + 6min]
+        events_5m = await database.get_events_for_notification(now_ts + 4*60, now_ts + 6*60, '5m')
+        if not events_2h and not events_5m:
+            return
+        targets = await self._event_targets()
+
         if events_2h:
             for event in events_2h:
-                await self._send_notification(event, '2h')
+                await self._send_notification(event, '2h', targets)
             await database.mark_events_notified([e['id'] for e in events_2h], '2h')
 
-        # 5m Warning: [now + 4min, now + 6min]
-        events_5m = await database.get_events_for_notification(now_ts + 4*60, now_ts + 6*60, '5m')
         if events_5m:
             for event in events_5m:
-                await self._send_notification(event, '5m')
+                await self._send_notification(event, '5m', targets)
             await database.mark_events_notified([e['id'] for e in events_5m], '5m')
 
-    async def _send_notification(self, event, notif_type):
-        for guild in self.bot.guilds:
-            config = await database.get_guild_config(guild.id)
-            if not config or not config['event_channel_id']:
-                continue
-
-            channel = guild.get_channel(config['event_channel_id'])
-            if not channel:
-                continue
-
-            role = guild.get_role(config['event_role_id']) if config['event_role_id'] else None
-            role_mention = role.mention if role else ""
-
+    async def _event_targets(self):
+        """
+        (guild_id, channel, role mention) for every guild with an event channel.
+        The leader posts for the whole cluster: guilds on other shard processes are not in its
+        cache, so their channels are addressed by id without a REST lookup.
+        """
+        targets = []
+        for config in await database.get_event_channel_configs():
+            guild = self.bot.get_guild(config['guild_id'])
+            if guild:
+                channel = guild.get_channel(config['event_channel_id'])
+                role = guild.get_role(config['event_role_id']) if config['event_role_id'] else None
+                role_mention = role.mention if role else ""
+            elif owns_guild(self.bot, config['guild_id']):
+                continue # our shard, but the bot is not in the guild (anymore)
+            else:
+                channel = self.bot.get_partial_messageable(config['event_channel_id'], guild_id=config['guild_id'])
+                role_mention = f"<@&{config['event_role_id']}>" if config['event_role_id'] else ""
+            if channel:
+                targets.append((config['guild_id'], channel, role_mention))
+        return targets
+
+    async def _send_notification(self, event, notif_type, targets):
+        for guild_id, channel, role_mention in targets:
             time_str = "2 hodiny" if notif_type == '2h' else "5 minut"
             title_prefix = "⏰ Začíná za"
 
@@ -239,10 +262,13 @@ class Events(commands.Cog):
             try:
                 await channel.send(content=content, embed=embed)
             except Exception as e:
-                logger.error(f"Failed to send notification to guild {guild.id}: {e}")
+                logger.error(f"Failed to send notification to guild {guild_id}: {e}")
 
     @tasks.loop(minutes=1)
+    @track_loop('weekly_summary_task')
     async def weekly_summary_task(self):
+        if not leader.is_leader:
+            return
         now = datetime.datetime.now(TZ_PRAGUE)
         # Check if it is Sunday 20:00
         if now.weekday() != 6 or now.hour != 20 or now.minute != 0:
@@ -279,25 +305,17 @@ class Events(commands.Cog):
             f"📅 Přehled Eventů na Příští Týden ({next_monday.strftime('%d.%m.')} - {next_sunday.strftime('%d.%m.')})"
         )
 
-        for guild in self.bot.guilds:
-            config = await database.get_guild_config(guild.id)
-            if not config or not config['event_channel_id']:
-                continue
-
-            channel = guild.get_channel(config['event_channel_id'])
-            if not channel:
-                continue
-
-            role = guild.get_role(config['event_role_id']) if config['event_role_id'] else None
-            role_mention = role.mention if role else ""
-
+        for guild_id, channel, role_mention in await self._event_targets():
             try:
                 await channel.send(content=f"{role_mention} **Týdenní přehled eventů!**", embed=embed)
             except Exception as e:
-                logger.error(f"Failed to send summary to guild {guild.id}: {e}")
+                logger.error(f"Failed to send summary to guild {guild_id}: {e}")
 
     @tasks.loop(minutes=1)
+    @track_loop('daily_summary_task')
     async def daily_summary_task(self):
+        if not leader.is_leader:
+            return
         now = datetime.datetime.now(TZ_PRAGUE)
         if now.hour != 7 or now.minute != 0:
             return
@@ -325,22 +343,11 @@ class Events(commands.Cog):
 
         embed = self._create_daily_summary_embed(events, "📅 Dnešní Eventy")
 
-        for guild in self.bot.guilds:
-            config = await database.get_guild_config(guild.id)
-            if not config or not config['event_channel_id']:
-                continue
-
-            channel = guild.get_channel(config['event_channel_id'])
-            if not channel:
-                continue
-
-            role = guild.get_role(config['event_role_id']) if config['event_role_id'] else None
-            role_mention = role.mention if role else ""
-
+        for guild_id, channel, role_mention in await self._event_targets():
             try:
                 await channel.send(content=f"{role_mention} **Ranní přehled událostí!**", embed=embed)
             except Exception as e:
-                logger.error(f"Failed to send morning summary to guild {guild.id}: {e}")
+                logger.error(f"Failed to send morning summary to guild {guild_id}: {e}")
 
         # Mark as notified after sending
         await database.mark_events_notified([ev['id'] for ev in events], 'morning')
@@ -356,6 +363,8 @@ class Events(commands.Cog):
     @scrape_task.before_loop
     async def before_scrape(self):
         await self.bot.wait_until_ready()
+        if not leader.is_leader:
+            return
         logger.info("Running initial scrape on boot.")
         await self._run_scrape()
 
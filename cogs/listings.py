@@ -5,7 +5,10 @@ import database
 import services.matcher as matcher
 import views.trade
 from views.listing import ListingDraftView, ListingManagementView
+from services.match_queue import MatchQueue
+from services.trade_sessions import trade_sessions
 import logging
+import asyncio
 # from data.pokemon import POKEMON_NAMES, POKEMON_IDS, POKEMON_IMAGES # REMOVED: Using DB now
 import functools
 
@@ -30,6 +33,42 @@ async def get_user_team_color(user_id):
 class Listings(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # find_match is check-then-lock, so matching itself runs one at a time
+        self.match_lock = asyncio.Lock()
+        self.match_queue = MatchQueue(bot, self._process_match_job)
+
+    async def cog_load(self):
+        await self.match_queue.start()
+
+    async def cog_unload(self):
+        await self.match_queue.stop()
+
+    async def _process_match_job(self, job):
+        """Match queue handler: finds a match for the listing and sets up the trade channel."""
+        guild = self.bot.get_guild(job['guild_id']) if job['guild_id'] else None
+        if not guild:
+            logger.warning(f"Match job for listing {job['listing_id']}: guild {job['guild_id']} not available, skipping.")
+            return
+
+        listing_id = job['listing_id']
+        trade_id = job['trade_id']
+        if trade_id is None:
+            async with self.match_lock:
+                trade_id, match = await matcher.find_match(listing_id)
+            if not trade_id:
+                return
+            await database.set_match_job_trade(listing_id, trade_id)
+        else:
+            # Retry of a job whose trade exists already: only the channel setup is left
+            trade = await database.get_trade(trade_id)
+            if not trade or trade['status'] != 'OPEN' or trade['channel_id']:
+                return
+            other_id = trade['listing_b_id'] if trade['listing_a_id'] == listing_id else trade['listing_a_id']
+            match = await database.get_listing(other_id)
+            if not match:
+                return
+
+        await self._create_trade_channel(guild, trade_id, listing_id, match)
 
     def _format_attributes(self, l):
         # l can be a dict.
@@ -174,7 +213,12 @@ class Listings(commands.Cog):
         return choices
 
     async def _create_trade_channel(self, guild: discord.Guild, trade_id: int, listing_a_id: int, listing_b: dict):
-        """Creates a private trade channel and notifies users."""
+        """
+        Creates a private trade channel and notifies users.
+        On failure a channel created here is removed again before re-raising, so the
+        match queue's retry starts from a trade without a channel instead of adding a second one.
+        """
+        channel = None
         try:
             listing_a = await database.get_listing(listing_a_id)
             # listing_b is already dict
@@ -209,6 +253,7 @@ class Listings(commands.Cog):
 
             channel = await guild.create_text_channel(channel_name, overwrites=overwrites, category=category, reason="Trade Match")
             await database.update_trade_channel(trade_id, channel.id)
+            trade_sessions.invalidate(channel.id)
 
             embed_color = await get_user_team_color(listing_a['user_id'])
             embed = discord.Embed(title="🤝 Shoda Obchodu! (Trade Match!)", description="Byla nalezena shoda pro vaši nabídku/poptávku.", color=embed_color)
@@ -252,6 +297,18 @@ class Listings(commands.Cog):
 
         except Exception as e:
             logger.error(f"Error creating trade channel: {e}")
+            if channel:
+                await self._discard_trade_channel(trade_id, channel)
+            raise
+
+    async def _discard_trade_channel(self, trade_id, channel):
+        """Undoes a half set up trade channel. The DB goes first: a channel the trade still points to is never deleted."""
+        try:
+            await database.update_trade_channel(trade_id, None)
+            trade_sessions.invalidate(channel.id)
+            await channel.delete(reason="Trade channel setup failed")
+        except Exception as e:
+            logger.error(f"Could not remove trade channel {channel.id} of trade {trade_id}: {e}")
 
     async def create_listing_final(self, interaction: discord.Interaction, account_id: int, listing_type: str, pokemon_id: int, pokemon_name: str,
                                    shiny: bool, purified: bool,
@@ -338,17 +395,16 @@ class Listings(commands.Cog):
                                 await msg.delete()
                         except: pass
                     await database.delete_listing(old_listing_id)
+                    trade_sessions.invalidate_listing(old_listing_id)
 
             if not interaction.response.is_done():
                  await interaction.response.send_message(f"✅ Záznam byl úspěšně zveřejněn{msg_loc}.", ephemeral=True)
             else:
                  await interaction.followup.send(f"✅ Záznam byl úspěšně zveřejněn{msg_loc}.", ephemeral=True)
 
-            # Check for matches
+            # Matching + trade channel setup runs in the background match queue
             if interaction.guild:
-                trade_id, match = await matcher.find_match(listing_id)
-                if trade_id:
-                    await self._create_trade_channel(interaction.guild, trade_id, listing_id, match)
+                await self.match_queue.enqueue(listing_id, interaction.guild_id)
 
         except Exception as e:
             logger.error(f"Error adding listing: {e}")
@@ -487,6 +543,7 @@ class Listings(commands.Cog):
             except: pass
 
         await database.delete_listing(listing_id)
+        trade_sessions.invalidate_listing(listing_id)
 
         # We need to remove it from view.listings
         view.listings = [l for l in view.listings if l['id'] != listing_id]
@@ -502,6 +559,7 @@ class Listings(commands.Cog):
 
     async def _edit_details_callback(self, interaction: discord.Interaction, listing_id: int, new_details: str, view: ListingManagementView):
         await database.update_listing_details(listing_id, new_details)
+        trade_sessions.invalidate_listing(listing_id)
 
         listing = await database.get_listing(listing_id)
         if listing['channel_id'] and listing['message_id']:
@@ -3,6 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 import database
 import logging
+from cogs.registration import REGIONS
 
 logger = logging.getLogger('discord')
 
@@ -12,6 +13,8 @@ TEAMS = {
     "Instinct": discord.Color.gold()
 }
 
+SEARCH_LIMIT = 10
+
 class Lookup(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -38,31 +41,24 @@ class Lookup(commands.Cog):
             await interaction.followup.send("❌ Pro použití tohoto příkazu musíte být registrováni (`/registrace`).", ephemeral=True)
             return
 
-        # Perform search
-        results = await database.search_user_accounts(ign)
+        # Perform search (ranked, exact name match first)
+        results = await database.search_user_accounts(ign, limit=SEARCH_LIMIT + 1)
 
         if not results:
             await interaction.followup.send(f"❌ Trenér s jménem obsahujícím **'{ign}'** nebyl nalezen.", ephemeral=True)
             return
 
-        # Filter logic
-        # 1. Exact match (case insensitive)
-        exact_match = next((u for u in results if u['account_name'].lower() == ign.lower()), None)
-
-        if exact_match:
-            await self._show_profile(interaction, exact_match)
-        elif len(results) == 1:
-             await self._show_profile(interaction, results[0])
+        if results[0]['exact_match'] or len(results) == 1:
+            await self._show_profile(interaction, results[0])
         else:
             # Multiple partial matches
-            # Limit to 10
             options = []
-            for u in results[:10]:
+            for u in results[:SEARCH_LIMIT]:
                 options.append(f"• **{u['account_name']}** ({u['team']})")
 
             desc = "\n".join(options)
-            if len(results) > 10:
-                desc += f"\n... a {len(results)-10} dalších."
+            if len(results) > SEARCH_LIMIT:
+                desc += "\n... a další."
 
             embed = discord.Embed(
                 title="🔍 Nalezeno více trenérů",
@@ -110,8 +106,13 @@ class Lookup(commands.Cog):
         await interaction.followup.send(embed=embed, ephemeral=True)
 
     @app_commands.command(name="hledam_pratele", description="Zobrazit trenéry, kteří hledají nové přátele (Find Friends)")
-    async def hledam_pratele(self, interaction: discord.Interaction):
-        """Zobrazí seznam trenérů, kteří mají aktivní příznak 'Chci více přátel'."""
+    @app_commands.describe(tym="Jen trenéři z týmu (Team filter)", region="Jen trenéři z regionu (Region filter)")
+    @app_commands.choices(
+        tym=[app_commands.Choice(name=team, value=team) for team in TEAMS],
+        region=[app_commands.Choice(name=region, value=region) for region in REGIONS]
+    )
+    async def hledam_pratele(self, interaction: discord.Interaction, tym: str = None, region: str = None):
+        """Zobrazí náhodný výběr trenérů, kteří mají aktivní příznak 'Chci více přátel'."""
         await interaction.response.defer(ephemeral=True)
 
         # Check registration
@@ -120,7 +121,8 @@ class Lookup(commands.Cog):
             await interaction.followup.send("❌ Pro použití tohoto příkazu musíte být registrováni (`/registrace`).", ephemeral=True)
             return
 
-        users = await database.get_users_wanting_friends(limit=25)
+        # Random rotating sample, so everyone on the list gets shown in turn
+        users = await database.get_users_wanting_friends(limit=25, team=tym, region=region, exclude_user_id=interaction.user.id)
 
         if not users:
             await interaction.followup.send("❌ Žádní trenéři momentálně nehledají nové přátele.", ephemeral=True)
@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import database
-from services.image_gen import ImageGenerator, MAX_ITEMS
+from services.image_gen import ImageGenerator
 import logging
 
 logger = logging.getLogger('discord')
@@ -48,6 +48,9 @@ class Printing(commands.Cog):
         self.bot = bot
         self.generator = ImageGenerator()
 
+    async def cog_unload(self):
+        await self.generator.sprites.close()
+
     async def generate_and_send(self, interaction: discord.Interaction, account, typ: str):
         try:
             # Fetch listings for specific account
@@ -60,12 +63,6 @@ class Printing(commands.Cog):
                 await interaction.followup.send(f"❌ Účet **{account['account_name']}** nemá žádné záznamy typu '{typ}'.", ephemeral=True)
                 return
 
-            # Warning if too many
-            if len(filtered_listings) > MAX_ITEMS:
-                warning_msg = f"⚠️ Zobrazeno pouze prvních {MAX_ITEMS} záznamů (z celkových {len(filtered_listings)})."
-            else:
-                warning_msg = ""
-
             # Get team color
             team_color = TEAMS.get(account['team'], discord.Color.default())
             color_rgb = team_color.to_rgb()
@@ -75,21 +72,28 @@ class Printing(commands.Cog):
             user_name = account['account_name']
             friend_code = account.get('friend_code')
 
-            # Generate Image
-            image_buffer = await self.generator.generate_card(filtered_listings, title, user_name, color_rgb, friend_code)
+            # Generate and upload page by page
+            sent_pages = 0
+            async for page, total_pages, image_buffer in self.generator.generate_card_pages(filtered_listings, title, user_name, color_rgb, friend_code):
+                if not image_buffer:
+                    continue
 
-            if not image_buffer:
+                suffix = f"_{page}" if total_pages > 1 else ""
+                file = discord.File(image_buffer, filename=f"{typ.lower()}_list_{user_name}{suffix}.png")
+                content = None
+                if sent_pages == 0:
+                    content = f"📄 Seznam **{title}** pro **{user_name}**:"
+                    if total_pages > 1:
+                        content += f"\n{len(filtered_listings)} záznamů na {total_pages} stranách."
+
+                await interaction.followup.send(content=content, file=file, ephemeral=True)
+                sent_pages += 1
+
+            if not sent_pages:
                 await interaction.followup.send("❌ Nepodařilo se vygenerovat obrázek (možná chybí data).", ephemeral=True)
                 return
 
-            # Send
-            file = discord.File(image_buffer, filename=f"{typ.lower()}_list_{user_name}.png")
-            content = f"📄 Seznam **{title}** pro **{user_name}**:"
-            if warning_msg:
-                content += f"\n{warning_msg}"
-
-            await interaction.followup.send(content=content, file=file, ephemeral=True)
-            logger.info(f"Generated print card for account {account['id']} type {typ}")
+            logger.info(f"Generated print card for account {account['id']} type {typ} ({sent_pages} pages)")
 
         except Exception as e:
             logger.error(f"Error in generating card: {e}")
@@ -3,8 +3,9 @@ from discord.ext import commands
 from discord import app_commands, ui
 import database
 import logging
-import qrcode
+import asyncio
 from io import BytesIO
+from services.qr_cache import qr_cache
 
 logger = logging.getLogger('discord')
 
@@ -128,21 +129,8 @@ class Profile(commands.Cog):
                 name = acc['account_name']
                 is_main = "⭐ " if acc['is_main'] else ""
 
-                # Generate QR
-                qr = qrcode.QRCode(
-                    version=1,
-                    error_correction=qrcode.constants.ERROR_CORRECT_L,
-                    box_size=10,
-                    border=4,
-                )
-                qr.add_data(fc)
-                qr.make(fit=True)
-                img = qr.make_image(fill_color="black", back_color="white")
-
-                # Save to buffer
-                buffer = BytesIO()
-                img.save(buffer, format="PNG")
-                buffer.seek(0)
+                # Cached QR (rendered once per friend code)
+                buffer = BytesIO(await asyncio.to_thread(qr_cache.get_png, fc))
 
                 filename = f"qr_{name}_{fc}.png".replace(" ", "_")
                 file = discord.File(buffer, filename=filename)
@@ -4,3 +4,19 @@ from dotenv import load_dotenv
 load_dotenv()
 
 TOKEN = os.getenv("DISCORD_TOKEN")
+
+# Prometheus exporter, bound to localhost by default. METRICS_PORT=0 disables it.
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+# Sharding. SHARD_COUNT unset/0 runs a single unsharded bot; "auto" or a number runs an
+# AutoShardedBot. SHARD_IDS (comma separated) limits this process to some of the shards
+# (needs a numeric SHARD_COUNT), so a cluster of processes can split them (see scripts/run_cluster.py).
+_shards = os.getenv("SHARD_COUNT", "0").strip().lower()
+SHARDED = _shards not in ("", "0")
+SHARD_COUNT = int(_shards) if SHARDED and _shards != "auto" else None
+SHARD_IDS = [int(s) for s in os.getenv("SHARD_IDS", "").split(",") if s.strip()] or None
+if SHARD_IDS and SHARD_COUNT is None and SHARDED:
+    # discord.py needs the total to know which shards the ids refer to
+    raise ValueError("SHARD_IDS requires a numeric SHARD_COUNT, not 'auto'.")
+CLUSTER_ID = os.getenv("CLUSTER_ID", "0")
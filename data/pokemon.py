@@ -1,29 +1,80 @@
-POKEMON_NAMES = {'Bulbasaur': 1, 'Ivysaur': 2, 'Venusaur': 3, 'Charmander': 4, 'Charmeleon': 5, 'Charizard': 6, 'Squirtle': 7, 'Wartortle': 8, 'Blastoise': 9, 'Caterpie': 10, 'Metapod': 11, 'Butterfree': 12, 'Weedle': 13, 'Kakuna': 14, 'Beedrill': 15, 'Pidgey': 16, 'Pidgeotto': 17, 'Pidgeot': 18, 'Rattata': 19, 'Raticate': 20, 'Spearow': 21, 'Fearow': 22, 'Ekans': 23, 'Arbok': 24, 'Pikachu': 25, 'Raichu': 26, 'Sandshrew': 27, 'Sandslash': 28, 'Nidoran♀': 29, 'Nidorina': 30, 'Nidoqueen': 31, 'Nidoran♂': 32, 'Nidorino': 33, 'Nidoking': 34, 'Clefairy': 35, 'Clefable': 36, 'Vulpix': 37, 'Ninetales': 38, 'Jigglypuff': 39, 'Wigglytuff': 40, 'Zubat': 41, 'Golbat': 42, 'Oddish': 43, 'Gloom': 44, 'Vileplume': 45, 'Paras': 46, 'Parasect': 47, 'Venonat': 48, 'Venomoth': 49, 'Diglett': 50, 'Dugtrio': 51, 'Meowth': 52, 'Persian': 53, 'Psyduck': 54, 'Golduck': 55, 'Mankey': 56, 'Primeape': 57, 'Growlithe': 58, 'Arcanine': 59, 'Poliwag': 60, 'Poliwhirl': 61, 'Poliwrath': 62, 'Abra': 63, 'Kadabra': 64, 'Alakazam': 65, 'Machop': 66, 'Machoke': 67, 'Machamp': 68, 'Bellsprout': 69, 'Weepinbell': 70, 'Victreebel': 71, 'Tentacool': 72, 'Tentacruel': 73, 'Geodude': 74, 'Graveler': 75, 'Golem': 76, 'Ponyta': 77, 'Rapidash': 78, 'Slowpoke': 79, 'Slowbro': 80, 'Magnemite': 81, 'Magneton': 82, 'Farfetchd': 83, 'Doduo': 84, 'Dodrio': 85, 'Seel': 86, 'Dewgong': 87, 'Grimer': 88, 'Muk': 89, 'Shellder': 90, 'Cloyster': 91, 'Gastly': 92, 'Haunter': 93, 'Gengar': 94, 'Onix': 95, 'Drowzee': 96, 'Hypno': 97, 'Krabby': 98, 'Kingler': 99, 'Voltorb': 100, 'Electrode': 101, 'Exeggcute': 102, 'Exeggutor': 103, 'Cubone': 104, 'Marowak': 105, 'Hitmonlee': 106, 'Hitmonchan': 107, 'Lickitung': 108, 'Koffing': 109, 'Weezing': 110, 'Rhyhorn': 111, 'Rhydon': 112, 'Chansey': 113, 'Tangela': 114, 'Kangaskhan': 115, 'Horsea': 116, 'Seadra': 117, 'Goldeen': 118, 'Seaking': 119, 'Staryu': 120, 'Starmie': 121, 'Mr Mime': 122, 'Scyther': 123, 'Jynx': 124, 'Electabuzz': 125, 'Magmar': 126, 'Pinsir': 127, 'Tauros': 128, 'Magikarp': 129, 'Gyarados': 130, 'Lapras': 131, 'Ditto': 132, 'Eevee': 133, 'Vaporeon': 134, 'Jolteon': 135, 'Flareon': 136, 'Porygon': 137, 'Omanyte': 138, 'Omastar': 139, 'Kabuto': 140, 'Kabutops': 141, 'Aerodactyl': 142, 'Snorlax': 143, 'Articuno': 144, 'Zapdos': 145, 'Moltres': 146, 'Dratini': 147, 'Dragonair': 148, 'Dragonite': 149, 'Mewtwo': 150, 'Mew': 151, 'Chikorita': 152, 'Bayleef': 153, 'Meganium': 154, 'Cyndaquil': 155, 'Quilava': 156, 'Typhlosion': 157, 'Totodile': 158, 'Croconaw': 159, 'Feraligatr': 160, 'Sentret': 161, 'Furret': 162, 'Hoothoot': 163, 'Noctowl': 164, 'Ledyba': 165, 'Ledian': 166, 'Spinarak': 167, 'Ariados': 168, 'Crobat': 169, 'Chinchou': 170, 'Lanturn': 171, 'Pichu': 172, 'Cleffa': 173, 'Igglybuff': 174, 'Togepi': 175, 'Togetic': 176, 'Natu': 177, 'Xatu': 178, 'Mareep': 179, 'Flaaffy': 180, 'Ampharos': 181, 'Bellossom': 182, 'Marill': 183, 'Azumarill': 184, 'Sudowoodo': 185, 'Politoed': 186, 'Hoppip': 187, 'Skiploom': 188, 'Jumpluff': 189, 'Aipom': 190, 'Sunkern': 191, 'Sunflora': 192, 'Yanma': 193, 'Wooper': 194, 'Quagsire': 195, 'Espeon': 196, 'Umbreon': 197, 'Murkrow': 198, 'Slowking': 199, 'Misdreavus': 200, 'Unown': 201, 'Wobbuffet': 202, 'Girafarig': 203, 'Pineco': 204, 'Forretress': 205, 'Dunsparce': 206, 'Gligar': 207, 'Steelix': 208, 'Snubbull': 209, 'Granbull': 210, 'Qwilfish': 211, 'Scizor': 212, 'Shuckle': 213, 'Heracross': 214, 'Sneasel': 215, 'Teddiursa': 216, 'Ursaring': 217, 'Slugma': 218, 'Magcargo': 219, 'Swinub': 220, 'Piloswine': 221, 'Corsola': 222, 'Remoraid': 223, 'Octillery': 224, 'Delibird': 225, 'Mantine': 226, 'Skarmory': 227, 'Houndour': 228, 'Houndoom': 229, 'Kingdra': 230, 'Phanpy': 231, 'Donphan': 232, 'Porygon2': 233, 'Stantler': 234, 'Smeargle': 235, 'Tyrogue': 236, 'Hitmontop': 237, 'Smoochum': 238, 'Elekid': 239, 'Magby': 240, 'Miltank': 241, 'Blissey': 242, 'Raikou': 243, 'Entei': 244, 'Suicune': 245, 'Larvitar': 246, 'Pupitar': 247, 'Tyranitar': 248, 'Lugia': 249, 'Ho Oh': 250, 'Celebi': 251, 'Treecko': 252, 'Grovyle': 253, 'Sceptile': 254, 'Torchic': 255, 'Combusken': 256, 'Blaziken': 257, 'Mudkip': 258, 'Marshtomp': 259, 'Swampert': 260, 'Poochyena': 261, 'Mightyena': 262, 'Zigzagoon': 263, 'Linoone': 264, 'Wurmple': 265, 'Silcoon': 266, 'Beautifly': 267, 'Cascoon': 268, 'Dustox': 269, 'Lotad': 270, 'Lombre': 271, 'Ludicolo': 272, 'Seedot': 273, 'Nuzleaf': 274, 'Shiftry': 275, 'Taillow': 276, 'Swellow': 277, 'Wingull': 278, 'Pelipper': 279, 'Ralts': 280, 'Kirlia': 281, 'Gardevoir': 282, 'Surskit': 283, 'Masquerain': 284, 'Shroomish': 285, 'Breloom': 286, 'Slakoth': 287, 'Vigoroth': 288, 'Slaking': 289, 'Nincada': 290, 'Ninjask': 291, 'Shedinja': 292, 'Whismur': 293, 'Loudred': 294, 'Exploud': 295, 'Makuhita': 296, 'Hariyama': 297, 'Azurill': 298, 'Nosepass': 299, 'Skitty': 300, 'Delcatty': 301, 'Sableye': 302, 'Mawile': 303, 'Aron': 304, 'Lairon': 305, 'Aggron': 306, 'Meditite': 307, 'Medicham': 308, 'Electrike': 309, 'Manectric': 310, 'Plusle': 311, 'Minun': 312, 'Volbeat': 313, 'Illumise': 314, 'Roselia': 315, 'Gulpin': 316, 'Swalot': 317, 'Carvanha': 318, 'Sharpedo': 319, 'Wailmer': 320, 'Wailord': 321, 'Numel': 322, 'Camerupt': 323, 'Torkoal': 324, 'Spoink': 325, 'Grumpig': 326, 'Spinda': 327, 'Trapinch': 328, 'Vibrava': 329, 'Flygon': 330, 'Cacnea': 331, 'Cacturne': 332, 'Swablu': 333, 'Altaria': 334, 'Zangoose': 335, 'Seviper': 336, 'Lunatone': 337, 'Solrock': 338, 'Barboach': 339, 'Whiscash': 340, 'Corphish': 341, 'Crawdaunt': 342, 'Baltoy': 343, 'Claydol': 344, 'Lileep': 345, 'Cradily': 346, 'Anorith': 347, 'Armaldo': 348, 'Feebas': 349, 'Milotic': 350, 'Castform': 351, 'Kecleon': 352, 'Shuppet': 353, 'Banette': 354, 'Duskull': 355, 'Dusclops': 356, 'Tropius': 357, 'Chimecho': 358, 'Absol': 359, 'Wynaut': 360, 'Snorunt': 361, 'Glalie': 362, 'Spheal': 363, 'Sealeo': 364, 'Walrein': 365, 'Clamperl': 366, 'Huntail': 367, 'Gorebyss': 368, 'Relicanth': 369, 'Luvdisc': 370, 'Bagon': 371, 'Shelgon': 372, 'Salamence': 373, 'Beldum': 374, 'Metang': 375, 'Metagross': 376, 'Regirock': 377, 'Regice': 378, 'Registeel': 379, 'Latias': 380, 'Latios': 381, 'Kyogre': 382, 'Groudon': 383, 'Rayquaza': 384, 'Jirachi': 385, 'Deoxys Normal': 386, 'Turtwig': 387, 'Grotle': 388, 'Torterra': 389, 'Chimchar': 390, 'Monferno': 391, 'Infernape': 392, 'Piplup': 393, 'Prinplup': 394, 'Empoleon': 395, 'Starly': 396, 'Staravia': 397, 'Staraptor': 398, 'Bidoof': 399, 'Bibarel': 400, 'Kricketot': 401, 'Kricketune': 402, 'Shinx': 403, 'Luxio': 404, 'Luxray': 405, 'Budew': 406, 'Roserade': 407, 'Cranidos': 408, 'Rampardos': 409, 'Shieldon': 410, 'Bastiodon': 411, 'Burmy': 412, 'Wormadam Plant': 413, 'Mothim': 414, 'Combee': 415, 'Vespiquen': 416, 'Pachirisu': 417, 'Buizel': 418, 'Floatzel': 419, 'Cherubi': 420, 'Cherrim': 421, 'Shellos': 422, 'Gastrodon': 423, 'Ambipom': 424, 'Drifloon': 425, 'Drifblim': 426, 'Buneary': 427, 'Lopunny': 428, 'Mismagius': 429, 'Honchkrow': 430, 'Glameow': 431, 'Purugly': 432, 'Chingling': 433, 'Stunky': 434, 'Skuntank': 435, 'Bronzor': 436, 'Bronzong': 437, 'Bonsly': 438, 'Mime Jr': 439, 'Happiny': 440, 'Chatot': 441, 'Spiritomb': 442, 'Gible': 443, 'Gabite': 444, 'Garchomp': 445, 'Munchlax': 446, 'Riolu': 447, 'Lucario': 448, 'Hippopotas': 449, 'Hippowdon': 450, 'Skorupi': 451, 'Drapion': 452, 'Croagunk': 453, 'Toxicroak': 454, 'Carnivine': 455, 'Finneon': 456, 'Lumineon': 457, 'Mantyke': 458, 'Snover': 459, 'Abomasnow': 460, 'Weavile': 461, 'Magnezone': 462, 'Lickilicky': 463, 'Rhyperior': 464, 'Tangrowth': 465, 'Electivire': 466, 'Magmortar': 467, 'Togekiss': 468, 'Yanmega': 469, 'Leafeon': 470, 'Glaceon': 471, 'Gliscor': 472, 'Mamoswine': 473, 'Porygon Z': 474, 'Gallade': 475, 'Probopass': 476, 'Dusknoir': 477, 'Froslass': 478, 'Rotom': 479, 'Uxie': 480, 'Mesprit': 481, 'Azelf': 482, 'Dialga': 483, 'Palkia': 484, 'Heatran': 485, 'Regigigas': 486, 'Giratina Altered': 487, 'Cresselia': 488, 'Phione': 489, 'Manaphy': 490, 'Darkrai': 491, 'Shaymin Land': 492, 'Arceus': 493, 'Victini': 494, 'Snivy': 495, 'Servine': 496, 'Serperior': 497, 'Tepig': 498, 'Pignite': 499, 'Emboar': 500, 'Oshawott': 501, 'Dewott': 502, 'Samurott': 503, 'Patrat': 504, 'Watchog': 505, 'Lillipup': 506, 'Herdier': 507, 'Stoutland': 508, 'Purrloin': 509, 'Liepard': 510, 'Pansage': 511, 'Simisage': 512, 'Pansear': 513, 'Simisear': 514, 'Panpour': 515, 'Simipour': 516, 'Munna': 517, 'Musharna': 518, 'Pidove': 519, 'Tranquill': 520, 'Unfezant': 521, 'Blitzle': 522, 'Zebstrika': 523, 'Roggenrola': 524, 'Boldore': 525, 'Gigalith': 526, 'Woobat': 527, 'Swoobat': 528, 'Drilbur': 529, 'Excadrill': 530, 'Audino': 531, 'Timburr': 532, 'Gurdurr': 533, 'Conkeldurr': 534, 'Tympole': 535, 'Palpitoad': 536, 'Seismitoad': 537, 'Throh': 538, 'Sawk': 539, 'Sewaddle': 540, 'Swadloon': 541, 'Leavanny': 542, 'Venipede': 543, 'Whirlipede': 544, 'Scolipede': 545, 'Cottonee': 546, 'Whimsicott': 547, 'Petilil': 548, 'Lilligant': 549, 'Basculin Red Striped': 550, 'Sandile': 551, 'Krokorok': 552, 'Krookodile': 553, 'Darumaka': 554, 'Darmanitan Standard': 555, 'Maractus': 556, 'Dwebble': 557, 'Crustle': 558, 'Scraggy': 559, 'Scrafty': 560, 'Sigilyph': 561, 'Yamask': 562, 'Cofagrigus': 563, 'Tirtouga': 564, 'Carracosta': 565, 'Archen': 566, 'Archeops': 567, 'Trubbish': 568, 'Garbodor': 569, 'Zorua': 570, 'Zoroark': 571, 'Minccino': 572, 'Cinccino': 573, 'Gothita': 574, 'Gothorita': 575, 'Gothitelle': 576, 'Solosis': 577, 'Duosion': 578, 'Reuniclus': 579, 'Ducklett': 580, 'Swanna': 581, 'Vanillite': 582, 'Vanillish': 583, 'Vanilluxe': 584, 'Deerling': 585, 'Sawsbuck': 586, 'Emolga': 587, 'Karrablast': 588, 'Escavalier': 589, 'Foongus': 590, 'Amoonguss': 591, 'Frillish': 592, 'Jellicent': 593, 'Alomomola': 594, 'Joltik': 595, 'Galvantula': 596, 'Ferroseed': 597, 'Ferrothorn': 598, 'Klink': 599, 'Klang': 600, 'Klinklang': 601, 'Tynamo': 602, 'Eelektrik': 603, 'Eelektross': 604, 'Elgyem': 605, 'Beheeyem': 606, 'Litwick': 607, 'Lampent': 608, 'Chandelure': 609, 'Axew': 610, 'Fraxure': 611, 'Haxorus': 612, 'Cubchoo': 613, 'Beartic': 614, 'Cryogonal': 615, 'Shelmet': 616, 'Accelgor': 617, 'Stunfisk': 618, 'Mienfoo': 619, 'Mienshao': 620, 'Druddigon': 621, 'Golett': 622, 'Golurk': 623, 'Pawniard': 624, 'Bisharp': 625, 'Bouffalant': 626, 'Rufflet': 627, 'Braviary': 628, 'Vullaby': 629, 'Mandibuzz': 630, 'Heatmor': 631, 'Durant': 632, 'Deino': 633, 'Zweilous': 634, 'Hydreigon': 635, 'Larvesta': 636, 'Volcarona': 637, 'Cobalion': 638, 'Terrakion': 639, 'Virizion': 640, 'Tornadus Incarnate': 641, 'Thundurus Incarnate': 642, 'Reshiram': 643, 'Zekrom': 644, 'Landorus Incarnate': 645, 'Kyurem': 646, 'Keldeo Ordinary': 647, 'Meloetta Aria': 648, 'Genesect': 649, 'Chespin': 650, 'Quilladin': 651, 'Chesnaught': 652, 'Fennekin': 653, 'Braixen': 654, 'Delphox': 655, 'Froakie': 656, 'Frogadier': 657, 'Greninja': 658, 'Bunnelby': 659, 'Diggersby': 660, 'Fletchling': 661, 'Fletchinder': 662, 'Talonflame': 663, 'Scatterbug': 664, 'Spewpa': 665, 'Vivillon': 666, 'Litleo': 667, 'Pyroar': 668, 'Flabebe': 669, 'Floette': 670, 'Florges': 671, 'Skiddo': 672, 'Gogoat': 673, 'Pancham': 674, 'Pangoro': 675, 'Furfrou': 676, 'Espurr': 677, 'Meowstic Male': 678, 'Honedge': 679, 'Doublade': 680, 'Aegislash Shield': 681, 'Spritzee': 682, 'Aromatisse': 683, 'Swirlix': 684, 'Slurpuff': 685, 'Inkay': 686, 'Malamar': 687, 'Binacle': 688, 'Barbaracle': 689, 'Skrelp': 690, 'Dragalge': 691, 'Clauncher': 692, 'Clawitzer': 693, 'Helioptile': 694, 'Heliolisk': 695, 'Tyrunt': 696, 'Tyrantrum': 697, 'Amaura': 698, 'Aurorus': 699, 'Sylveon': 700, 'Hawlucha': 701, 'Dedenne': 702, 'Carbink': 703, 'Goomy': 704, 'Sliggoo': 705, 'Goodra': 706, 'Klefki': 707, 'Phantump': 708, 'Trevenant': 709, 'Pumpkaboo Average': 710, 'Gourgeist Average': 711, 'Bergmite': 712, 'Avalugg': 713, 'Noibat': 714, 'Noivern': 715, 'Xerneas': 716, 'Yveltal': 717, 'Zygarde 50': 718, 'Diancie': 719, 'Hoopa': 720, 'Volcanion': 721, 'Rowlet': 722, 'Dartrix': 723, 'Decidueye': 724, 'Litten': 725, 'Torracat': 726, 'Incineroar': 727, 'Popplio': 728, 'Brionne': 729, 'Primarina': 730, 'Pikipek': 731, 'Trumbeak': 732, 'Toucannon': 733, 'Yungoos': 734, 'Gumshoos': 735, 'Grubbin': 736, 'Charjabug': 737, 'Vikavolt': 738, 'Crabrawler': 739, 'Crabominable': 740, 'Oricorio Baile': 741, 'Cutiefly': 742, 'Ribombee': 743, 'Rockruff': 744, 'Lycanroc Midday': 745, 'Wishiwashi Solo': 746, 'Mareanie': 747, 'Toxapex': 748, 'Mudbray': 749, 'Mudsdale': 750, 'Dewpider': 751, 'Araquanid': 752, 'Fomantis': 753, 'Lurantis': 754, 'Morelull': 755, 'Shiinotic': 756, 'Salandit': 757, 'Salazzle': 758, 'Stufful': 759, 'Bewear': 760, 'Bounsweet': 761, 'Steenee': 762, 'Tsareena': 763, 'Comfey': 764, 'Oranguru': 765, 'Passimian': 766, 'Wimpod': 767, 'Golisopod': 768, 'Sandygast': 769, 'Palossand': 770, 'Pyukumuku': 771, 'Type Null': 772, 'Silvally': 773, 'Minior Red Meteor': 774, 'Komala': 775, 'Turtonator': 776, 'Togedemaru': 777, 'Mimikyu Disguised': 778, 'Bruxish': 779, 'Drampa': 780, 'Dhelmise': 781, 'Jangmo O': 782, 'Hakamo O': 783, 'Kommo O': 784, 'Tapu Koko': 785, 'Tapu Lele': 786, 'Tapu Bulu': 787, 'Tapu Fini': 788, 'Cosmog': 789, 'Cosmoem': 790, 'Solgaleo': 791, 'Lunala': 792, 'Nihilego': 793, 'Buzzwole': 794, 'Pheromosa': 795, 'Xurkitree': 796, 'Celesteela': 797, 'Kartana': 798, 'Guzzlord': 799, 'Necrozma': 800, 'Magearna': 801, 'Marshadow': 802, 'Poipole': 803, 'Naganadel': 804, 'Stakataka': 805, 'Blacephalon': 806, 'Zeraora': 807, 'Meltan': 808, 'Melmetal': 809, 'Grookey': 810, 'Thwackey': 811, 'Rillaboom': 812, 'Scorbunny': 813, 'Raboot': 814, 'Cinderace': 815, 'Sobble': 816, 'Drizzile': 817, 'Inteleon': 818, 'Skwovet': 819, 'Greedent': 820, 'Rookidee': 821, 'Corvisquire': 822, 'Corviknight': 823, 'Blipbug': 824, 'Dottler': 825, 'Orbeetle': 826, 'Nickit': 827, 'Thievul': 828, 'Gossifleur': 829, 'Eldegoss': 830, 'Wooloo': 831, 'Dubwool': 832, 'Chewtle': 833, 'Drednaw': 834, 'Yamper': 835, 'Boltund': 836, 'Rolycoly': 837, 'Carkol': 838, 'Coalossal': 839, 'Applin': 840, 'Flapple': 841, 'Appletun': 842, 'Silicobra': 843, 'Sandaconda': 844, 'Cramorant': 845, 'Arrokuda': 846, 'Barraskewda': 847, 'Toxel': 848, 'Toxtricity Amped': 849, 'Sizzlipede': 850, 'Centiskorch': 851, 'Clobbopus': 852, 'Grapploct': 853, 'Sinistea': 854, 'Polteageist': 855, 'Hatenna': 856, 'Hattrem': 857, 'Hatterene': 858, 'Impidimp': 859, 'Morgrem': 860, 'Grimmsnarl': 861, 'Obstagoon': 862, 'Perrserker': 863, 'Cursola': 864, 'Sirfetchd': 865, 'Mr Rime': 866, 'Runerigus': 867, 'Milcery': 868, 'Alcremie': 869, 'Falinks': 870, 'Pincurchin': 871, 'Snom': 872, 'Frosmoth': 873, 'Stonjourner': 874, 'Eiscue Ice': 875, 'Indeedee Male': 876, 'Morpeko Full Belly': 877, 'Cufant': 878, 'Copperajah': 879, 'Dracozolt': 880, 'Arctozolt': 881, 'Dracovish': 882, 'Arctovish': 883, 'Duraludon': 884, 'Dreepy': 885, 'Drakloak': 886, 'Dragapult': 887, 'Zacian': 888, 'Zamazenta': 889, 'Eternatus': 890, 'Kubfu': 891, 'Urshifu Single Strike': 892, 'Zarude': 893, 'Regieleki': 894, 'Regidrago': 895, 'Glastrier': 896, 'Spectrier': 897, 'Calyrex': 898, 'Wyrdeer': 899, 'Kleavor': 900, 'Ursaluna': 901, 'Basculegion Male': 902, 'Sneasler': 903, 'Overqwil': 904, 'Enamorus Incarnate': 905, 'Sprigatito': 906, 'Floragato': 907, 'Meowscarada': 908, 'Fuecoco': 909, 'Crocalor': 910, 'Skeledirge': 911, 'Quaxly': 912, 'Quaxwell': 913, 'Quaquaval': 914, 'Lechonk': 915, 'Oinkologne Male': 916, 'Tarountula': 917, 'Spidops': 918, 'Nymble': 919, 'Lokix': 920, 'Pawmi': 921, 'Pawmo': 922, 'Pawmot': 923, 'Tandemaus': 924, 'Maushold Family Of Four': 925, 'Fidough': 926, 'Dachsbun': 927, 'Smoliv': 928, 'Dolliv': 929, 'Arboliva': 930, 'Squawkabilly Green Plumage': 931, 'Nacli': 932, 'Naclstack': 933, 'Garganacl': 934, 'Charcadet': 935, 'Armarouge': 936, 'Ceruledge': 937, 'Tadbulb': 938, 'Bellibolt': 939, 'Wattrel': 940, 'Kilowattrel': 941, 'Maschiff': 942, 'Mabosstiff': 943, 'Shroodle': 944, 'Grafaiai': 945, 'Bramblin': 946, 'Brambleghast': 947, 'Toedscool': 948, 'Toedscruel': 949, 'Klawf': 950, 'Capsakid': 951, 'Scovillain': 952, 'Rellor': 953, 'Rabsca': 954, 'Flittle': 955, 'Espathra': 956, 'Tinkatink': 957, 'Tinkatuff': 958, 'Tinkaton': 959, 'Wiglett': 960, 'Wugtrio': 961, 'Bombirdier': 962, 'Finizen': 963, 'Palafin Zero': 964, 'Varoom': 965, 'Revavroom': 966, 'Cyclizar': 967, 'Orthworm': 968, 'Glimmet': 969, 'Glimmora': 970, 'Greavard': 971, 'Houndstone': 972, 'Flamigo': 973, 'Cetoddle': 974, 'Cetitan': 975, 'Veluza': 976, 'Dondozo': 977, 'Tatsugiri Curly': 978, 'Annihilape': 979, 'Clodsire': 980, 'Farigiraf': 981, 'Dudunsparce Two Segment': 982, 'Kingambit': 983, 'Great Tusk': 984, 'Scream Tail': 985, 'Brute Bonnet': 986, 'Flutter Mane': 987, 'Slither Wing': 988, 'Sandy Shocks': 989, 'Iron Treads': 990, 'Iron Bundle': 991, 'Iron Hands': 992, 'Iron Jugulis': 993, 'Iron Moth': 994, 'Iron Thorns': 995, 'Frigibax': 996, 'Arctibax': 997, 'Baxcalibur': 998, 'Gimmighoul': 999, 'Gholdengo': 1000, 'Wo Chien': 1001, 'Chien Pao': 1002, 'Ting Lu': 1003, 'Chi Yu': 1004, 'Roaring Moon': 1005, 'Iron Valiant': 1006, 'Koraidon': 1007, 'Miraidon': 1008, 'Walking Wake': 1009, 'Iron Leaves': 1010, 'Dipplin': 1011, 'Poltchageist': 1012, 'Sinistcha': 1013, 'Okidogi': 1014, 'Munkidori': 1015, 'Fezandipiti': 1016, 'Ogerpon': 1017, 'Archaludon': 1018, 'Hydrapple': 1019, 'Gouging Fire': 1020, 'Raging Bolt': 1021, 'Iron Boulder': 1022, 'Iron Crown': 1023, 'Terapagos': 1024, 'Pecharunt': 1025}
-
-POKEMON_IDS = {1: 'Bulbasaur', 2: 'Ivysaur', 3: 'Venusaur', 4: 'Charmander', 5: 'Charmeleon', 6: 'Charizard', 7: 'Squirtle', 8: 'Wartortle', 9: 'Blastoise', 10: 'Caterpie', 11: 'Metapod', 12: 'Butterfree', 13: 'Weedle', 14: 'Kakuna', 15: 'Beedrill', 16: 'Pidgey', 17: 'Pidgeotto', 18: 'Pidgeot', 19: 'Rattata', 20: 'Raticate', 21: 'Spearow', 22: 'Fearow', 23: 'Ekans', 24: 'Arbok', 25: 'Pikachu', 26: 'Raichu', 27: 'Sandshrew', 28: 'Sandslash', 29: 'Nidoran♀', 30: 'Nidorina', 31: 'Nidoqueen', 32: 'Nidoran♂', 33: 'Nidorino', 34: 'Nidoking', 35: 'Clefairy', 36: 'Clefable', 37: 'Vulpix', 38: 'Ninetales', 39: 'Jigglypuff', 40: 'Wigglytuff', 41: 'Zubat', 42: 'Golbat', 43: 'Oddish', 44: 'Gloom', 45: 'Vileplume', 46: 'Paras', 47: 'Parasect', 48: 'Venonat', 49: 'Venomoth', 50: 'Diglett', 51: 'Dugtrio', 52: 'Meowth', 53: 'Persian', 54: 'Psyduck', 55: 'Golduck', 56: 'Mankey', 57: 'Primeape', 58: 'Growlithe', 59: 'Arcanine', 60: 'Poliwag', 61: 'Poliwhirl', 62: 'Poliwrath', 63: 'Abra', 64: 'Kadabra', 65: 'Alakazam', 66: 'Machop', 67: 'Machoke', 68: 'Machamp', 69: 'Bellsprout', 70: 'Weepinbell', 71: 'Victreebel', 72: 'Tentacool', 73: 'Tentacruel', 74: 'Geodude', 75: 'Graveler', 76: 'Golem', 77: 'Ponyta', 78: 'Rapidash', 79: 'Slowpoke', 80: 'Slowbro', 81: 'Magnemite', 82: 'Magneton', 83: 'Farfetchd', 84: 'Doduo', 85: 'Dodrio', 86: 'Seel', 87: 'Dewgong', 88: 'Grimer', 89: 'Muk', 90: 'Shellder', 91: 'Cloyster', 92: 'Gastly', 93: 'Haunter', 94: 'Gengar', 95: 'Onix', 96: 'Drowzee', 97: 'Hypno', 98: 'Krabby', 99: 'Kingler', 100: 'Voltorb', 101: 'Electrode', 102: 'Exeggcute', 103: 'Exeggutor', 104: 'Cubone', 105: 'Marowak', 106: 'Hitmonlee', 107: 'Hitmonchan', 108: 'Lickitung', 109: 'Koffing', 110: 'Weezing', 111: 'Rhyhorn', 112: 'Rhydon', 113: 'Chansey', 114: 'Tangela', 115: 'Kangaskhan', 116: 'Horsea', 117: 'Seadra', 118: 'Goldeen', 119: 'Seaking', 120: 'Staryu', 121: 'Starmie', 122: 'Mr Mime', 123: 'Scyther', 124: 'Jynx', 125: 'Electabuzz', 126: 'Magmar', 127: 'Pinsir', 128: 'Tauros', 129: 'Magikarp', 130: 'Gyarados', 131: 'Lapras', 132: 'Ditto', 133: 'Eevee', 134: 'Vaporeon', 135: 'Jolteon', 136: 'Flareon', 137: 'Porygon', 138: 'Omanyte', 139: 'Omastar', 140: 'Kabuto', 141: 'Kabutops', 142: 'Aerodactyl', 143: 'Snorlax', 144: 'Articuno', 145: 'Zapdos', 146: 'Moltres', 147: 'Dratini', 148: 'Dragonair', 149: 'Dragonite', 150: 'Mewtwo', 151: 'Mew', 152: 'Chikorita', 153: 'Bayleef', 154: 'Meganium', 155: 'Cyndaquil', 156: 'Quilava', 157: 'Typhlosion', 158: 'Totodile', 159: 'Croconaw', 160: 'Feraligatr', 161: 'Sentret', 162: 'Furret', 163: 'Hoothoot', 164: 'Noctowl', 165: 'Ledyba', 166: 'Ledian', 167: 'Spinarak', 168: 'Ariados', 169: 'Crobat', 170: 'Chinchou', 171: 'Lanturn', 172: 'Pichu', 173: 'Cleffa', 174: 'Igglybuff', 175: 'Togepi', 176: 'Togetic', 177: 'Natu', 178: 'Xatu', 179: 'Mareep', 180: 'Flaaffy', 181: 'Ampharos', 182: 'Bellossom', 183: 'Marill', 184: 'Azumarill', 185: 'Sudowoodo', 186: 'Politoed', 187: 'Hoppip', 188: 'Skiploom', 189: 'Jumpluff', 190: 'Aipom', 191: 'Sunkern', 192: 'Sunflora', 193: 'Yanma', 194: 'Wooper', 195: 'Quagsire', 196: 'Espeon', 197: 'Umbreon', 198: 'Murkrow', 199: 'Slowking', 200: 'Misdreavus', 201: 'Unown', 202: 'Wobbuffet', 203: 'Girafarig', 204: 'Pineco', 205: 'Forretress', 206: 'Dunsparce', 207: 'Gligar', 208: 'Steelix', 209: 'Snubbull', 210: 'Granbull', 211: 'Qwilfish', 212: 'Scizor', 213: 'Shuckle', 214: 'Heracross', 215: 'Sneasel', 216: 'Teddiursa', 217: 'Ursaring', 218: 'Slugma', 219: 'Magcargo', 220: 'Swinub', 221: 'Piloswine', 222: 'Corsola', 223: 'Remoraid', 224: 'Octillery', 225: 'Delibird', 226: 'Mantine', 227: 'Skarmory', 228: 'Houndour', 229: 'Houndoom', 230: 'Kingdra', 231: 'Phanpy', 232: 'Donphan', 233: 'Porygon2', 234: 'Stantler', 235: 'Smeargle', 236: 'Tyrogue', 237: 'Hitmontop', 238: 'Smoochum', 239: 'Elekid', 240: 'Magby', 241: 'Miltank', 242: 'Blissey', 243: 'Raikou', 244: 'Entei', 245: 'Suicune', 246: 'Larvitar', 247: 'Pupitar', 248: 'Tyranitar', 249: 'Lugia', 250: 'Ho Oh', 251: 'Celebi', 252: 'Treecko', 253: 'Grovyle', 254: 'Sceptile', 255: 'Torchic', 256: 'Combusken', 257: 'Blaziken', 258: 'Mudkip', 259: 'Marshtomp', 260: 'Swampert', 261: 'Poochyena', 262: 'Mightyena', 263: 'Zigzagoon', 264: 'Linoone', 265: 'Wurmple', 266: 'Silcoon', 267: 'Beautifly', 268: 'Cascoon', 269: 'Dustox', 270: 'Lotad', 271: 'Lombre', 272: 'Ludicolo', 273: 'Seedot', 274: 'Nuzleaf', 275: 'Shiftry', 276: 'Taillow', 277: 'Swellow', 278: 'Wingull', 279: 'Pelipper', 280: 'Ralts', 281: 'Kirlia', 282: 'Gardevoir', 283: 'Surskit', 284: 'Masquerain', 285: 'Shroomish', 286: 'Breloom', 287: 'Slakoth', 288: 'Vigoroth', 289: 'Slaking', 290: 'Nincada', 291: 'Ninjask', 292: 'Shedinja', 293: 'Whismur', 294: 'Loudred', 295: 'Exploud', 296: 'Makuhita', 297: 'Hariyama', 298: 'Azurill', 299: 'Nosepass', 300: 'Skitty', 301: 'Delcatty', 302: 'Sableye', 303: 'Mawile', 304: 'Aron', 305: 'Lairon', 306: 'Aggron', 307: 'Meditite', 308: 'Medicham', 309: 'Electrike', 310: 'Manectric', 311: 'Plusle', 312: 'Minun', 313: 'Volbeat', 314: 'Illumise', 315: 'Roselia', 316: 'Gulpin', 317: 'Swalot', 318: 'Carvanha', 319: 'Sharpedo', 320: 'Wailmer', 321: 'Wailord', 322: 'Numel', 323: 'Camerupt', 324: 'Torkoal', 325: 'Spoink', 326: 'Grumpig', 327: 'Spinda', 328: 'Trapinch', 329: 'Vibrava', 330: 'Flygon', 331: 'Cacnea', 332: 'Cacturne', 333: 'Swablu', 334: 'Altaria', 335: 'Zangoose', 336: 'Seviper', 337: 'Lunatone', 338: 'Solrock', 339: 'Barboach', 340: 'Whiscash', 341: 'Corphish', 342: 'Crawdaunt', 343: 'Baltoy', 344: 'Claydol', 345: 'Lileep', 346: 'Cradily', 347: 'Anorith', 348: 'Armaldo', 349: 'Feebas', 350: 'Milotic', 351: 'Castform', 352: 'Kecleon', 353: 'Shuppet', 354: 'Banette', 355: 'Duskull', 356: 'Dusclops', 357: 'Tropius', 358: 'Chimecho', 359: 'Absol', 360: 'Wynaut', 361: 'Snorunt', 362: 'Glalie', 363: 'Spheal', 364: 'Sealeo', 365: 'Walrein', 366: 'Clamperl', 367: 'Huntail', 368: 'Gorebyss', 369: 'Relicanth', 370: 'Luvdisc', 371: 'Bagon', 372: 'Shelgon', 373: 'Salamence', 374: 'Beldum', 375: 'Metang', 376: 'Metagross', 377: 'Regirock', 378: 'Regice', 379: 'Registeel', 380: 'Latias', 381: 'Latios', 382: 'Kyogre', 383: 'Groudon', 384: 'Rayquaza', 385: 'Jirachi', 386: 'Deoxys Normal', 387: 'Turtwig', 388: 'Grotle', 389: 'Torterra', 390: 'Chimchar', 391: 'Monferno', 392: 'Infernape', 393: 'Piplup', 394: 'Prinplup', 395: 'Empoleon', 396: 'Starly', 397: 'Staravia', 398: 'Staraptor', 399: 'Bidoof', 400: 'Bibarel', 401: 'Kricketot', 402: 'Kricketune', 403: 'Shinx', 404: 'Luxio', 405: 'Luxray', 406: 'Budew', 407: 'Roserade', 408: 'Cranidos', 409: 'Rampardos', 410: 'Shieldon', 411: 'Bastiodon', 412: 'Burmy', 413: 'Wormadam Plant', 414: 'Mothim', 415: 'Combee', 416: 'Vespiquen', 417: 'Pachirisu', 418: 'Buizel', 419: 'Floatzel', 420: 'Cherubi', 421: 'Cherrim', 422: 'Shellos', 423: 'Gastrodon', 424: 'Ambipom', 425: 'Drifloon', 426: 'Drifblim', 427: 'Buneary', 428: 'Lopunny', 429: 'Mismagius', 430: 'Honchkrow', 431: 'Glameow', 432: 'Purugly', 433: 'Chingling', 434: 'Stunky', 435: 'Skuntank', 436: 'Bronzor', 437: 'Bronzong', 438: 'Bonsly', 439: 'Mime Jr', 440: 'Happiny', 441: 'Chatot', 442: 'Spiritomb', 443: 'Gible', 444: 'Gabite', 445: 'Garchomp', 446: 'Munchlax', 447: 'Riolu', 448: 'Lucario', 449: 'Hippopotas', 450: 'Hippowdon', 451: 'Skorupi', 452: 'Drapion', 453: 'Croagunk', 454: 'Toxicroak', 455: 'Carnivine', 456: 'Finneon', 457: 'Lumineon', 458: 'Mantyke', 459: 'Snover', 460: 'Abomasnow', 461: 'Weavile', 462: 'Magnezone', 463: 'Lickilicky', 464: 'Rhyperior', 465: 'Tangrowth', 466: 'Electivire', 467: 'Magmortar', 468: 'Togekiss', 469: 'Yanmega', 470: 'Leafeon', 471: 'Glaceon', 472: 'Gliscor', 473: 'Mamoswine', 474: 'Porygon Z', 475: 'Gallade', 476: 'Probopass', 477: 'Dusknoir', 478: 'Froslass', 479: 'Rotom', 480: 'Uxie', 481: 'Mesprit', 482: 'Azelf', 483: 'Dialga', 484: 'Palkia', 485: 'Heatran', 486: 'Regigigas', 487: 'Giratina Altered', 488: 'Cresselia', 489: 'Phione', 490: 'Manaphy', 491: 'Darkrai', 492: 'Shaymin Land', 493: 'Arceus', 494: 'Victini', 495: 'Snivy', 496: 'Servine', 497: 'Serperior', 498: 'Tepig', 499: 'Pignite', 500: 'Emboar', 501: 'Oshawott', 502: 'Dewott', 503: 'Samurott', 504: 'Patrat', 505: 'Watchog', 506: 'Lillipup', 507: 'Herdier', 508: 'Stoutland', 509: 'Purrloin', 510: 'Liepard', 511: 'Pansage', 512: 'Simisage', 513: 'Pansear', 514: 'Simisear', 515: 'Panpour', 516: 'Simipour', 517: 'Munna', 518: 'Musharna', 519: 'Pidove', 520: 'Tranquill', 521: 'Unfezant', 522: 'Blitzle', 523: 'Zebstrika', 524: 'Roggenrola', 525: 'Boldore', 526: 'Gigalith', 527: 'Woobat', 528: 'Swoobat', 529: 'Drilbur', 530: 'Excadrill', 531: 'Audino', 532: 'Timburr', 533: 'Gurdurr', 534: 'Conkeldurr', 535: 'Tympole', 536: 'Palpitoad', 537: 'Seismitoad', 538: 'Throh', 539: 'Sawk', 540: 'Sewaddle', 541: 'Swadloon', 542: 'Leavanny', 543: 'Venipede', 544: 'Whirlipede', 545: 'Scolipede', 546: 'Cottonee', 547: 'Whimsicott', 548: 'Petilil', 549: 'Lilligant', 550: 'Basculin Red Striped', 551: 'Sandile', 552: 'Krokorok', 553: 'Krookodile', 554: 'Darumaka', 555: 'Darmanitan Standard', 556: 'Maractus', 557: 'Dwebble', 558: 'Crustle', 559: 'Scraggy', 560: 'Scrafty', 561: 'Sigilyph', 562: 'Yamask', 563: 'Cofagrigus', 564: 'Tirtouga', 565: 'Carracosta', 566: 'Archen', 567: 'Archeops', 568: 'Trubbish', 569: 'Garbodor', 570: 'Zorua', 571: 'Zoroark', 572: 'Minccino', 573: 'Cinccino', 574: 'Gothita', 575: 'Gothorita', 576: 'Gothitelle', 577: 'Solosis', 578: 'Duosion', 579: 'Reuniclus', 580: 'Ducklett', 581: 'Swanna', 582: 'Vanillite', 583: 'Vanillish', 584: 'Vanilluxe', 585: 'Deerling', 586: 'Sawsbuck', 587: 'Emolga', 588: 'Karrablast', 589: 'Escavalier', 590: 'Foongus', 591: 'Amoonguss', 592: 'Frillish', 593: 'Jellicent', 594: 'Alomomola', 595: 'Joltik', 596: 'Galvantula', 597: 'Ferroseed', 598: 'Ferrothorn', 599: 'Klink', 600: 'Klang', 601: 'Klinklang', 602: 'Tynamo', 603: 'Eelektrik', 604: 'Eelektross', 605: 'Elgyem', 606: 'Beheeyem', 607: 'Litwick', 608: 'Lampent', 609: 'Chandelure', 610: 'Axew', 611: 'Fraxure', 612: 'Haxorus', 613: 'Cubchoo', 614: 'Beartic', 615: 'Cryogonal', 616: 'Shelmet', 617: 'Accelgor', 618: 'Stunfisk', 619: 'Mienfoo', 620: 'Mienshao', 621: 'Druddigon', 622: 'Golett', 623: 'Golurk', 624: 'Pawniard', 625: 'Bisharp', 626: 'Bouffalant', 627: 'Rufflet', 628: 'Braviary', 629: 'Vullaby', 630: 'Mandibuzz', 631: 'Heatmor', 632: 'Durant', 633: 'Deino', 634: 'Zweilous', 635: 'Hydreigon', 636: 'Larvesta', 637: 'Volcarona', 638: 'Cobalion', 639: 'Terrakion', 640: 'Virizion', 641: 'Tornadus Incarnate', 642: 'Thundurus Incarnate', 643: 'Reshiram', 644: 'Zekrom', 645: 'Landorus Incarnate', 646: 'Kyurem', 647: 'Keldeo Ordinary', 648: 'Meloetta Aria', 649: 'Genesect', 650: 'Chespin', 651: 'Quilladin', 652: 'Chesnaught', 653: 'Fennekin', 654: 'Braixen', 655: 'Delphox', 656: 'Froakie', 657: 'Frogadier', 658: 'Greninja', 659: 'Bunnelby', 660: 'Diggersby', 661: 'Fletchling', 662: 'Fletchinder', 663: 'Talonflame', 664: 'Scatterbug', 665: 'Spewpa', 666: 'Vivillon', 667: 'Litleo', 668: 'Pyroar', 669: 'Flabebe', 670: 'Floette', 671: 'Florges', 672: 'Skiddo', 673: 'Gogoat', 674: 'Pancham', 675: 'Pangoro', 676: 'Furfrou', 677: 'Espurr', 678: 'Meowstic Male', 679: 'Honedge', 680: 'Doublade', 681: 'Aegislash Shield', 682: 'Spritzee', 683: 'Aromatisse', 684: 'Swirlix', 685: 'Slurpuff', 686: 'Inkay', 687: 'Malamar', 688: 'Binacle', 689: 'Barbaracle', 690: 'Skrelp', 691: 'Dragalge', 692: 'Clauncher', 693: 'Clawitzer', 694: 'Helioptile', 695: 'Heliolisk', 696: 'Tyrunt', 697: 'Tyrantrum', 698: 'Amaura', 699: 'Aurorus', 700: 'Sylveon', 701: 'Hawlucha', 702: 'Dedenne', 703: 'Carbink', 704: 'Goomy', 705: 'Sliggoo', 706: 'Goodra', 707: 'Klefki', 708: 'Phantump', 709: 'Trevenant', 710: 'Pumpkaboo Average', 711: 'Gourgeist Average', 712: 'Bergmite', 713: 'Avalugg', 714: 'Noibat', 715: 'Noivern', 716: 'Xerneas', 717: 'Yveltal', 718: 'Zygarde 50', 719: 'Diancie', 720: 'Hoopa', 721: 'Volcanion', 722: 'Rowlet', 723: 'Dartrix', 724: 'Decidueye', 725: 'Litten', 726: 'Torracat', 727: 'Incineroar', 728: 'Popplio', 729: 'Brionne', 730: 'Primarina', 731: 'Pikipek', 732: 'Trumbeak', 733: 'Toucannon', 734: 'Yungoos', 735: 'Gumshoos', 736: 'Grubbin', 737: 'Charjabug', 738: 'Vikavolt', 739: 'Crabrawler', 740: 'Crabominable', 741: 'Oricorio Baile', 742: 'Cutiefly', 743: 'Ribombee', 744: 'Rockruff', 745: 'Lycanroc Midday', 746: 'Wishiwashi Solo', 747: 'Mareanie', 748: 'Toxapex', 749: 'Mudbray', 750: 'Mudsdale', 751: 'Dewpider', 752: 'Araquanid', 753: 'Fomantis', 754: 'Lurantis', 755: 'Morelull', 756: 'Shiinotic', 757: 'Salandit', 758: 'Salazzle', 759: 'Stufful', 760: 'Bewear', 761: 'Bounsweet', 762: 'Steenee', 763: 'Tsareena', 764: 'Comfey', 765: 'Oranguru', 766: 'Passimian', 767: 'Wimpod', 768: 'Golisopod', 769: 'Sandygast', 770: 'Palossand', 771: 'Pyukumuku', 772: 'Type Null', 773: 'Silvally', 774: 'Minior Red Meteor', 775: 'Komala', 776: 'Turtonator', 777: 'Togedemaru', 778: 'Mimikyu Disguised', 779: 'Bruxish', 780: 'Drampa', 781: 'Dhelmise', 782: 'Jangmo O', 783: 'Hakamo O', 784: 'Kommo O', 785: 'Tapu Koko', 786: 'Tapu Lele', 787: 'Tapu Bulu', 788: 'Tapu Fini', 789: 'Cosmog', 790: 'Cosmoem', 791: 'Solgaleo', 792: 'Lunala', 793: 'Nihilego', 794: 'Buzzwole', 795: 'Pheromosa', 796: 'Xurkitree', 797: 'Celesteela', 798: 'Kartana', 799: 'Guzzlord', 800: 'Necrozma', 801: 'Magearna', 802: 'Marshadow', 803: 'Poipole', 804: 'Naganadel', 805: 'Stakataka', 806: 'Blacephalon', 807: 'Zeraora', 808: 'Meltan', 809: 'Melmetal', 810: 'Grookey', 811: 'Thwackey', 812: 'Rillaboom', 813: 'Scorbunny', 814: 'Raboot', 815: 'Cinderace', 816: 'Sobble', 817: 'Drizzile', 818: 'Inteleon', 819: 'Skwovet', 820: 'Greedent', 821: 'Rookidee', 822: 'Corvisquire', 823: 'Corviknight', 824: 'Blipbug', 825: 'Dottler', 826: 'Orbeetle', 827: 'Nickit', 828: 'Thievul', 829: 'Gossifleur', 830: 'Eldegoss', 831: 'Wooloo', 832: 'Dubwool', 833: 'Chewtle', 834: 'Drednaw', 835: 'Yamper', 836: 'Boltund', 837: 'Rolycoly', 838: 'Carkol', 839: 'Coalossal', 840: 'Applin', 841: 'Flapple', 842: 'Appletun', 843: 'Silicobra', 844: 'Sandaconda', 845: 'Cramorant', 846: 'Arrokuda', 847: 'Barraskewda', 848: 'Toxel', 849: 'Toxtricity Amped', 850: 'Sizzlipede', 851: 'Centiskorch', 852: 'Clobbopus', 853: 'Grapploct', 854: 'Sinistea', 855: 'Polteageist', 856: 'Hatenna', 857: 'Hattrem', 858: 'Hatterene', 859: 'Impidimp', 860: 'Morgrem', 861: 'Grimmsnarl', 862: 'Obstagoon', 863: 'Perrserker', 864: 'Cursola', 865: 'Sirfetchd', 866: 'Mr Rime', 867: 'Runerigus', 868: 'Milcery', 869: 'Alcremie', 870: 'Falinks', 871: 'Pincurchin', 872: 'Snom', 873: 'Frosmoth', 874: 'Stonjourner', 875: 'Eiscue Ice', 876: 'Indeedee Male', 877: 'Morpeko Full Belly', 878: 'Cufant', 879: 'Copperajah', 880: 'Dracozolt', 881: 'Arctozolt', 882: 'Dracovish', 883: 'Arctovish', 884: 'Duraludon', 885: 'Dreepy', 886: 'Drakloak', 887: 'Dragapult', 888: 'Zacian', 889: 'Zamazenta', 890: 'Eternatus', 891: 'Kubfu', 892: 'Urshifu Single Strike', 893: 'Zarude', 894: 'Regieleki', 895: 'Regidrago', 896: 'Glastrier', 897: 'Spectrier', 898: 'Calyrex', 899: 'Wyrdeer', 900: 'Kleavor', 901: 'Ursaluna', 902: 'Basculegion Male', 903: 'Sneasler', 904: 'Overqwil', 905: 'Enamorus Incarnate', 906: 'Sprigatito', 907: 'Floragato', 908: 'Meowscarada', 909: 'Fuecoco', 910: 'Crocalor', 911: 'Skeledirge', 912: 'Quaxly', 913: 'Quaxwell', 914: 'Quaquaval', 915: 'Lechonk', 916: 'Oinkologne Male', 917: 'Tarountula', 918: 'Spidops', 919: 'Nymble', 920: 'Lokix', 921: 'Pawmi', 922: 'Pawmo', 923: 'Pawmot', 924: 'Tandemaus', 925: 'Maushold Family Of Four', 926: 'Fidough', 927: 'Dachsbun', 928: 'Smoliv', 929: 'Dolliv', 930: 'Arboliva', 931: 'Squawkabilly Green Plumage', 932: 'Nacli', 933: 'Naclstack', 934: 'Garganacl', 935: 'Charcadet', 936: 'Armarouge', 937: 'Ceruledge', 938: 'Tadbulb', 939: 'Bellibolt', 940: 'Wattrel', 941: 'Kilowattrel', 942: 'Maschiff', 943: 'Mabosstiff', 944: 'Shroodle', 945: 'Grafaiai', 946: 'Bramblin', 947: 'Brambleghast', 948: 'Toedscool', 949: 'Toedscruel', 950: 'Klawf', 951: 'Capsakid', 952: 'Scovillain', 953: 'Rellor', 954: 'Rabsca', 955: 'Flittle', 956: 'Espathra', 957: 'Tinkatink', 958: 'Tinkatuff', 959: 'Tinkaton', 960: 'Wiglett', 961: 'Wugtrio', 962: 'Bombirdier', 963: 'Finizen', 964: 'Palafin Zero', 965: 'Varoom', 966: 'Revavroom', 967: 'Cyclizar', 968: 'Orthworm', 969: 'Glimmet', 970: 'Glimmora', 971: 'Greavard', 972: 'Houndstone', 973: 'Flamigo', 974: 'Cetoddle', 975: 'Cetitan', 976: 'Veluza', 977: 'Dondozo', 978: 'Tatsugiri Curly', 979: 'Annihilape', 980: 'Clodsire', 981: 'Farigiraf', 982: 'Dudunsparce Two Segment', 983: 'Kingambit', 984: 'Great Tusk', 985: 'Scream Tail', 986: 'Brute Bonnet', 987: 'Flutter Mane', 988: 'Slither Wing', 989: 'Sandy Shocks', 990: 'Iron Treads', 991: 'Iron Bundle', 992: 'Iron Hands', 993: 'Iron Jugulis', 994: 'Iron Moth', 995: 'Iron Thorns', 996: 'Frigibax', 997: 'Arctibax', 998: 'Baxcalibur', 999: 'Gimmighoul', 1000: 'Gholdengo', 1001: 'Wo Chien', 1002: 'Chien Pao', 1003: 'Ting Lu', 1004: 'Chi Yu', 1005: 'Roaring Moon', 1006: 'Iron Valiant', 1007: 'Koraidon', 1008: 'Miraidon', 1009: 'Walking Wake', 1010: 'Iron Leaves', 1011: 'Dipplin', 1012: 'Poltchageist', 1013: 'Sinistcha', 1014: 'Okidogi', 1015: 'Munkidori', 1016: 'Fezandipiti', 1017: 'Ogerpon', 1018: 'Archaludon', 1019: 'Hydrapple', 1020: 'Gouging Fire', 1021: 'Raging Bolt', 1022: 'Iron Boulder', 1023: 'Iron Crown', 1024: 'Terapagos', 1025: 'Pecharunt'}
-
-import json
-import os
 import logging
+import sqlite3
+import threading
+from collections.abc import Mapping
+from data.pokemon_build import COMPILED_DB, build_database, is_stale
 
 logger = logging.getLogger('discord')
 
-POKEMON_IMAGES = {}
-
-def load_images():
-    global POKEMON_IMAGES
-    try:
-        file_path = os.path.join(os.path.dirname(__file__), 'pokemon_images.json')
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                # Key in JSON is string, convert to int for key
-                data = json.load(f)
-                for pid, info in data.items():
-                    POKEMON_IMAGES[int(pid)] = info
-            logger.info(f"Loaded {len(POKEMON_IMAGES)} pokemon images.")
-        else:
-            logger.warning("pokemon_images.json not found. Images will be missing.")
-    except Exception as e:
-        logger.error(f"Error loading pokemon images: {e}")
-
-load_images()
+# POKEMON_NAMES (name -> id), POKEMON_IDS (id -> name) and POKEMON_IMAGES (id -> {'name', 'normal', 'shiny'})
+# are read-only mappings over data/pokemon.db. Nothing is parsed at import time: the DB is
+# opened (and compiled from pokemon_source.py + pokemon_images.json if missing/stale) on first lookup.
+
+_conn = None
+_lock = threading.Lock()
+
+def _query(sql, params=()):
+    global _conn
+    with _lock:
+        if _conn is None:
+            if is_stale():
+                try:
+                    build_database()
+                except Exception as e:
+                    logger.error(f"Error compiling pokemon data: {e}")
+            _conn = sqlite3.connect(f"file:{COMPILED_DB}?mode=ro", uri=True, check_same_thread=False)
+        return _conn.execute(sql, params).fetchall()
+
+class _PokemonTable(Mapping):
+    """Lazy mapping: one indexed point query per lookup."""
+    def __init__(self, key_column, value_sql):
+        self.key_column = key_column
+        self.value_sql = value_sql
+
+    def _row_value(self, row):
+        return row[1]
+
+    def __getitem__(self, key):
+        rows = _query(f"SELECT {self.key_column}, {self.value_sql} FROM pokemon WHERE {self.key_column} = ?", (key,))
+        if not rows:
+            raise KeyError(key)
+        return self._row_value(rows[0])
+
+    def __iter__(self):
+        return iter([row[0] for row in _query(f"SELECT {self.key_column} FROM pokemon ORDER BY id")])
+
+    def __len__(self):
+        return _query("SELECT COUNT(*) FROM pokemon")[0][0]
+
+class _ImageTable(_PokemonTable):
+    def __init__(self):
+        super().__init__('id', 'image_name, normal_url, shiny_url')
+
+    def _row_value(self, row):
+        return {'name': row[1], 'normal': row[2], 'shiny': row[3]}
+
+    def __getitem__(self, key):
+        rows = _query("SELECT id, image_name, normal_url, shiny_url FROM pokemon WHERE id = ? AND image_name IS NOT NULL", (key,))
+        if not rows:
+            raise KeyError(key)
+        return self._row_value(rows[0])
+
+    def __iter__(self):
+        return iter([row[0] for row in _query("SELECT id FROM pokemon WHERE image_name IS NOT NULL ORDER BY id")])
+
+    def __len__(self):
+        return _query("SELECT COUNT(*) FROM pokemon WHERE image_name IS NOT NULL")[0][0]
+
+_TABLES = {
+    'POKEMON_NAMES': lambda: _PokemonTable('name', 'id'),
+    'POKEMON_IDS': lambda: _PokemonTable('id', 'name'),
+    'POKEMON_IMAGES': _ImageTable,
+}
+
+def __getattr__(name):
+    factory = _TABLES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    table = factory()
+    globals()[name] = table
+    return table
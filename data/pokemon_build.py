@@ -0,0 +1,66 @@
+import json
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger('discord')
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+COMPILED_DB = os.path.join(DATA_DIR, 'pokemon.db')
+SOURCE_FILES = (
+    os.path.join(DATA_DIR, 'pokemon_source.py'),
+    os.path.join(DATA_DIR, 'pokemon_images.json'),
+)
+
+def is_stale(db_path=COMPILED_DB):
+    """True if the compiled DB is missing or older than one of its sources."""
+    try:
+        built = os.path.getmtime(db_path)
+    except OSError:
+        return True
+    return any(os.path.exists(src) and os.path.getmtime(src) > built for src in SOURCE_FILES)
+
+def _load_images(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return {int(pid): info for pid, info in json.load(f).items()}
+    except FileNotFoundError:
+        logger.warning("pokemon_images.json not found. Images will be missing.")
+        return {}
+
+def build_database(db_path=COMPILED_DB):
+    """
+    Compiles pokemon_source.py + pokemon_images.json into an indexed SQLite file.
+    Written to a temp file and swapped in, so readers never see a half-built DB.
+    Returns number of pokemon written.
+    """
+    from data.pokemon_source import POKEMON_NAMES
+
+    images = _load_images(SOURCE_FILES[1])
+    tmp = f"{db_path}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute("""
+            CREATE TABLE pokemon (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE,
+                image_name TEXT,
+                normal_url TEXT,
+                shiny_url TEXT
+            )
+        """)
+        rows = []
+        for name, pid in POKEMON_NAMES.items():
+            info = images.get(pid, {})
+            rows.append((pid, name, info.get('name'), info.get('normal'), info.get('shiny')))
+        conn.executemany("INSERT INTO pokemon VALUES (?, ?, ?, ?, ?)", rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp, db_path)
+    logger.info(f"Compiled {len(rows)} pokemon into {db_path}.")
+    return len(rows)
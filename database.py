@@ -1,10 +1,18 @@
 import aiosqlite
 import logging
 import asyncio
+import sys
+import time
+from services.qr_cache import qr_cache
+from services.friend_pool import friend_pool
+from services.db_metrics import db_metrics, InstrumentedConnection
+import migrations
 
 logger = logging.getLogger('discord')
 
 DB_NAME = "trade_bot.db"
+# How long a connection waits for another writer (possibly another shard process) before SQLITE_BUSY
+BUSY_TIMEOUT_MS = 5000
 
 def dict_factory(cursor, row):
     """
@@ -28,284 +36,35 @@ class DBContext:
         self.db = None
 
     async def __aenter__(self):
-        self.db = await aiosqlite.connect(DB_NAME)
-        self.db.row_factory = dict_factory
-        await self.db.execute("PRAGMA foreign_keys = ON")
+        # Name of the helper opening the connection, used to attribute query timings
+        helper = sys._getframe(1).f_code.co_name
+        started = time.perf_counter()
+        raw = await aiosqlite.connect(DB_NAME)
+        raw.row_factory = dict_factory
+        await raw.execute("PRAGMA foreign_keys = ON")
+        await raw.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        db_metrics.record_connect(time.perf_counter() - started)
+        self.db = InstrumentedConnection(raw, helper, DB_NAME)
         return self.db
 
     async def __aexit__(self, exc_type, exc, tb):
         if self.db:
             await self.db.close()
 
+# Set by init_db: whether the users_fts search index exists (FTS5 trigram needs SQLite 3.34+)
+_users_fts_enabled = None
+
 async def init_db():
+    """Brings the database schema up to date (see migrations.py)."""
+    global _users_fts_enabled
     try:
         async with get_db() as db:
-            # 1. Users
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    friend_code TEXT NOT NULL,
-                    team TEXT,
-                    region TEXT,
-                    account_name TEXT DEFAULT 'Main',
-                    is_main BOOLEAN DEFAULT 0,
-                    want_more_friends BOOLEAN DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Check for missing columns in users
-            async with db.execute("PRAGMA table_info(users)") as cursor:
-                columns = [row['name'] for row in await cursor.fetchall()]
-
-            if 'want_more_friends' not in columns:
-                logger.info("Adding missing column want_more_friends to users table.")
-                await db.execute("ALTER TABLE users ADD COLUMN want_more_friends BOOLEAN DEFAULT 0")
-
-            # 2. Pokemon Species (New Table)
-            # Added columns for MSG stats: hp, attack, defense
-            # Removed columns: sp_atk, sp_def, speed
-            # Added columns for tier ranking and buddy distance
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS pokemon_species (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    pokedex_num INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    form TEXT DEFAULT 'Normal',
-                    type1 TEXT,
-                    type2 TEXT,
-                    image_url TEXT,
-                    shiny_image_url TEXT,
-                    can_dynamax BOOLEAN DEFAULT 0,
-                    can_gigantamax BOOLEAN DEFAULT 0,
-                    can_mega BOOLEAN DEFAULT 0,
-                    is_legendary BOOLEAN DEFAULT 0,
-                    is_mythical BOOLEAN DEFAULT 0,
-                    hp INTEGER DEFAULT 0,
-                    attack INTEGER DEFAULT 0,
-                    defense INTEGER DEFAULT 0,
-                    max_cp INTEGER DEFAULT 0,
-                    buddy_distance INTEGER DEFAULT 0,
-                    tier_data TEXT,
-                    best_moveset TEXT,
-                    costumes TEXT,
-                    UNIQUE(pokedex_num, form)
-                )
-            """)
-
-            # Check for missing/extra columns in pokemon_species
-            async with db.execute("PRAGMA table_info(pokemon_species)") as cursor:
-                columns = [row['name'] for row in await cursor.fetchall()]
-
-            # Migration: Remove sp_atk, sp_def, speed if they exist
-            if 'sp_atk' in columns:
-                logger.info("Migrating pokemon_species table to remove MSG stats (sp_atk, sp_def, speed).")
-                await db.execute("""
-                    CREATE TABLE IF NOT EXISTS pokemon_species_new (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        pokedex_num INTEGER NOT NULL,
-                        name TEXT NOT NULL,
-                        form TEXT DEFAULT 'Normal',
-                        type1 TEXT,
-                        type2 TEXT,
-                        image_url TEXT,
-                        shiny_image_url TEXT,
-                        can_dynamax BOOLEAN DEFAULT 0,
-                        can_gigantamax BOOLEAN DEFAULT 0,
-                        can_mega BOOLEAN DEFAULT 0,
-                        is_legendary BOOLEAN DEFAULT 0,
-                        is_mythical BOOLEAN DEFAULT 0,
-                        hp INTEGER DEFAULT 0,
-                        attack INTEGER DEFAULT 0,
-                        defense INTEGER DEFAULT 0,
-                        max_cp INTEGER DEFAULT 0,
-                        buddy_distance INTEGER DEFAULT 0,
-                        tier_data TEXT,
-                        best_moveset TEXT,
-                        costumes TEXT,
-                        UNIQUE(pokedex_num, form)
-                    )
-                """)
-                # Copy data
-                # We select explicitly the columns we want to keep
-                await db.execute("""
-                    INSERT INTO pokemon_species_new (
-                        id, pokedex_num, name, form, type1, type2, image_url, shiny_image_url,
-                        can_dynamax, can_gigantamax, can_mega, is_legendary, is_mythical,
-                        hp, attack, defense, max_cp, buddy_distance, tier_data, best_moveset, costumes
-                    )
-                    SELECT
-                        id, pokedex_num, name, form, type1, type2, image_url, shiny_image_url,
-                        can_dynamax, can_gigantamax, can_mega, is_legendary, is_mythical,
-                        hp, attack, defense, max_cp, buddy_distance, tier_data, best_moveset, costumes
-                    FROM pokemon_species
-                """)
-                await db.execute("DROP TABLE pokemon_species")
-                await db.execute("ALTER TABLE pokemon_species_new RENAME TO pokemon_species")
-                logger.info("Migration complete.")
-
-            # Simple migration for adding missing columns (if any, for future proofing or missing ones)
-            async with db.execute("PRAGMA table_info(pokemon_species)") as cursor:
-                columns = [row['name'] for row in await cursor.fetchall()]
-
-            new_columns = ['hp', 'attack', 'defense', 'max_cp', 'buddy_distance']
-            for col in new_columns:
-                if col not in columns:
-                    logger.info(f"Adding missing column {col} to pokemon_species table.")
-                    await db.execute(f"ALTER TABLE pokemon_species ADD COLUMN {col} INTEGER DEFAULT 0")
-
-            if 'shiny_image_url' not in columns:
-                logger.info("Adding missing column shiny_image_url to pokemon_species table.")
-                await db.execute("ALTER TABLE pokemon_species ADD COLUMN shiny_image_url TEXT")
-
-            if 'tier_data' not in columns:
-                logger.info("Adding missing column tier_data to pokemon_species table.")
-                await db.execute("ALTER TABLE pokemon_species ADD COLUMN tier_data TEXT")
-
-            if 'best_moveset' not in columns:
-                logger.info("Adding missing column best_moveset to pokemon_species table.")
-                await db.execute("ALTER TABLE pokemon_species ADD COLUMN best_moveset TEXT")
-
-            if 'costumes' not in columns:
-                logger.info("Adding missing column costumes to pokemon_species table.")
-                await db.execute("ALTER TABLE pokemon_species ADD COLUMN costumes TEXT")
-
-            # 3. Listings
-            # Changed pokemon_id (int) to species_id (FK)
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS listings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    account_id INTEGER NOT NULL,
-                    listing_type TEXT NOT NULL CHECK(listing_type IN ('HAVE', 'WANT')),
-                    species_id INTEGER NOT NULL,
-                    is_shiny BOOLEAN DEFAULT 0,
-                    is_purified BOOLEAN DEFAULT 0,
-                    is_dynamax BOOLEAN DEFAULT 0,
-                    is_gigantamax BOOLEAN DEFAULT 0,
-                    is_background BOOLEAN DEFAULT 0,
-                    is_adventure_effect BOOLEAN DEFAULT 0,
-                    is_mirror BOOLEAN DEFAULT 0,
-                    details TEXT,
-                    costume TEXT,
-                    status TEXT DEFAULT 'ACTIVE' CHECK(status IN ('ACTIVE', 'PENDING', 'COMPLETED', 'CANCELLED')),
-                    message_id INTEGER,
-                    channel_id INTEGER,
-                    guild_id INTEGER,
-                    count INTEGER DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (account_id) REFERENCES users (id) ON DELETE CASCADE,
-                    FOREIGN KEY (species_id) REFERENCES pokemon_species (id) ON DELETE RESTRICT
-                )
-            """)
-
-            # Check for missing columns in listings
-            async with db.execute("PRAGMA table_info(listings)") as cursor:
-                columns = [row['name'] for row in await cursor.fetchall()]
-
-            if 'count' not in columns:
-                logger.info("Adding missing column count to listings table.")
-                await db.execute("ALTER TABLE listings ADD COLUMN count INTEGER DEFAULT 1")
-
-            if 'costume' not in columns:
-                logger.info("Adding missing column costume to listings table.")
-                await db.execute("ALTER TABLE listings ADD COLUMN costume TEXT")
-
-            # 4. Trades
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS trades (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    channel_id INTEGER,
-                    listing_a_id INTEGER NOT NULL,
-                    listing_b_id INTEGER NOT NULL,
-                    status TEXT DEFAULT 'OPEN' CHECK(status IN ('OPEN', 'CLOSED')),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (listing_a_id) REFERENCES listings (id) ON DELETE CASCADE,
-                    FOREIGN KEY (listing_b_id) REFERENCES listings (id) ON DELETE CASCADE
-                )
-            """)
-
-            # 5. Events
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    link TEXT NOT NULL,
-                    image_url TEXT,
-                    start_time INTEGER NOT NULL,
-                    end_time INTEGER,
-                    type TEXT DEFAULT 'Event',
-                    time_text TEXT,
-                    notified_morning BOOLEAN DEFAULT 0,
-                    notified_2h BOOLEAN DEFAULT 0,
-                    notified_5m BOOLEAN DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(link)
-                )
-            """)
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_start_time ON events (start_time)")
-
-            # Check for missing columns in events
-            async with db.execute("PRAGMA table_info(events)") as cursor:
-                columns = [row['name'] for row in await cursor.fetchall()]
-
-            new_event_columns = {
-                'type': "TEXT DEFAULT 'Event'",
-                'time_text': "TEXT",
-                'notified_morning': "BOOLEAN DEFAULT 0"
-            }
-            for col, col_type in new_event_columns.items():
-                if col not in columns:
-                    logger.info(f"Adding missing column {col} to events table.")
-                    await db.execute(f"ALTER TABLE events ADD COLUMN {col} {col_type}")
-
-            # 6. Guild Config
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS guild_config (
-                    guild_id INTEGER PRIMARY KEY,
-                    event_channel_id INTEGER,
-                    event_role_id INTEGER,
-                    have_channel_id INTEGER,
-                    want_channel_id INTEGER,
-                    trade_category_id INTEGER,
-                    suggestion_channel_id INTEGER,
-                    upvote_emoji TEXT,
-                    downvote_emoji TEXT
-                )
-            """)
-
-            # Check for missing columns in guild_config
-            async with db.execute("PRAGMA table_info(guild_config)") as cursor:
-                columns = [row['name'] for row in await cursor.fetchall()]
-
-            if 'suggestion_channel_id' not in columns:
-                logger.info("Adding missing columns for suggestions to guild_config table.")
-                await db.execute("ALTER TABLE guild_config ADD COLUMN suggestion_channel_id INTEGER")
-                await db.execute("ALTER TABLE guild_config ADD COLUMN upvote_emoji TEXT")
-                await db.execute("ALTER TABLE guild_config ADD COLUMN downvote_emoji TEXT")
-
-            # 7. Autodelete Config
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS autodelete_config (
-                    channel_id INTEGER PRIMARY KEY,
-                    guild_id INTEGER,
-                    duration_minutes INTEGER
-                )
-            """)
-
-            # 8. User Departures
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS user_departures (
-                    user_id INTEGER PRIMARY KEY,
-                    guild_id INTEGER,
-                    departed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            await db.commit()
-            logger.info("Database initialized successfully with new schema.")
+            # WAL: readers never block the writer, so shard processes can share the file.
+            # Persistent, so this only changes anything the first time.
+            await db.execute("PRAGMA journal_mode = WAL")
+            await migrations.migrate(db)
+            async with db.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'") as cursor:
+                _users_fts_enabled = await cursor.fetchone() is not None
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
         raise
@@ -326,6 +85,9 @@ async def add_user_account(user_id, friend_code, team, region, account_name="Mai
         """, (user_id, friend_code, team, region, account_name, is_main, want_more_friends))
         await db.commit()
 
+    if want_more_friends:
+        friend_pool.invalidate()
+
 async def update_user_account(account_id, **kwargs):
     allowed_fields = {'account_name', 'friend_code', 'team', 'region', 'is_main', 'want_more_friends'}
     updates = []
@@ -343,8 +105,21 @@ async def update_user_account(account_id, **kwargs):
     query = f"UPDATE users SET {', '.join(updates)}, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
 
     async with get_db() as db:
+        old_fc = None
+        if 'friend_code' in kwargs:
+            async with db.execute("SELECT friend_code FROM users WHERE id = ?", (account_id,)) as cursor:
+                row = await cursor.fetchone()
+                old_fc = row['friend_code'] if row else None
+
         await db.execute(query, tuple(params))
         await db.commit()
+
+    # Friend code changed -> drop cached QR renders of the old code
+    if old_fc and old_fc != kwargs['friend_code']:
+        qr_cache.invalidate(old_fc)
+    # Opt-in, team or region changed -> friend discovery pool is stale
+    if kwargs.keys() & {'want_more_friends', 'team', 'region'}:
+        friend_pool.invalidate()
     return True
 
 async def get_user_accounts(user_id):
@@ -357,18 +132,77 @@ async def get_account(account_id):
         async with db.execute("SELECT * FROM users WHERE id = ?", (account_id,)) as cursor:
             return await cursor.fetchone()
 
-async def search_user_accounts(query):
+async def search_user_accounts(query, limit=25):
+    """
+    Case insensitive substring search over account name and friend code.
+    Results are ranked: exact account name match first (exact_match = 1), then by relevance.
+    Uses the users_fts trigram index; queries shorter than 3 characters
+    (or databases without FTS5) fall back to LIKE.
+    """
+    query = query.strip()
+    if not query:
+        return []
+
     async with get_db() as db:
-        # Case insensitive search by account_name
-        sql = "SELECT * FROM users WHERE account_name LIKE ? COLLATE NOCASE"
-        async with db.execute(sql, (f"%{query}%",)) as cursor:
+        if _users_fts_enabled and len(query) >= 3:
+            # Quote as a phrase so user input can't inject FTS query syntax
+            phrase = '"' + query.replace('"', '""') + '"'
+            sql = """
+                SELECT u.*, (u.account_name = ? COLLATE NOCASE) as exact_match
+                FROM users_fts f
+                JOIN users u ON u.id = f.rowid
+                WHERE users_fts MATCH ?
+                ORDER BY exact_match DESC, f.rank
+                LIMIT ?
+            """
+            params = (query, phrase, limit)
+        else:
+            sql = """
+                SELECT *, (account_name = ? COLLATE NOCASE) as exact_match
+                FROM users
+                WHERE account_name LIKE ? COLLATE NOCASE OR friend_code LIKE ?
+                ORDER BY exact_match DESC, length(account_name), account_name
+                LIMIT ?
+            """
+            params = (query, f"%{query}%", f"%{query}%", limit)
+
+        async with db.execute(sql, params) as cursor:
             return await cursor.fetchall()
 
-async def get_users_wanting_friends(limit=25):
+async def get_users_wanting_friends(limit=25, team=None, region=None, exclude_user_id=None):
+    """
+    Returns a random sample of accounts that want more friends, optionally filtered by team/region.
+    Samples rotate through the whole pool, so every opted-in account gets shown in turn.
+    The pool only picks the ids: the opt-in and the filters are checked again on the fetched rows,
+    so a stale pool can show fewer accounts but never the wrong ones.
+    """
+    while not friend_pool.loaded:
+        generation = friend_pool.generation
+        async with get_db() as db:
+            # Served by the partial index idx_users_want_friends
+            sql = "SELECT id, user_id, team, region FROM users WHERE want_more_friends = 1"
+            async with db.execute(sql) as cursor:
+                if friend_pool.load(await cursor.fetchall(), generation):
+                    break
+
+    account_ids = friend_pool.sample(limit, team=team, region=region, exclude_user_id=exclude_user_id)
+    if not account_ids:
+        return []
+    sql = f"SELECT * FROM users WHERE id IN ({','.join('?' * len(account_ids))}) AND want_more_friends = 1"
+    params = list(account_ids)
+    if team:
+        sql += " AND team = ?"
+        params.append(team)
+    if region:
+        sql += " AND region = ?"
+        params.append(region)
+    if exclude_user_id is not None:
+        sql += " AND user_id != ?"
+        params.append(exclude_user_id)
     async with get_db() as db:
-        sql = "SELECT * FROM users WHERE want_more_friends = 1 LIMIT ?"
-        async with db.execute(sql, (limit,)) as cursor:
-            return await cursor.fetchall()
+        async with db.execute(sql, params) as cursor:
+            rows = {row['id']: row for row in await cursor.fetchall()}
+    return [rows[i] for i in account_ids if i in rows]
 
 
 # --- Pokemon Species ---
@@ -478,6 +312,13 @@ async def get_pokemon_variants(pokedex_num):
         async with db.execute("SELECT * FROM pokemon_species WHERE pokedex_num = ?", (pokedex_num,)) as cursor:
             return await cursor.fetchall()
 
+async def get_all_pokemon_species():
+    """Get all species with the columns needed for sprite caching."""
+    async with get_db() as db:
+        sql = "SELECT id, pokedex_num, name, form, image_url, shiny_image_url, costumes FROM pokemon_species ORDER BY pokedex_num ASC"
+        async with db.execute(sql) as cursor:
+            return await cursor.fetchall()
+
 async def get_pokemon_species_by_id(species_id):
     """Get species by ID."""
     async with get_db() as db:
@@ -490,6 +331,11 @@ async def delete_pokemon_species(species_id):
         await db.execute("DELETE FROM pokemon_species WHERE id = ?", (species_id,))
         await db.commit()
 
+async def count_pokemon_species():
+    async with get_db() as db:
+        async with db.execute("SELECT COUNT(*) as count FROM pokemon_species") as cursor:
+            return (await cursor.fetchone())['count']
+
 # --- Listings ---
 
 async def add_listing(user_id, account_id, listing_type, species_id,
@@ -598,16 +444,149 @@ async def create_trade(listing_a_id, listing_b_id, channel_id):
         await db.commit()
         return cursor.lastrowid
 
+async def lock_trade(listing_a_id, listing_b_id):
+    """
+    Sets both listings PENDING and creates their OPEN trade (channel_id NULL) in one transaction,
+    if both are still ACTIVE. Returns the trade id, or None if another worker (possibly in another
+    shard process) took one of the listings first.
+    """
+    async with get_db() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = await db.execute(
+                "UPDATE listings SET status = 'PENDING' WHERE id IN (?, ?) AND status = 'ACTIVE'",
+                (listing_a_id, listing_b_id)
+            )
+            if cursor.rowcount != 2:
+                await db.rollback()
+                return None
+            cursor = await db.execute(
+                "INSERT INTO trades (listing_a_id, listing_b_id, channel_id) VALUES (?, ?, NULL)",
+                (listing_a_id, listing_b_id)
+            )
+            await db.commit()
+            return cursor.lastrowid
+        except Exception:
+            await db.rollback()
+            raise
+
 async def get_trade_by_channel(channel_id):
     async with get_db() as db:
         async with db.execute("SELECT * FROM trades WHERE channel_id = ?", (channel_id,)) as cursor:
             return await cursor.fetchone()
 
+async def get_trade_context(channel_id):
+    """
+    Loads a trade channel's trade and both listings (with account and species data) in one query.
+    Returns (trade, listing_a, listing_b); missing parts are None.
+    """
+    async with get_db() as db:
+        sql = """
+            SELECT t.id as trade_id, t.status as trade_status, t.channel_id as trade_channel_id,
+                   t.listing_a_id, t.listing_b_id, t.created_at as trade_created_at,
+                   l.*,
+                   u.friend_code, u.account_name, u.team, u.region,
+                   p.name as pokemon_name, p.form as pokemon_form, p.pokedex_num as pokemon_id, p.image_url, p.shiny_image_url, p.costumes as costumes_json
+            FROM trades t
+            LEFT JOIN listings l ON l.id IN (t.listing_a_id, t.listing_b_id)
+            LEFT JOIN users u ON l.account_id = u.id
+            LEFT JOIN pokemon_species p ON l.species_id = p.id
+            WHERE t.channel_id = ?
+        """
+        async with db.execute(sql, (channel_id,)) as cursor:
+            rows = await cursor.fetchall()
+
+    if not rows:
+        return None, None, None
+
+    first = rows[0]
+    trade = {
+        'id': first['trade_id'],
+        'status': first['trade_status'],
+        'channel_id': first['trade_channel_id'],
+        'listing_a_id': first['listing_a_id'],
+        'listing_b_id': first['listing_b_id'],
+        'created_at': first['trade_created_at'],
+    }
+    trade_keys = ('trade_id', 'trade_status', 'trade_channel_id', 'listing_a_id', 'listing_b_id', 'trade_created_at')
+    listings = {}
+    for row in rows:
+        if row['id'] is not None:
+            listings[row['id']] = {k: v for k, v in row.items() if k not in trade_keys}
+    return trade, listings.get(trade['listing_a_id']), listings.get(trade['listing_b_id'])
+
+async def cancel_trade(trade_id):
+    """
+    Closes an OPEN trade and reactivates both listings in one transaction.
+    Returns False if the trade was not open anymore.
+    """
+    async with get_db() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = await db.execute("UPDATE trades SET status = 'CLOSED' WHERE id = ? AND status = 'OPEN'", (trade_id,))
+            if cursor.rowcount == 0:
+                await db.rollback()
+                return False
+            await db.execute("""
+                UPDATE listings SET status = 'ACTIVE'
+                WHERE id IN (SELECT listing_a_id FROM trades WHERE id = ? UNION SELECT listing_b_id FROM trades WHERE id = ?)
+            """, (trade_id, trade_id))
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return True
+
+async def complete_trade(trade_id):
+    """
+    Completes a trade in one transaction: closes the trade (only if still OPEN),
+    decrements both listings' count, deletes exhausted listings and reactivates the rest.
+    Returns None if the trade was not open anymore (e.g. double click), otherwise
+    a list of {'id', 'user_id', 'count', 'deleted'} for both listings.
+    """
+    async with get_db() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            async with db.execute("""
+                UPDATE trades SET status = 'CLOSED'
+                WHERE id = ? AND status = 'OPEN'
+                RETURNING listing_a_id, listing_b_id
+            """, (trade_id,)) as cursor:
+                trade = await cursor.fetchone()
+            if not trade:
+                await db.rollback()
+                return None
+
+            listing_ids = (trade['listing_a_id'], trade['listing_b_id'])
+            async with db.execute("""
+                UPDATE listings SET count = count - 1
+                WHERE id IN (?, ?)
+                RETURNING id, user_id, count
+            """, listing_ids) as cursor:
+                listings = await cursor.fetchall()
+
+            await db.execute("DELETE FROM listings WHERE id IN (?, ?) AND count <= 0", listing_ids)
+            await db.execute("UPDATE listings SET status = 'ACTIVE' WHERE id IN (?, ?)", listing_ids)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+    for listing in listings:
+        listing['deleted'] = listing['count'] <= 0
+    order = {listing_id: i for i, listing_id in enumerate(listing_ids)}
+    return sorted(listings, key=lambda l: order[l['id']])
+
 async def close_trade(trade_id):
     async with get_db() as db:
         await db.execute("UPDATE trades SET status = 'CLOSED' WHERE id = ?", (trade_id,))
         await db.commit()
 
+async def get_trade(trade_id):
+    async with get_db() as db:
+        async with db.execute("SELECT * FROM trades WHERE id = ?", (trade_id,)) as cursor:
+            return await cursor.fetchone()
+
 async def update_trade_channel(trade_id, channel_id):
     async with get_db() as db:
         await db.execute("UPDATE trades SET channel_id = ? WHERE id = ?", (channel_id, trade_id))
@@ -619,6 +598,40 @@ async def get_expired_trades(days=7):
         async with db.execute(sql, (days,)) as cursor:
             return await cursor.fetchall()
 
+async def close_expired_trades(days=7):
+    """
+    Closes all OPEN trades older than `days` and reactivates their listings in one transaction.
+    Returns (closed_trades, reactivated_listings); reactivated_listings rows contain id and guild_id.
+    """
+    async with get_db() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            async with db.execute("SELECT datetime('now', '-' || ? || ' days') as cutoff", (days,)) as cursor:
+                cutoff = (await cursor.fetchone())['cutoff']
+
+            async with db.execute("SELECT * FROM trades WHERE status = 'OPEN' AND created_at < ?", (cutoff,)) as cursor:
+                trades = await cursor.fetchall()
+
+            if not trades:
+                await db.rollback()
+                return [], []
+
+            expired_listings = """
+                SELECT listing_a_id FROM trades WHERE status = 'OPEN' AND created_at < ?
+                UNION
+                SELECT listing_b_id FROM trades WHERE status = 'OPEN' AND created_at < ?
+            """
+            async with db.execute(f"SELECT id, guild_id FROM listings WHERE id IN ({expired_listings}) ORDER BY created_at ASC", (cutoff, cutoff)) as cursor:
+                listings = await cursor.fetchall()
+
+            await db.execute(f"UPDATE listings SET status = 'ACTIVE' WHERE id IN ({expired_listings})", (cutoff, cutoff))
+            await db.execute("UPDATE trades SET status = 'CLOSED' WHERE status = 'OPEN' AND created_at < ?", (cutoff,))
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return trades, listings
+
 async def check_trade_history(listing_a_id, listing_b_id):
     async with get_db() as db:
         sql = """
@@ -673,6 +686,97 @@ async def find_candidates(listing_type, species_id,
         )) as cursor:
             return await cursor.fetchall()
 
+# --- Match Queue ---
+
+async def enqueue_matches(jobs, now):
+    """
+    Adds (listing_id, guild_id) jobs to the match queue.
+    A listing that is already queued is reset so it is picked up right away.
+    """
+    if not jobs:
+        return
+    async with get_db() as db:
+        await db.executemany("""
+            INSERT INTO match_queue (listing_id, guild_id, enqueued_at, available_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(listing_id) DO UPDATE SET
+                guild_id = excluded.guild_id, trade_id = NULL, attempts = 0,
+                enqueued_at = excluded.enqueued_at, available_at = excluded.available_at,
+                claimed_at = NULL, last_error = NULL
+        """, [(listing_id, guild_id, now, now) for listing_id, guild_id in jobs])
+        await db.commit()
+
+def _shard_condition(shards):
+    """SQL condition + params limiting guild_id to (shard_count, shard_ids); shards=None means all guilds."""
+    if not shards:
+        return "1", ()
+    shard_count, shard_ids = shards
+    return f"(guild_id IS NULL OR (guild_id >> 22) % ? IN ({', '.join('?' * len(shard_ids))}))", (shard_count, *shard_ids)
+
+async def claim_match_jobs(now, limit=1, shards=None):
+    """Atomically claims up to `limit` due, unclaimed jobs (oldest first), of the given shards' guilds."""
+    condition, shard_params = _shard_condition(shards)
+    async with get_db() as db:
+        sql = f"""
+            UPDATE match_queue SET claimed_at = ?
+            WHERE listing_id IN (
+                SELECT listing_id FROM match_queue
+                WHERE claimed_at IS NULL AND available_at <= ? AND {condition}
+                ORDER BY available_at ASC
+                LIMIT ?
+            )
+            RETURNING *
+        """
+        async with db.execute(sql, (now, now, *shard_params, limit)) as cursor:
+            jobs = await cursor.fetchall()
+        await db.commit()
+        return jobs
+
+async def set_match_job_trade(listing_id, trade_id):
+    """Remembers the trade created for a job, so a retry only redoes the channel setup."""
+    async with get_db() as db:
+        await db.execute("UPDATE match_queue SET trade_id = ? WHERE listing_id = ?", (trade_id, listing_id))
+        await db.commit()
+
+async def complete_match_job(listing_id):
+    """Removes a job from the queue and returns the trade created for it (None if it got none)."""
+    async with get_db() as db:
+        async with db.execute("DELETE FROM match_queue WHERE listing_id = ? RETURNING trade_id", (listing_id,)) as cursor:
+            row = await cursor.fetchone()
+        await db.commit()
+        return row['trade_id'] if row else None
+
+async def retry_match_job(listing_id, available_at, error):
+    async with get_db() as db:
+        await db.execute("""
+            UPDATE match_queue
+            SET attempts = attempts + 1, available_at = ?, claimed_at = NULL, last_error = ?
+            WHERE listing_id = ?
+        """, (available_at, error, listing_id))
+        await db.commit()
+
+async def release_match_jobs(shards=None):
+    """Un-claims jobs left claimed by a previous process (crash/restart) of the given shards."""
+    condition, shard_params = _shard_condition(shards)
+    async with get_db() as db:
+        cursor = await db.execute(f"UPDATE match_queue SET claimed_at = NULL WHERE claimed_at IS NOT NULL AND {condition}", shard_params)
+        await db.commit()
+        return cursor.rowcount
+
+async def get_match_queue_stats(now):
+    """Returns queued/due/claimed/retrying counts and the oldest enqueue time."""
+    async with get_db() as db:
+        sql = """
+            SELECT COUNT(*) as queued,
+                   COALESCE(SUM(claimed_at IS NULL AND available_at <= ?), 0) as due,
+                   COALESCE(SUM(claimed_at IS NOT NULL), 0) as claimed,
+                   COALESCE(SUM(attempts > 0), 0) as retrying,
+                   MIN(enqueued_at) as oldest_enqueued_at
+            FROM match_queue
+        """
+        async with db.execute(sql, (now,)) as cursor:
+            return await cursor.fetchone()
+
 # --- Events ---
 
 async def upsert_event(name, link, image_url, start_time, end_time, type="Event", time_text=None):
@@ -786,6 +890,12 @@ async def set_guild_config(guild_id, **kwargs):
 
         await db.commit()
 
+async def get_event_channel_configs():
+    """Guild configs with an event channel set (event notifications and summaries)."""
+    async with get_db() as db:
+        async with db.execute("SELECT * FROM guild_config WHERE event_channel_id IS NOT NULL") as cursor:
+            return await cursor.fetchall()
+
 async def get_guild_config(guild_id):
     async with get_db() as db:
         async with db.execute("SELECT * FROM guild_config WHERE guild_id = ?", (guild_id,)) as cursor:
@@ -810,6 +920,74 @@ async def delete_autodelete_config(channel_id):
         await db.execute("DELETE FROM autodelete_config WHERE channel_id = ?", (channel_id,))
         await db.commit()
 
+async def set_autodelete_watermark(channel_id, swept_until):
+    """Persists up to which time (unix) the channel history has been swept."""
+    async with get_db() as db:
+        await db.execute("UPDATE autodelete_config SET swept_until = ? WHERE channel_id = ?", (swept_until, channel_id))
+        await db.commit()
+
+async def get_autodelete_backlog(now):
+    """Returns {channel_id: number of due ledger messages} for all configured channels."""
+    async with get_db() as db:
+        sql = """
+            SELECT c.channel_id, COUNT(m.message_id) as due
+            FROM autodelete_config c
+            LEFT JOIN autodelete_messages m
+                ON m.channel_id = c.channel_id AND m.created_at < ? - c.duration_minutes * 60
+            GROUP BY c.channel_id
+        """
+        async with db.execute(sql, (now,)) as cursor:
+            return {row['channel_id']: row['due'] for row in await cursor.fetchall()}
+
+async def add_autodelete_messages(rows):
+    """Records (message_id, channel_id, created_at) rows in the autodelete ledger."""
+    if not rows:
+        return
+    async with get_db() as db:
+        await db.executemany("""
+            INSERT OR IGNORE INTO autodelete_messages (message_id, channel_id, created_at)
+            VALUES (?, ?, ?)
+        """, rows)
+        await db.commit()
+
+async def get_due_autodelete_messages(channel_id, cutoff, limit=1000):
+    """Returns ids of ledger messages in a channel created before cutoff (unix time)."""
+    async with get_db() as db:
+        sql = """
+            SELECT message_id FROM autodelete_messages
+            WHERE channel_id = ? AND created_at < ?
+            ORDER BY created_at ASC
+            LIMIT ?
+        """
+        async with db.execute(sql, (channel_id, cutoff, limit)) as cursor:
+            return [row['message_id'] for row in await cursor.fetchall()]
+
+async def delete_autodelete_messages(message_ids):
+    if not message_ids:
+        return
+    async with get_db() as db:
+        await db.executemany("DELETE FROM autodelete_messages WHERE message_id = ?", [(m,) for m in message_ids])
+        await db.commit()
+
+async def retry_autodelete_messages(message_ids, max_attempts):
+    """
+    Counts a failed delete attempt for the messages; drops those that reached max_attempts.
+    Returns the number of dropped messages.
+    """
+    if not message_ids:
+        return 0
+    async with get_db() as db:
+        await db.executemany("UPDATE autodelete_messages SET attempts = attempts + 1 WHERE message_id = ?", [(m,) for m in message_ids])
+        cursor = await db.execute("DELETE FROM autodelete_messages WHERE attempts >= ?", (max_attempts,))
+        await db.commit()
+        return cursor.rowcount
+
+async def clear_autodelete_channel(channel_id):
+    """Forgets all ledger entries of a channel (autodelete turned off)."""
+    async with get_db() as db:
+        await db.execute("DELETE FROM autodelete_messages WHERE channel_id = ?", (channel_id,))
+        await db.commit()
+
 async def add_user_departure(user_id, guild_id):
     async with get_db() as db:
         await db.execute("""
@@ -823,11 +1001,73 @@ async def remove_user_departure(user_id):
         await db.execute("DELETE FROM user_departures WHERE user_id = ?", (user_id,))
         await db.commit()
 
+async def purge_departed_user_listings(hours=24):
+    """
+    Deletes ACTIVE listings of users who left a guild more than `hours` ago
+    (listings of that guild only) and clears their departure records, in one transaction.
+    Returns (deleted_listings, departed_user_count); deleted_listings rows contain
+    id, user_id, channel_id, message_id so the Discord messages can be removed afterwards.
+    """
+    async with get_db() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            async with db.execute("SELECT datetime('now', '-' || ? || ' hours') as cutoff", (hours,)) as cursor:
+                cutoff = (await cursor.fetchone())['cutoff']
+
+            sql = """
+                SELECT l.id, l.user_id, l.guild_id, l.channel_id, l.message_id
+                FROM listings l
+                JOIN user_departures d ON l.user_id = d.user_id AND l.guild_id = d.guild_id
+                WHERE d.departed_at < ? AND l.status = 'ACTIVE'
+            """
+            async with db.execute(sql, (cutoff,)) as cursor:
+                deleted = await cursor.fetchall()
+
+            await db.execute("""
+                DELETE FROM listings WHERE id IN (
+                    SELECT l.id
+                    FROM listings l
+                    JOIN user_departures d ON l.user_id = d.user_id AND l.guild_id = d.guild_id
+                    WHERE d.departed_at < ? AND l.status = 'ACTIVE'
+                )
+            """, (cutoff,))
+            cursor = await db.execute("DELETE FROM user_departures WHERE departed_at < ?", (cutoff,))
+            departed = cursor.rowcount
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return deleted, departed
+
 async def get_departed_users(hours=24):
     async with get_db() as db:
         sql = "SELECT * FROM user_departures WHERE departed_at < datetime('now', '-' || ? || ' hours')"
         async with db.execute(sql, (hours,)) as cursor:
             return await cursor.fetchall()
 
+# --- Leases ---
+
+async def acquire_lease(name, holder, ttl):
+    """
+    Takes the named lease for `ttl` seconds if it is free, expired or already held by `holder`
+    (renewal). Returns True if `holder` holds the lease afterwards.
+    """
+    now = time.time()
+    async with get_db() as db:
+        await db.execute("""
+            INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+            WHERE leases.holder = excluded.holder OR leases.expires_at < ?
+        """, (name, holder, now + ttl, now))
+        await db.commit()
+        async with db.execute("SELECT holder FROM leases WHERE name = ?", (name,)) as cursor:
+            row = await cursor.fetchone()
+    return row is not None and row['holder'] == holder
+
+async def release_lease(name, holder):
+    async with get_db() as db:
+        await db.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, holder))
+        await db.commit()
+
 if __name__ == "__main__":
     asyncio.run(init_db())
@@ -1,9 +1,17 @@
+import time
+PROCESS_STARTED = time.perf_counter()
+
 import discord
 import os
+import asyncio
 from discord.ext import commands
 import config
 import logging
 import database
+from services.interaction_metrics import InstrumentedCommandTree, install as install_interaction_metrics
+from services.metrics import MetricsServer, GATEWAY_LATENCY
+from services.loop_watchdog import loop_watchdog
+from services.cluster import leader
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -12,38 +20,64 @@ logger = logging.getLogger('discord')
 intents = discord.Intents.default()
 intents.message_content = True
 
-class TradeBot(commands.Bot):
+# Sharded mode: this process runs SHARD_IDS of SHARD_COUNT shards (all of them if unset)
+BotBase = commands.AutoShardedBot if config.SHARDED else commands.Bot
+
+class TradeBot(BotBase):
     def __init__(self):
+        sharding = {'shard_count': config.SHARD_COUNT, 'shard_ids': config.SHARD_IDS} if config.SHARDED else {}
         super().__init__(
             command_prefix='!',
             intents=intents,
-            help_command=None
+            help_command=None,
+            tree_cls=InstrumentedCommandTree,
+            **sharding
         )
+        install_interaction_metrics()
+        self.startup_timings = {} # phase -> seconds, see !startup
+        self.species_count = None
+        self.metrics_server = None
+
+    def _record_phase(self, phase, started):
+        elapsed = time.perf_counter() - started
+        self.startup_timings[phase] = elapsed
+        return elapsed
+
+    async def _load_cog(self, filename):
+        started = time.perf_counter()
+        try:
+            await self.load_extension(f'cogs.{filename[:-3]}')
+            self._record_phase(f'cog:{filename[:-3]}', started)
+            logger.info(f'Loaded extension: {filename}')
+        except Exception as e:
+            logger.error(f'Failed to load extension {filename}: {e}')
 
     async def setup_hook(self):
         # Initialize database
+        started = time.perf_counter()
         await database.init_db()
+        self._record_phase('init_db', started)
         logger.info("Database initialized.")
 
-        # Check if we need to sync pokemon data
-        async with database.get_db() as db:
-            async with db.execute("SELECT COUNT(*) as count FROM pokemon_species") as cursor:
-                row = await cursor.fetchone()
-                if row['count'] == 0:
-                    logger.warning("Pokemon species table is empty. Please run !scrape as bot owner.")
-                    # We can't easily DM the owner here because the bot isn't fully ready/connected to gateway yet.
-                    # We will do it in on_ready.
-                else:
-                    logger.info(f"Pokemon species table has {row['count']} entries.")
-
-        # Load extensions
-        for filename in os.listdir('./cogs'):
-            if filename.endswith('.py'):
-                try:
-                    await self.load_extension(f'cogs.{filename[:-3]}')
-                    logger.info(f'Loaded extension: {filename}')
-                except Exception as e:
-                    logger.error(f'Failed to load extension {filename}: {e}')
+        # Only the elected process runs the global background tasks
+        leader.start()
+
+        # Check if we need to sync pokemon data (cached for on_ready)
+        started = time.perf_counter()
+        self.species_count = await database.count_pokemon_species()
+        self._record_phase('species_count', started)
+        if self.species_count == 0:
+            logger.warning("Pokemon species table is empty. Please run !scrape as bot owner.")
+            # We can't easily DM the owner here because the bot isn't fully ready/connected to gateway yet.
+            # We will do it in on_ready.
+        else:
+            logger.info(f"Pokemon species table has {self.species_count} entries.")
+
+        # Load extensions concurrently (cogs don't depend on each other at load time)
+        started = time.perf_counter()
+        cogs = sorted(f for f in os.listdir('./cogs') if f.endswith('.py'))
+        await asyncio.gather(*[self._load_cog(filename) for filename in cogs])
+        self._record_phase('load_extensions', started)
 
         # Register persistent views
         try:
@@ -53,22 +87,54 @@ class TradeBot(commands.Bot):
         except Exception as e:
             logger.error(f"Failed to register TradeView: {e}")
 
+        await self._start_metrics()
+
+        self._record_phase('setup_hook', PROCESS_STARTED)
+
+    async def _start_metrics(self):
+        GATEWAY_LATENCY.set_function(lambda: self.latency)
+        loop_watchdog.start()
+        if not config.METRICS_PORT:
+            return
+        self.metrics_server = MetricsServer(host=config.METRICS_HOST, port=config.METRICS_PORT)
+        try:
+            await self.metrics_server.start()
+        except OSError as e:
+            logger.error(f"Failed to start metrics exporter on {config.METRICS_HOST}:{config.METRICS_PORT}: {e}")
+            self.metrics_server = None
+
+    async def close(self):
+        loop_watchdog.stop()
+        await leader.stop()
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        await super().close()
+
+    def format_startup_timings(self):
+        lines = []
+        for phase, elapsed in self.startup_timings.items():
+            lines.append(f"{phase}: {elapsed * 1000:.0f} ms")
+        return "\n".join(lines)
+
     async def on_ready(self):
         logger.info(f'Logged in as {self.user} (ID: {self.user.id})')
+        if config.SHARDED:
+            logger.info(f'Cluster {config.CLUSTER_ID}: shards {sorted(self.shards)} of {self.shard_count}')
         logger.info('------')
 
-        # Check if DB is empty and notify owner
-        async with database.get_db() as db:
-            async with db.execute("SELECT COUNT(*) as count FROM pokemon_species") as cursor:
-                row = await cursor.fetchone()
-                if row['count'] == 0:
-                    try:
-                        app_info = await self.application_info()
-                        if app_info.owner:
-                            await app_info.owner.send("⚠️ **Database Alert**: The Pokémon species table is empty. Please run `!scrape` to populate it.")
-                            logger.info("Sent empty DB notification to owner.")
-                    except Exception as e:
-                        logger.error(f"Failed to send owner notification: {e}")
+        if 'ready' not in self.startup_timings:
+            self._record_phase('ready', PROCESS_STARTED)
+            logger.info("Startup timings:\n" + self.format_startup_timings())
+
+        # Check if DB is empty and notify owner (once per cluster)
+        if self.species_count == 0 and leader.is_leader:
+            try:
+                app_info = await self.application_info()
+                if app_info.owner:
+                    await app_info.owner.send("⚠️ **Database Alert**: The Pokémon species table is empty. Please run `!scrape` to populate it.")
+                    logger.info("Sent empty DB notification to owner.")
+            except Exception as e:
+                logger.error(f"Failed to send owner notification: {e}")
 
 bot = TradeBot()
 
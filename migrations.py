@@ -0,0 +1,479 @@
+import logging
+import aiosqlite
+
+logger = logging.getLogger('discord')
+
+# Numbered schema migrations.
+# Applied versions are recorded in schema_version, so a current database starts with
+# a single query instead of introspecting every table. Add new steps at the end of
+# MIGRATIONS with the next number; never change a step that has shipped.
+
+class Migration:
+    """A schema step. apply(db) runs in one transaction together with recording the version."""
+    def __init__(self, version, name, apply):
+        self.version = version
+        self.name = name
+        self.apply = apply
+
+# --- Migrations ---
+
+async def _create_users_fts(db):
+    """Trainer search index (FTS5 trigram over account name + friend code), kept in sync by triggers."""
+    async with db.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'") as cursor:
+        exists = await cursor.fetchone() is not None
+
+    try:
+        await db.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+                account_name, friend_code,
+                content='users', content_rowid='id', tokenize='trigram'
+            )
+        """)
+    except aiosqlite.OperationalError as e:
+        logger.warning(f"FTS5 trigram not available, trainer search falls back to LIKE: {e}")
+        return
+
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN
+            INSERT INTO users_fts (rowid, account_name, friend_code) VALUES (new.id, new.account_name, new.friend_code);
+        END
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN
+            INSERT INTO users_fts (users_fts, rowid, account_name, friend_code) VALUES ('delete', old.id, old.account_name, old.friend_code);
+        END
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE OF account_name, friend_code ON users BEGIN
+            INSERT INTO users_fts (users_fts, rowid, account_name, friend_code) VALUES ('delete', old.id, old.account_name, old.friend_code);
+            INSERT INTO users_fts (rowid, account_name, friend_code) VALUES (new.id, new.account_name, new.friend_code);
+        END
+    """)
+
+    if not exists:
+        logger.info("Building trainer search index (users_fts).")
+        await db.execute("INSERT INTO users_fts (users_fts) VALUES ('rebuild')")
+
+async def _baseline(db):
+    """
+    Schema as of the introduction of versioned migrations.
+    Still introspects, because databases created before it may be at any older layout;
+    it runs exactly once per database.
+    """
+    # 1. Users
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            friend_code TEXT NOT NULL,
+            team TEXT,
+            region TEXT,
+            account_name TEXT DEFAULT 'Main',
+            is_main BOOLEAN DEFAULT 0,
+            want_more_friends BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Check for missing columns in users
+    async with db.execute("PRAGMA table_info(users)") as cursor:
+        columns = [row['name'] for row in await cursor.fetchall()]
+
+    if 'want_more_friends' not in columns:
+        logger.info("Adding missing column want_more_friends to users table.")
+        await db.execute("ALTER TABLE users ADD COLUMN want_more_friends BOOLEAN DEFAULT 0")
+
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_users_want_friends ON users (team, region, user_id) WHERE want_more_friends = 1")
+
+    # 1b. Trainer search index (FTS5 trigram over account name + friend code)
+    await _create_users_fts(db)
+
+    # 2. Pokemon Species (New Table)
+    # Added columns for MSG stats: hp, attack, defense
+    # Removed columns: sp_atk, sp_def, speed
+    # Added columns for tier ranking and buddy distance
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS pokemon_species (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pokedex_num INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            form TEXT DEFAULT 'Normal',
+            type1 TEXT,
+            type2 TEXT,
+            image_url TEXT,
+            shiny_image_url TEXT,
+            can_dynamax BOOLEAN DEFAULT 0,
+            can_gigantamax BOOLEAN DEFAULT 0,
+            can_mega BOOLEAN DEFAULT 0,
+            is_legendary BOOLEAN DEFAULT 0,
+            is_mythical BOOLEAN DEFAULT 0,
+            hp INTEGER DEFAULT 0,
+            attack INTEGER DEFAULT 0,
+            defense INTEGER DEFAULT 0,
+            max_cp INTEGER DEFAULT 0,
+            buddy_distance INTEGER DEFAULT 0,
+            tier_data TEXT,
+            best_moveset TEXT,
+            costumes TEXT,
+            UNIQUE(pokedex_num, form)
+        )
+    """)
+
+    # Check for missing/extra columns in pokemon_species
+    async with db.execute("PRAGMA table_info(pokemon_species)") as cursor:
+        columns = [row['name'] for row in await cursor.fetchall()]
+
+    # Migration: Remove sp_atk, sp_def, speed if they exist
+    if 'sp_atk' in columns:
+        logger.info("Migrating pokemon_species table to remove MSG stats (sp_atk, sp_def, speed).")
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS pokemon_species_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pokedex_num INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                form TEXT DEFAULT 'Normal',
+                type1 TEXT,
+                type2 TEXT,
+                image_url TEXT,
+                shiny_image_url TEXT,
+                can_dynamax BOOLEAN DEFAULT 0,
+                can_gigantamax BOOLEAN DEFAULT 0,
+                can_mega BOOLEAN DEFAULT 0,
+                is_legendary BOOLEAN DEFAULT 0,
+                is_mythical BOOLEAN DEFAULT 0,
+                hp INTEGER DEFAULT 0,
+                attack INTEGER DEFAULT 0,
+                defense INTEGER DEFAULT 0,
+                max_cp INTEGER DEFAULT 0,
+                buddy_distance INTEGER DEFAULT 0,
+                tier_data TEXT,
+                best_moveset TEXT,
+                costumes TEXT,
+                UNIQUE(pokedex_num, form)
+            )
+        """)
+        # Copy data
+        # We select explicitly the columns we want to keep
+        await db.execute("""
+            INSERT INTO pokemon_species_new (
+                id, pokedex_num, name, form, type1, type2, image_url, shiny_image_url,
+                can_dynamax, can_gigantamax, can_mega, is_legendary, is_mythical,
+                hp, attack, defense, max_cp, buddy_distance, tier_data, best_moveset, costumes
+            )
+            SELECT
+                id, pokedex_num, name, form, type1, type2, image_url, shiny_image_url,
+                can_dynamax, can_gigantamax, can_mega, is_legendary, is_mythical,
+                hp, attack, defense, max_cp, buddy_distance, tier_data, best_moveset, costumes
+            FROM pokemon_species
+        """)
+        await db.execute("DROP TABLE pokemon_species")
+        await db.execute("ALTER TABLE pokemon_species_new RENAME TO pokemon_species")
+        logger.info("Migration complete.")
+
+    # Simple migration for adding missing columns (if any, for future proofing or missing ones)
+    async with db.execute("PRAGMA table_info(pokemon_species)") as cursor:
+        columns = [row['name'] for row in await cursor.fetchall()]
+
+    new_columns = ['hp', 'attack', 'defense', 'max_cp', 'buddy_distance']
+    for col in new_columns:
+        if col not in columns:
+            logger.info(f"Adding missing column {col} to pokemon_species table.")
+            await db.execute(f"ALTER TABLE pokemon_species ADD COLUMN {col} INTEGER DEFAULT 0")
+
+    if 'shiny_image_url' not in columns:
+        logger.info("Adding missing column shiny_image_url to pokemon_species table.")
+        await db.execute("ALTER TABLE pokemon_species ADD COLUMN shiny_image_url TEXT")
+
+    if 'tier_data' not in columns:
+        logger.info("Adding missing column tier_data to pokemon_species table.")
+        await db.execute("ALTER TABLE pokemon_species ADD COLUMN tier_data TEXT")
+
+    if 'best_moveset' not in columns:
+        logger.info("Adding missing column best_moveset to pokemon_species table.")
+        await db.execute("ALTER TABLE pokemon_species ADD COLUMN best_moveset TEXT")
+
+    if 'costumes' not in columns:
+        logger.info("Adding missing column costumes to pokemon_species table.")
+        await db.execute("ALTER TABLE pokemon_species ADD COLUMN costumes TEXT")
+
+    # 3. Listings
+    # Changed pokemon_id (int) to species_id (FK)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS listings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            account_id INTEGER NOT NULL,
+            listing_type TEXT NOT NULL CHECK(listing_type IN ('HAVE', 'WANT')),
+            species_id INTEGER NOT NULL,
+            is_shiny BOOLEAN DEFAULT 0,
+            is_purified BOOLEAN DEFAULT 0,
+            is_dynamax BOOLEAN DEFAULT 0,
+            is_gigantamax BOOLEAN DEFAULT 0,
+            is_background BOOLEAN DEFAULT 0,
+            is_adventure_effect BOOLEAN DEFAULT 0,
+            is_mirror BOOLEAN DEFAULT 0,
+            details TEXT,
+            costume TEXT,
+            status TEXT DEFAULT 'ACTIVE' CHECK(status IN ('ACTIVE', 'PENDING', 'COMPLETED', 'CANCELLED')),
+            message_id INTEGER,
+            channel_id INTEGER,
+            guild_id INTEGER,
+            count INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (account_id) REFERENCES users (id) ON DELETE CASCADE,
+            FOREIGN KEY (species_id) REFERENCES pokemon_species (id) ON DELETE RESTRICT
+        )
+    """)
+
+    # Check for missing columns in listings
+    async with db.execute("PRAGMA table_info(listings)") as cursor:
+        columns = [row['name'] for row in await cursor.fetchall()]
+
+    if 'count' not in columns:
+        logger.info("Adding missing column count to listings table.")
+        await db.execute("ALTER TABLE listings ADD COLUMN count INTEGER DEFAULT 1")
+
+    if 'costume' not in columns:
+        logger.info("Adding missing column costume to listings table.")
+        await db.execute("ALTER TABLE listings ADD COLUMN costume TEXT")
+
+    # 4. Trades
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS trades (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            channel_id INTEGER,
+            listing_a_id INTEGER NOT NULL,
+            listing_b_id INTEGER NOT NULL,
+            status TEXT DEFAULT 'OPEN' CHECK(status IN ('OPEN', 'CLOSED')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (listing_a_id) REFERENCES listings (id) ON DELETE CASCADE,
+            FOREIGN KEY (listing_b_id) REFERENCES listings (id) ON DELETE CASCADE
+        )
+    """)
+
+    # 4b. Match queue (listings waiting to be matched by the background workers)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS match_queue (
+            listing_id INTEGER PRIMARY KEY,
+            guild_id INTEGER,
+            trade_id INTEGER,
+            attempts INTEGER DEFAULT 0,
+            enqueued_at REAL NOT NULL,
+            available_at REAL NOT NULL,
+            claimed_at REAL,
+            last_error TEXT
+        )
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_match_queue_available ON match_queue (available_at)")
+
+    # 5. Events
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            link TEXT NOT NULL,
+            image_url TEXT,
+            start_time INTEGER NOT NULL,
+            end_time INTEGER,
+            type TEXT DEFAULT 'Event',
+            time_text TEXT,
+            notified_morning BOOLEAN DEFAULT 0,
+            notified_2h BOOLEAN DEFAULT 0,
+            notified_5m BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(link)
+        )
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_start_time ON events (start_time)")
+
+    # Check for missing columns in events
+    async with db.execute("PRAGMA table_info(events)") as cursor:
+        columns = [row['name'] for row in await cursor.fetchall()]
+
+    new_event_columns = {
+        'type': "TEXT DEFAULT 'Event'",
+        'time_text': "TEXT",
+        'notified_morning': "BOOLEAN DEFAULT 0"
+    }
+    for col, col_type in new_event_columns.items():
+        if col not in columns:
+            logger.info(f"Adding missing column {col} to events table.")
+            await db.execute(f"ALTER TABLE events ADD COLUMN {col} {col_type}")
+
+    # 6. Guild Config
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS guild_config (
+            guild_id INTEGER PRIMARY KEY,
+            event_channel_id INTEGER,
+            event_role_id INTEGER,
+            have_channel_id INTEGER,
+            want_channel_id INTEGER,
+            trade_category_id INTEGER,
+            suggestion_channel_id INTEGER,
+            upvote_emoji TEXT,
+            downvote_emoji TEXT
+        )
+    """)
+
+    # Check for missing columns in guild_config
+    async with db.execute("PRAGMA table_info(guild_config)") as cursor:
+        columns = [row['name'] for row in await cursor.fetchall()]
+
+    if 'suggestion_channel_id' not in columns:
+        logger.info("Adding missing columns for suggestions to guild_config table.")
+        await db.execute("ALTER TABLE guild_config ADD COLUMN suggestion_channel_id INTEGER")
+        await db.execute("ALTER TABLE guild_config ADD COLUMN upvote_emoji TEXT")
+        await db.execute("ALTER TABLE guild_config ADD COLUMN downvote_emoji TEXT")
+
+    # 7. Autodelete Config
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS autodelete_config (
+            channel_id INTEGER PRIMARY KEY,
+            guild_id INTEGER,
+            duration_minutes INTEGER,
+            swept_until INTEGER
+        )
+    """)
+
+    # Check for missing columns in autodelete_config
+    async with db.execute("PRAGMA table_info(autodelete_config)") as cursor:
+        columns = [row['name'] for row in await cursor.fetchall()]
+
+    if 'swept_until' not in columns:
+        logger.info("Adding missing column swept_until to autodelete_config table.")
+        await db.execute("ALTER TABLE autodelete_config ADD COLUMN swept_until INTEGER")
+
+    # 7b. Autodelete message ledger (messages seen in autodelete channels)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS autodelete_messages (
+            message_id INTEGER PRIMARY KEY,
+            channel_id INTEGER NOT NULL,
+            created_at INTEGER NOT NULL
+        )
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_autodelete_messages_channel ON autodelete_messages (channel_id, created_at)")
+
+    # 8. User Departures
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS user_departures (
+            user_id INTEGER PRIMARY KEY,
+            guild_id INTEGER,
+            departed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+# Tables captured by the changelog (incremental backups, see services/backup.py).
+# Derived data (users_fts) and the migration bookkeeping are left out, and so are the
+# work tables match_queue and autodelete_messages: they are written on every job claim and
+# every message, and their restored contents would be stale (claims, ledger) anyway.
+CHANGELOG_TABLES = [
+    "users", "pokemon_species", "listings", "trades", "events",
+    "guild_config", "autodelete_config", "user_departures",
+]
+UNLOGGED_TABLES = ["match_queue", "autodelete_messages"]
+
+async def create_changelog_triggers(db):
+    """
+    (Re)creates the triggers that record every row change of CHANGELOG_TABLES.
+    Triggers list the columns explicitly, so a later migration that adds columns
+    to a captured table must call this again.
+    """
+    for table in CHANGELOG_TABLES:
+        async with db.execute(f"PRAGMA table_info({table})") as cursor:
+            columns = await cursor.fetchall()
+        pk = next(c['name'] for c in columns if c['pk'] == 1)
+        row = ", ".join(f"'{c['name']}', new.{c['name']}" for c in columns)
+        for op, event, ref in (("upsert", "INSERT", "new"), ("upsert", "UPDATE", "new"), ("delete", "DELETE", "old")):
+            trigger = f"changelog_{table}_{event[0].lower()}"
+            data = f"json_object({row})" if op == "upsert" else "NULL"
+            await db.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            await db.execute(f"""
+                CREATE TRIGGER {trigger} AFTER {event} ON {table} BEGIN
+                    INSERT INTO changelog (tbl, op, row_id, data) VALUES ('{table}', '{op}', {ref}.{pk}, {data});
+                END
+            """)
+
+async def _create_changelog(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS changelog (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tbl TEXT NOT NULL,
+            op TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            data TEXT
+        )
+    """)
+    await create_changelog_triggers(db)
+
+async def _create_leases(db):
+    """Named leases for electing the process that runs the global background tasks (services/cluster.py)."""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS leases (
+            name TEXT PRIMARY KEY,
+            holder TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    """)
+
+async def _unlog_work_tables(db):
+    """Migration 2 logged the work tables too; drop their triggers and log entries."""
+    for table in UNLOGGED_TABLES:
+        for event in ("i", "u", "d"):
+            await db.execute(f"DROP TRIGGER IF EXISTS changelog_{table}_{event}")
+    await db.execute(f"DELETE FROM changelog WHERE tbl IN ({', '.join('?' * len(UNLOGGED_TABLES))})", UNLOGGED_TABLES)
+
+async def _autodelete_attempts(db):
+    """Delete attempts per ledger message, so transient failures are retried a limited number of times."""
+    await db.execute("ALTER TABLE autodelete_messages ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+
+
+MIGRATIONS = [
+    Migration(1, "baseline schema", _baseline),
+    Migration(2, "changelog for incremental backups", _create_changelog),
+    Migration(3, "leader leases", _create_leases),
+    Migration(4, "work tables out of the changelog", _unlog_work_tables),
+    Migration(5, "autodelete ledger attempts", _autodelete_attempts),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+# --- Engine ---
+
+async def _applied_versions(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    async with db.execute("SELECT version FROM schema_version") as cursor:
+        return {row['version'] for row in await cursor.fetchall()}
+
+async def _apply(db, migration):
+    logger.info(f"Applying migration {migration.version}: {migration.name}")
+    await db.execute("BEGIN IMMEDIATE")
+    try:
+        await migration.apply(db)
+        await db.execute("INSERT INTO schema_version (version, name) VALUES (?, ?)", (migration.version, migration.name))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        logger.error(f"Migration {migration.version} ({migration.name}) failed, rolled back.")
+        raise
+
+async def _pending(db, migrations):
+    applied = await _applied_versions(db)
+    return [m for m in migrations if m.version not in applied]
+
+async def migrate(db, migrations=MIGRATIONS):
+    """Applies the pending migrations in order, each in its own transaction."""
+    pending = await _pending(db, migrations)
+    if not pending:
+        logger.info(f"Database schema is current (version {migrations[-1].version}).")
+        return
+
+    for migration in pending:
+        await _apply(db, migration)
+    logger.info(f"Database schema migrated to version {migrations[-1].version}.")
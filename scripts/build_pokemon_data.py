@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Add project root to sys.path so we can import data
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data.pokemon_build import build_database, COMPILED_DB
+
+if __name__ == "__main__":
+    count = build_database()
+    print(f"Wrote {count} pokemon to {COMPILED_DB}")
@@ -0,0 +1,304 @@
+"""
+Fills a database with a seeded, production-scale synthetic dataset for profiling:
+users with alt accounts, listings skewed toward popular species (Zipf) and realistic
+variant flags, open/closed/expired trades, events, guild configs and autodelete ledgers.
+
+Usage:
+    python scripts/generate_dataset.py --db data/synthetic.db
+    python scripts/generate_dataset.py --db trade_bot.db --force --users 20000 --listings 500000
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import random
+import sys
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database
+from data.pokemon_source import POKEMON_NAMES
+
+TEAMS = ["Mystic", "Valor", "Instinct"]
+TEAM_WEIGHTS = [45, 35, 20]
+REGIONS = ["Praha", "Brno", "Ostrava", "Plzeň", "Olomouc", "Liberec", "České Budějovice", "Hradec Králové", "Pardubice", "Zlín"]
+REGION_WEIGHTS = [30, 15, 10, 8, 7, 6, 6, 6, 6, 6]
+REGIONAL_FORMS = ["Alola", "Galar", "Hisui", "Paldea"]
+TYPES = ["Normal", "Fire", "Water", "Grass", "Electric", "Ice", "Fighting", "Poison", "Ground",
+         "Flying", "Psychic", "Bug", "Rock", "Ghost", "Dragon", "Dark", "Steel", "Fairy"]
+COSTUMES = ["Party Hat", "Holiday", "Halloween", "Flower Crown", "Witch Hat", "Detective"]
+DETAILS = [None, None, None, "Lucky", "100%", "Hundo pls", "Jen výměna", "Trade za kus", "Best buddy", "Vánoční"]
+ALT_ACCOUNTS = [0, 1, 2, 3] # extra accounts per user
+ALT_WEIGHTS = [70, 20, 8, 2]
+# Probability of each variant flag on a listing
+FLAG_RATES = {
+    'is_shiny': 0.25, 'is_purified': 0.05, 'is_dynamax': 0.04, 'is_gigantamax': 0.01,
+    'is_background': 0.03, 'is_adventure_effect': 0.02, 'is_mirror': 0.05,
+}
+BATCH = 5000
+
+class DatasetConfig:
+    def __init__(self, seed=42, guilds=3, users=5000, listings=200000, open_trades=2000, closed_trades=20000,
+                 events=300, autodelete_channels=10, ledger_messages=50000, departures=50,
+                 regional_forms=0.1, species_skew=1.1, account_skew=0.8, days=180):
+        self.seed = seed
+        self.guilds = guilds
+        self.users = users
+        self.listings = listings
+        self.open_trades = open_trades
+        self.closed_trades = closed_trades
+        self.events = events
+        self.autodelete_channels = autodelete_channels
+        self.ledger_messages = ledger_messages
+        self.departures = departures
+        self.regional_forms = regional_forms # share of species that get a regional form
+        self.species_skew = species_skew # Zipf exponent of species popularity
+        self.account_skew = account_skew # Zipf exponent of listings per account (power traders)
+        self.days = days # history length
+
+def zipf_weights(n, s):
+    """Cumulative weights of ranks 1..n with P(rank k) ~ 1 / k^s."""
+    cumulative = []
+    total = 0.0
+    for k in range(1, n + 1):
+        total += 1.0 / (k ** s)
+        cumulative.append(total)
+    return cumulative
+
+class DatasetGenerator:
+    def __init__(self, config):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.now = int(time.time())
+        self._ids = set()
+        self.guild_ids = []
+        self.species_ids = [] # ordered by popularity
+        self.accounts = [] # (account id, user_id), ordered by activity
+        self.counts = {}
+
+    def snowflake(self):
+        while True:
+            value = self.random.randrange(10**17, 10**18)
+            if value not in self._ids:
+                self._ids.add(value)
+                return value
+
+    def timestamp(self, max_age_days=None):
+        max_age = (max_age_days or self.config.days) * 86400
+        return self.now - self.random.randrange(max_age)
+
+    @staticmethod
+    def sql_time(ts):
+        return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+    async def _insert(self, db, sql, rows):
+        for i in range(0, len(rows), BATCH):
+            await db.executemany(sql, rows[i:i + BATCH])
+
+    async def generate(self):
+        await database.init_db()
+        async with database.get_db() as db:
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                await self._species(db)
+                await self._guilds(db)
+                await self._users(db)
+                await self._listings(db)
+                await self._trades(db)
+                await self._events(db)
+                await self._autodelete(db)
+                await self._departures(db)
+                # A generated dataset is its own baseline, there is nothing to back up incrementally
+                await db.execute("DELETE FROM changelog")
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+            await db.execute("ANALYZE")
+            await db.commit()
+        return self.counts
+
+    async def _species(self, db):
+        rows = []
+        for name, num in sorted(POKEMON_NAMES.items(), key=lambda item: item[1]):
+            type1, type2 = self.random.choice(TYPES), self.random.choice(TYPES + [None] * 10)
+            rows.append((num, name, "Normal", type1, type2 if type2 != type1 else None))
+            if self.random.random() < self.config.regional_forms:
+                rows.append((num, name, self.random.choice(REGIONAL_FORMS), self.random.choice(TYPES), None))
+        await self._insert(db, """
+            INSERT OR IGNORE INTO pokemon_species (pokedex_num, name, form, type1, type2, image_url, shiny_image_url)
+            VALUES (?, ?, ?, ?, ?, NULL, NULL)
+        """, rows)
+        async with db.execute("SELECT id FROM pokemon_species ORDER BY id") as cursor:
+            self.species_ids = [row['id'] for row in await cursor.fetchall()]
+        # Popularity rank is independent of dex order
+        self.random.shuffle(self.species_ids)
+        self.counts['species'] = len(self.species_ids)
+
+    async def _guilds(self, db):
+        self.guild_ids = [self.snowflake() for _ in range(self.config.guilds)]
+        rows = [(g, self.snowflake(), self.snowflake(), self.snowflake(), self.snowflake(), self.snowflake(), self.snowflake())
+                for g in self.guild_ids]
+        await self._insert(db, """
+            INSERT INTO guild_config (guild_id, event_channel_id, event_role_id, have_channel_id, want_channel_id, trade_category_id, suggestion_channel_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        self.counts['guilds'] = len(rows)
+
+    async def _users(self, db):
+        rows = []
+        for i in range(self.config.users):
+            user_id = self.snowflake()
+            team = self.random.choices(TEAMS, TEAM_WEIGHTS)[0]
+            region = self.random.choices(REGIONS, REGION_WEIGHTS)[0]
+            wants_friends = self.random.random() < 0.3
+            created = self.sql_time(self.timestamp())
+            alts = self.random.choices(ALT_ACCOUNTS, ALT_WEIGHTS)[0]
+            for n in range(alts + 1):
+                name = f"Trainer{i}" if n == 0 else f"Trainer{i}Alt{n}"
+                friend_code = f"{self.random.randrange(10**11, 10**12)}"
+                # Alts mostly share the main's team/region
+                alt_team = team if n == 0 or self.random.random() < 0.7 else self.random.choice(TEAMS)
+                rows.append((user_id, friend_code, alt_team, region, name, n == 0, wants_friends and n == 0, created, created))
+        await self._insert(db, """
+            INSERT INTO users (user_id, friend_code, team, region, account_name, is_main, want_more_friends, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        async with db.execute("SELECT id, user_id FROM users ORDER BY id") as cursor:
+            self.accounts = [(row['id'], row['user_id']) for row in await cursor.fetchall()]
+        self.random.shuffle(self.accounts)
+        self.counts['users'] = self.config.users
+        self.counts['accounts'] = len(self.accounts)
+
+    def _listing_row(self, status, species_id=None, listing_type=None, account=None, created=None):
+        flags = {flag: self.random.random() < rate for flag, rate in FLAG_RATES.items()}
+        if flags['is_gigantamax']:
+            flags['is_dynamax'] = False
+        account_id, user_id = account or self.random.choices(self.accounts, cum_weights=self._account_weights)[0]
+        created = created or self.timestamp()
+        return (
+            user_id, account_id,
+            listing_type or self.random.choice(["HAVE", "WANT"]),
+            species_id or self.random.choices(self.species_ids, cum_weights=self._species_weights)[0],
+            flags['is_shiny'], flags['is_purified'], flags['is_dynamax'], flags['is_gigantamax'],
+            flags['is_background'], flags['is_adventure_effect'], flags['is_mirror'],
+            self.random.choice(DETAILS),
+            self.random.choice(COSTUMES) if self.random.random() < 0.03 else None,
+            status, self.snowflake(), self.snowflake(), self.random.choice(self.guild_ids),
+            min(10, int(self.random.expovariate(0.8)) + 1),
+            self.sql_time(created),
+        )
+
+    LISTING_SQL = """
+        INSERT INTO listings (user_id, account_id, listing_type, species_id,
+                              is_shiny, is_purified, is_dynamax, is_gigantamax, is_background, is_adventure_effect, is_mirror,
+                              details, costume, status, message_id, channel_id, guild_id, count, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    async def _listings(self, db):
+        self._species_weights = zipf_weights(len(self.species_ids), self.config.species_skew)
+        self._account_weights = zipf_weights(len(self.accounts), self.config.account_skew)
+        statuses = ["ACTIVE", "COMPLETED", "CANCELLED"]
+        rows = [self._listing_row(self.random.choices(statuses, [85, 10, 5])[0]) for _ in range(self.config.listings)]
+        await self._insert(db, self.LISTING_SQL, rows)
+        self.counts['listings'] = len(rows)
+
+    async def _trades(self, db):
+        trades = []
+        listings = []
+        for i in range(self.config.open_trades + self.config.closed_trades):
+            status = "OPEN" if i < self.config.open_trades else "CLOSED"
+            # ~30% of open trades are older than the 7 day expiry, so cleanup_trades has work to do
+            created = self.timestamp(7 if self.random.random() < 0.7 else 30) if status == "OPEN" else self.timestamp()
+            species_id = self.random.choices(self.species_ids, cum_weights=self._species_weights)[0]
+            a, b = self.random.sample(self.accounts, 2)
+            listing_status = "PENDING" if status == "OPEN" else "COMPLETED"
+            listings.append(self._listing_row(listing_status, species_id, "HAVE", a, created))
+            listings.append(self._listing_row(listing_status, species_id, "WANT", b, created))
+            trades.append((self.snowflake() if status == "OPEN" else None, status, self.sql_time(created)))
+
+        # We hold the write lock, so AUTOINCREMENT hands out consecutive ids
+        async with db.execute("SELECT COALESCE(MAX(id), 0) AS max_id FROM listings") as cursor:
+            first_id = (await cursor.fetchone())['max_id'] + 1
+        await self._insert(db, self.LISTING_SQL, listings)
+        rows = [(channel_id, first_id + 2 * i, first_id + 2 * i + 1, status, created)
+                for i, (channel_id, status, created) in enumerate(trades)]
+        await self._insert(db, "INSERT INTO trades (channel_id, listing_a_id, listing_b_id, status, created_at) VALUES (?, ?, ?, ?, ?)", rows)
+        self.counts['listings'] += len(listings)
+        self.counts['trades'] = len(rows)
+
+    async def _events(self, db):
+        kinds = ["Event", "Raid Hour", "Spotlight Hour", "Community Day", "Raid Day", "Research"]
+        rows = []
+        for i in range(self.config.events):
+            start = self.now + self.random.randrange(-self.config.days * 86400, 60 * 86400)
+            duration = self.random.choice([3600, 3 * 3600, 86400, 7 * 86400])
+            past = start < self.now
+            rows.append((f"Synthetic event {i}", f"https://leekduck.com/events/synthetic-{i}/", None,
+                         start, start + duration, self.random.choice(kinds), "", past, past, past))
+        await self._insert(db, """
+            INSERT INTO events (name, link, image_url, start_time, end_time, type, time_text, notified_morning, notified_2h, notified_5m)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        self.counts['events'] = len(rows)
+
+    async def _autodelete(self, db):
+        channels = []
+        for _ in range(self.config.autodelete_channels):
+            channel_id = self.snowflake()
+            channels.append((channel_id, self.random.choice(self.guild_ids), self.random.choice([60, 360, 1440, 10080]), None))
+        await self._insert(db, "INSERT INTO autodelete_config (channel_id, guild_id, duration_minutes, swept_until) VALUES (?, ?, ?, ?)", channels)
+
+        rows = []
+        if channels:
+            # Message volume is skewed too: a few busy channels hold most of the ledger
+            weights = zipf_weights(len(channels), 1.0)
+            for _ in range(self.config.ledger_messages):
+                channel = self.random.choices(channels, cum_weights=weights)[0]
+                rows.append((self.snowflake(), channel[0], self.timestamp(14)))
+        await self._insert(db, "INSERT INTO autodelete_messages (message_id, channel_id, created_at) VALUES (?, ?, ?)", rows)
+        self.counts['autodelete_channels'] = len(channels)
+        self.counts['autodelete_messages'] = len(rows)
+
+    async def _departures(self, db):
+        users = self.random.sample(sorted({user_id for _, user_id in self.accounts}), min(self.config.departures, self.config.users))
+        rows = [(user_id, self.random.choice(self.guild_ids), self.sql_time(self.timestamp(3))) for user_id in users]
+        await self._insert(db, "INSERT INTO user_departures (user_id, guild_id, departed_at) VALUES (?, ?, ?)", rows)
+        self.counts['departures'] = len(rows)
+
+async def generate_dataset(db_path, config):
+    """Generates the dataset into db_path (which should not exist yet). Returns row counts."""
+    original_db = database.DB_NAME
+    database.DB_NAME = db_path
+    try:
+        return await DatasetGenerator(config).generate()
+    finally:
+        database.DB_NAME = original_db
+
+def main():
+    defaults = DatasetConfig()
+    parser = argparse.ArgumentParser(description="Generate a synthetic production-scale database.")
+    parser.add_argument('--db', default="data/synthetic.db", help="Target database file")
+    parser.add_argument('--force', action='store_true', help="Delete the target database if it exists")
+    for name, value in vars(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        if not args.force:
+            print(f"{args.db} already exists, use --force to replace it.")
+            sys.exit(1)
+        os.remove(args.db)
+
+    config = DatasetConfig(**{name: getattr(args, name) for name in vars(defaults)})
+    started = time.perf_counter()
+    counts = asyncio.run(generate_dataset(args.db, config))
+    print(f"Generated {args.db} in {time.perf_counter() - started:.1f}s (seed {config.seed}):")
+    for table, count in counts.items():
+        print(f"  {table}: {count}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Restores the database from a full backup plus the incremental change segments taken after it.
+
+Usage:
+    python scripts/restore_backup.py --force                     # newest backup in data/backups + its segments
+    python scripts/restore_backup.py backup.db.gz changes.jsonl.gz --db restored.db
+    python scripts/restore_backup.py --force --until-seq 12345   # point in time: stop after changelog seq 12345
+
+Stop the bot before restoring over its live database, and take a full backup (!backup full)
+once it is running again.
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database
+from services.backup import BACKUP_DIR, list_backups, list_segments, restore_backup
+
+def main():
+    parser = argparse.ArgumentParser(description="Restore a full backup and replay change segments.")
+    parser.add_argument('backup', nargs='?', help="Full backup (.db.gz), default: newest in --dir")
+    parser.add_argument('segments', nargs='*', help="Change segments (.changes.jsonl.gz), default: all in --dir taken after the backup")
+    parser.add_argument('--dir', default=BACKUP_DIR, help="Backup directory")
+    parser.add_argument('--db', default=database.DB_NAME, help="Database file to restore into")
+    parser.add_argument('--until-seq', type=int, help="Replay changes up to this changelog seq")
+    parser.add_argument('--no-changes', action='store_true', help="Restore the full backup only")
+    parser.add_argument('--force', action='store_true', help="Overwrite an existing database")
+    args = parser.parse_args()
+
+    backup = args.backup
+    if backup is None:
+        backups = list_backups(args.dir)
+        if not backups:
+            print(f"No backups found in {args.dir}.")
+            sys.exit(1)
+        backup = backups[0]
+
+    segments = [] if args.no_changes else args.segments or list_segments(args.dir, since=backup)
+
+    if os.path.exists(args.db) and not args.force:
+        print(f"{args.db} already exists, use --force to replace it.")
+        sys.exit(1)
+
+    # Restoring the live database retires the segments of the history it discards
+    rebase = os.path.abspath(args.db) == os.path.abspath(database.DB_NAME)
+
+    print(f"Restoring {backup} into {args.db}")
+    for path in segments:
+        print(f"  + {path}")
+    started = time.perf_counter()
+    applied = restore_backup(backup, args.db, segments, args.until_seq, rebase=rebase, backup_dir=args.dir)
+    print(f"Done in {time.perf_counter() - started:.1f}s, {applied} changes replayed.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Runs the bot as a cluster of shard processes on one machine.
+Every process runs main.py with its own SHARD_IDS and metrics port. They share trade_bot.db
+(WAL mode) and elect one leader for the global background tasks (services/cluster.py).
+Crashed processes are restarted, with backoff if they keep crashing.
+
+Usage:
+    python scripts/run_cluster.py --clusters 4                 # shard count recommended by Discord
+    python scripts/run_cluster.py --shards 16 --clusters 4
+"""
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import time
+import aiohttp
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Add project root to sys.path
+sys.path.append(PROJECT_ROOT)
+
+import config
+
+RESTART_DELAY = 5 # seconds, doubled while a process keeps crashing
+MAX_RESTART_DELAY = 300
+STABLE_UPTIME = 60 # a process that ran this long is restarted without backoff
+IDENTIFY_INTERVAL = 5.5 # Discord allows one shard IDENTIFY per 5 s
+STOP_TIMEOUT = 30
+
+async def recommended_shards(token):
+    async with aiohttp.ClientSession() as session:
+        async with session.get("https://discord.com/api/v10/gateway/bot", headers={"Authorization": f"Bot {token}"}) as resp:
+            resp.raise_for_status()
+            return (await resp.json())['shards']
+
+def split_shards(shard_count, clusters):
+    """Contiguous, near-equal shard id ranges, one per cluster process."""
+    clusters = max(1, min(clusters, shard_count))
+    size, extra = divmod(shard_count, clusters)
+    ranges = []
+    start = 0
+    for i in range(clusters):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+async def run_process(cluster_id, shard_count, shard_ids, metrics_port, stopping):
+    env = dict(os.environ, SHARD_COUNT=str(shard_count), SHARD_IDS=",".join(map(str, shard_ids)), CLUSTER_ID=str(cluster_id))
+    env['METRICS_PORT'] = str(metrics_port + cluster_id if metrics_port else 0)
+    name = f"cluster {cluster_id} (shards {shard_ids[0]}-{shard_ids[-1]})"
+
+    # Let the earlier clusters identify their shards first
+    try:
+        await asyncio.wait_for(stopping.wait(), timeout=shard_ids[0] * IDENTIFY_INTERVAL)
+        return
+    except asyncio.TimeoutError:
+        pass
+
+    delay = RESTART_DELAY
+    while not stopping.is_set():
+        started = time.monotonic()
+        proc = await asyncio.create_subprocess_exec(sys.executable, "main.py", cwd=PROJECT_ROOT, env=env)
+        print(f"Started {name}, pid {proc.pid}")
+
+        exited = asyncio.create_task(proc.wait())
+        stop = asyncio.create_task(stopping.wait())
+        await asyncio.wait({exited, stop}, return_when=asyncio.FIRST_COMPLETED)
+        if not exited.done():
+            # Shutting down: bot.run only closes cleanly (and hands over the leader lease) on
+            # KeyboardInterrupt, so send SIGINT; SIGTERM would kill it mid-flight
+            proc.send_signal(signal.SIGINT)
+            try:
+                await asyncio.wait_for(exited, timeout=STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await exited
+            print(f"Stopped {name}")
+            return
+        stop.cancel()
+
+        if time.monotonic() - started >= STABLE_UPTIME:
+            delay = RESTART_DELAY
+        print(f"{name} exited with code {proc.returncode}, restarting in {delay}s")
+        try:
+            await asyncio.wait_for(stopping.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        delay = min(delay * 2, MAX_RESTART_DELAY)
+
+async def run_cluster(shard_count, clusters, metrics_port):
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    ranges = split_shards(shard_count, clusters)
+    print(f"Running {shard_count} shards in {len(ranges)} processes")
+    await asyncio.gather(*[
+        run_process(i, shard_count, shard_ids, metrics_port, stopping)
+        for i, shard_ids in enumerate(ranges)
+    ])
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the bot as a cluster of shard processes.")
+    parser.add_argument('--shards', type=int, help="Total shard count (default: Discord's recommendation)")
+    parser.add_argument('--clusters', type=int, default=os.cpu_count() or 1, help="Number of processes (default: CPU count)")
+    parser.add_argument('--metrics-port', type=int, default=config.METRICS_PORT,
+                        help="Metrics port of cluster 0, cluster N uses port + N (0 disables)")
+    args = parser.parse_args()
+
+    if not config.TOKEN:
+        print("No token found. Please check your .env file.")
+        sys.exit(1)
+
+    shard_count = args.shards or asyncio.run(recommended_shards(config.TOKEN))
+    asyncio.run(run_cluster(shard_count, args.clusters, args.metrics_port))
+
+if __name__ == "__main__":
+    main()
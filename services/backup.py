@@ -0,0 +1,385 @@
+import asyncio
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import time
+from io import BytesIO
+import database
+import migrations
+
+logger = logging.getLogger('discord')
+
+BACKUP_DIR = "data/backups"
+RETENTION = int(os.getenv("BACKUP_RETENTION", "7")) # backups kept per label
+PAGES_PER_STEP = 256 # pages copied per backup step; the source is only read-locked during a step
+STEP_PAUSE = 0.01 # seconds between steps, gives writers a window
+CHUNK_SIZE = 1024 * 1024
+DELIVERED_FILE = "delivered.json" # which full backup the owner has, change bundles build on it
+UPLOAD_PART_SIZE = 9 * 1024 * 1024 # stays under Discord's 10 MiB upload limit
+_NAME_RE = re.compile(r"^(?P<stem>.+)-(?P<stamp>\d{8}-\d{6})-(?P<label>[a-z0-9-]+)\.db\.gz$")
+_SEGMENT_RE = re.compile(r"^(?P<stem>.+)-(?P<stamp>\d{8}-\d{6})-(?P<first>\d+)-(?P<last>\d+)\.changes\.jsonl\.gz$")
+
+# Full snapshots and change segments both read/trim the changelog, one at a time
+_lock = asyncio.Lock()
+
+class BackupInfo:
+    def __init__(self, path, db_size, size, sha256, seconds, seq=0):
+        self.path = path
+        self.db_size = db_size # uncompressed snapshot size
+        self.size = size # compressed size
+        self.sha256 = sha256
+        self.seconds = seconds
+        self.seq = seq # changelog position the snapshot includes
+
+    @property
+    def filename(self):
+        return os.path.basename(self.path)
+
+class SegmentInfo:
+    """An incremental backup: changelog entries first..last as gzip JSON lines."""
+    def __init__(self, path, first, last, count, size, seconds):
+        self.path = path
+        self.first = first
+        self.last = last
+        self.count = count
+        self.size = size
+        self.seconds = seconds
+
+    @property
+    def filename(self):
+        return os.path.basename(self.path)
+
+def _changelog_position(conn):
+    """Highest changelog seq ever assigned in this database (0 if it has no changelog)."""
+    try:
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changelog'").fetchone()
+    except sqlite3.OperationalError: # no AUTOINCREMENT table -> no sqlite_sequence
+        return 0
+    return row[0] if row else 0
+
+def _snapshot(db_path, snapshot_path):
+    """Copies a consistent snapshot of db_path with the online backup API, PAGES_PER_STEP pages at a time."""
+    def pause(status, remaining, total):
+        if remaining:
+            time.sleep(STEP_PAUSE)
+
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(snapshot_path)
+    try:
+        source.backup(target, pages=PAGES_PER_STEP, progress=pause)
+        result = target.execute("PRAGMA quick_check").fetchone()[0]
+        if result != "ok":
+            raise sqlite3.DatabaseError(f"Snapshot failed quick_check: {result}")
+    finally:
+        target.close()
+        source.close()
+
+def _compress(src_path, dest_path):
+    """Streams src into a gzip file, returns the sha256 of the compressed output."""
+    digest = hashlib.sha256()
+    tmp = f"{dest_path}.tmp"
+    with open(src_path, 'rb') as src, open(tmp, 'wb') as raw:
+        with gzip.GzipFile(filename=os.path.basename(src_path), mode='wb', fileobj=raw, compresslevel=6) as gz:
+            while chunk := src.read(CHUNK_SIZE):
+                gz.write(chunk)
+    with open(tmp, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    os.replace(tmp, dest_path)
+    return digest.hexdigest()
+
+def create_backup(db_path=None, backup_dir=BACKUP_DIR, label="manual"):
+    """Snapshots the database and writes <db>-<timestamp>-<label>.db.gz. Sync: run it in a thread."""
+    db_path = db_path or database.DB_NAME
+    started = time.perf_counter()
+    os.makedirs(backup_dir, exist_ok=True)
+
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(backup_dir, f"{stem}-{stamp}-{label}.db.gz")
+    snapshot = os.path.join(backup_dir, f".{stem}-{stamp}-{label}.snapshot")
+    try:
+        _snapshot(db_path, snapshot)
+        conn = sqlite3.connect(snapshot)
+        try:
+            seq = _changelog_position(conn)
+        finally:
+            conn.close()
+        db_size = os.path.getsize(snapshot)
+        sha256 = _compress(snapshot, path)
+    finally:
+        if os.path.exists(snapshot):
+            os.remove(snapshot)
+
+    info = BackupInfo(path, db_size, os.path.getsize(path), sha256, time.perf_counter() - started, seq)
+    logger.info(f"Database backup {info.filename}: {info.db_size} -> {info.size} bytes in {info.seconds:.1f}s")
+    return info
+
+def create_segment(db_path=None, backup_dir=BACKUP_DIR):
+    """
+    Writes the changelog to <db>-<timestamp>-<first>-<last>.changes.jsonl.gz and trims the
+    shipped entries. Returns None if nothing changed since the last segment. Sync: run it in a thread.
+    The changelog is only trimmed here, so segments form one unbroken chain across full snapshots.
+    """
+    db_path = db_path or database.DB_NAME
+    started = time.perf_counter()
+    os.makedirs(backup_dir, exist_ok=True)
+
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    tmp = os.path.join(backup_dir, f".{stem}-{stamp}.changes.tmp")
+    first = last = None
+    count = 0
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        # A single SELECT reads one consistent cut of the changelog
+        with gzip.open(tmp, 'wt', encoding='utf-8') as out:
+            for seq, table, op, row_id, data in conn.execute("SELECT seq, tbl, op, row_id, data FROM changelog ORDER BY seq"):
+                out.write(json.dumps({'seq': seq, 'table': table, 'op': op, 'row_id': row_id,
+                                      'data': json.loads(data) if data else None}, ensure_ascii=False) + "\n")
+                first = first or seq
+                last = seq
+                count += 1
+        if not count:
+            return None
+
+        path = os.path.join(backup_dir, f"{stem}-{stamp}-{first}-{last}.changes.jsonl.gz")
+        os.replace(tmp, path)
+        conn.execute("DELETE FROM changelog WHERE seq <= ?", (last,))
+        conn.commit()
+    finally:
+        conn.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    info = SegmentInfo(path, first, last, count, os.path.getsize(path), time.perf_counter() - started)
+    logger.info(f"Change segment {info.filename}: {count} changes, {info.size} bytes in {info.seconds:.2f}s")
+    return info
+
+def list_segments(backup_dir=BACKUP_DIR, since=None):
+    """Change segment paths in replay order. `since` (a full backup path) keeps only the segments taken after it."""
+    try:
+        names = os.listdir(backup_dir)
+    except FileNotFoundError:
+        return []
+    base = _NAME_RE.match(os.path.basename(since)) if since else None
+    start = base['stamp'] if base else None
+    segments = []
+    for name in names:
+        match = _SEGMENT_RE.match(name)
+        if match and (start is None or match['stamp'] >= start):
+            segments.append((int(match['first']), int(match['last']), os.path.join(backup_dir, name)))
+    return [path for _, _, path in sorted(segments)]
+
+def bundle_segments(paths, dest_dir):
+    """
+    Concatenates segments into one segment file in dest_dir (gzip members concatenate
+    into a valid gzip stream). Returns its path.
+    """
+    first = _SEGMENT_RE.match(os.path.basename(paths[0]))
+    last = _SEGMENT_RE.match(os.path.basename(paths[-1]))
+    dest_path = os.path.join(dest_dir, f"{last['stem']}-{last['stamp']}-{first['first']}-{last['last']}.changes.jsonl.gz")
+    with open(dest_path, 'wb') as dest:
+        for path in paths:
+            with open(path, 'rb') as src:
+                shutil.copyfileobj(src, dest, CHUNK_SIZE)
+    return dest_path
+
+def _replay(conn, segment_paths, after, until=None):
+    """Applies the changes with seq in (after, until] in order. Returns (applied, last seq)."""
+    pks = {}
+    applied = 0
+    for path in segment_paths:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                change = json.loads(line)
+                if change['seq'] <= after:
+                    continue # overlapping segments, or already in the snapshot
+                if until is not None and change['seq'] > until:
+                    return applied, after
+                table = change['table']
+                if table in migrations.UNLOGGED_TABLES:
+                    continue # logged by segments from before migration 4
+                if table not in migrations.CHANGELOG_TABLES:
+                    raise ValueError(f"Unexpected table {table!r} in {path}")
+                if table not in pks:
+                    pks[table] = next(row[1] for row in conn.execute(f"PRAGMA table_info({table})") if row[5] == 1)
+                pk = pks[table]
+
+                if change['op'] == 'delete':
+                    conn.execute(f"DELETE FROM {table} WHERE {pk} = ?", (change['row_id'],))
+                else:
+                    columns = list(change['data'])
+                    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != pk)
+                    conn.execute(f"""
+                        INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})
+                        ON CONFLICT({pk}) DO {f'UPDATE SET {updates}' if updates else 'NOTHING'}
+                    """, [change['data'][c] for c in columns])
+                after = change['seq']
+                applied += 1
+    return applied, after
+
+def record_delivered(path, backup_dir=BACKUP_DIR):
+    """Remembers the full backup last sent to the owner."""
+    with open(os.path.join(backup_dir, DELIVERED_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'filename': os.path.basename(path), 'delivered_at': time.time()}, f)
+
+def last_delivered(backup_dir=BACKUP_DIR):
+    """Path of the full backup last sent to the owner, or None if there is none (still kept locally)."""
+    try:
+        with open(os.path.join(backup_dir, DELIVERED_FILE), 'r', encoding='utf-8') as f:
+            filename = json.load(f)['filename']
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+    path = os.path.join(backup_dir, filename)
+    return path if os.path.exists(path) else None
+
+def list_backups(backup_dir=BACKUP_DIR, label=None):
+    """Backup paths, newest first."""
+    try:
+        names = os.listdir(backup_dir)
+    except FileNotFoundError:
+        return []
+    backups = []
+    for name in names:
+        match = _NAME_RE.match(name)
+        if match and (label is None or match['label'] == label):
+            backups.append((match['stamp'], os.path.join(backup_dir, name)))
+    return [path for _, path in sorted(backups, reverse=True)]
+
+def backup_taken_at(path):
+    """Local datetime a backup was taken at, from its file name."""
+    return datetime.datetime.strptime(_NAME_RE.match(os.path.basename(path))['stamp'], "%Y%m%d-%H%M%S")
+
+def rotate_backups(backup_dir=BACKUP_DIR, keep=RETENTION):
+    """Deletes all but the newest `keep` backups of every label. Returns the removed paths."""
+    labels = {_NAME_RE.match(os.path.basename(p))['label'] for p in list_backups(backup_dir)}
+    removed = []
+    for label in labels:
+        for path in list_backups(backup_dir, label)[keep:]:
+            os.remove(path)
+            removed.append(path)
+
+    # Segments older than the oldest kept snapshot can never be replayed
+    kept = list_backups(backup_dir)
+    if kept:
+        oldest = _NAME_RE.match(os.path.basename(kept[-1]))['stamp']
+        for path in list_segments(backup_dir):
+            if _SEGMENT_RE.match(os.path.basename(path))['stamp'] < oldest:
+                os.remove(path)
+                removed.append(path)
+    return removed
+
+def _set_changelog_position(conn, seq):
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'changelog'").fetchone() is None:
+        return # backup from before the changelog
+    if conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'changelog'", (seq,)).rowcount == 0:
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('changelog', ?)", (seq,))
+
+def _superseded_segments(backup_dir, position):
+    """Segments with changes after `position` and the highest seq any segment used."""
+    newest = position
+    superseded = []
+    for path in list_segments(backup_dir):
+        last = int(_SEGMENT_RE.match(os.path.basename(path))['last'])
+        newest = max(newest, last)
+        if last > position:
+            superseded.append(path)
+    return superseded, newest
+
+def restore_backup(backup_path, db_path=None, segments=(), until=None, rebase=False, backup_dir=None):
+    """
+    Restores a .db.gz backup into db_path, replaying change segments (up to changelog seq `until`)
+    on top of it. The result is decompressed, replayed and checked first, then copied in with
+    the backup API so open connections see either the old or the new database.
+    rebase=True is for restoring the live database: segments in backup_dir (default: the backup's
+    directory) holding changes after the restored point belong to the discarded history, so they
+    are moved to a discarded-<timestamp> subdirectory and the changelog continues past their seqs.
+    Returns the number of replayed changes.
+    """
+    db_path = db_path or database.DB_NAME
+    backup_dir = backup_dir or os.path.dirname(backup_path)
+    tmp = f"{db_path}.restore"
+    applied = 0
+    superseded = []
+    try:
+        with gzip.open(backup_path, 'rb') as src, open(tmp, 'wb') as dest:
+            shutil.copyfileobj(src, dest, CHUNK_SIZE)
+
+        if segments or rebase:
+            conn = sqlite3.connect(tmp) # foreign keys stay off: cascades are in the log as their own deletes
+            try:
+                position = _changelog_position(conn)
+                if segments:
+                    applied, position = _replay(conn, segments, position, until)
+                    # Replaying fired the changelog triggers again; those changes are part of the restored state
+                    conn.execute("DELETE FROM changelog")
+                # New changes continue after the restored point (or after every seq already shipped),
+                # so no new segment reuses the seq of an old one
+                if rebase:
+                    superseded, position = _superseded_segments(backup_dir, position)
+                _set_changelog_position(conn, position)
+                conn.commit()
+            finally:
+                conn.close()
+
+        source = sqlite3.connect(tmp)
+        target = sqlite3.connect(db_path)
+        try:
+            result = source.execute("PRAGMA quick_check").fetchone()[0]
+            if result != "ok":
+                raise sqlite3.DatabaseError(f"Backup {backup_path} failed quick_check: {result}")
+            source.backup(target, pages=PAGES_PER_STEP)
+        finally:
+            target.close()
+            source.close()
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    if superseded:
+        discarded = os.path.join(backup_dir, f"discarded-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        os.makedirs(discarded, exist_ok=True)
+        for path in superseded:
+            os.replace(path, os.path.join(discarded, os.path.basename(path)))
+        logger.warning(f"Moved {len(superseded)} change segments of the discarded history to {discarded}")
+    logger.info(f"Database restored from {backup_path} ({applied} changes replayed)")
+    return applied
+
+def iter_upload_parts(path, part_size=UPLOAD_PART_SIZE):
+    """
+    Yields (filename, BytesIO) parts no larger than part_size.
+    A single part keeps the original name, otherwise parts are <name>.001, .002, ...
+    (join with `cat name.0* > name`).
+    """
+    name = os.path.basename(path)
+    total = os.path.getsize(path)
+    if total <= part_size:
+        with open(path, 'rb') as f:
+            yield name, BytesIO(f.read())
+        return
+    with open(path, 'rb') as f:
+        index = 1
+        while chunk := f.read(part_size):
+            yield f"{name}.{index:03d}", BytesIO(chunk)
+            index += 1
+
+async def backup_database(label="manual", db_path=None, backup_dir=BACKUP_DIR, keep=RETENTION):
+    """Creates a backup in a worker thread and applies retention."""
+    async with _lock:
+        info = await asyncio.to_thread(create_backup, db_path, backup_dir, label)
+        removed = await asyncio.to_thread(rotate_backups, backup_dir, keep)
+    if removed:
+        logger.info(f"Removed {len(removed)} old backups.")
+    return info
+
+async def backup_changes(db_path=None, backup_dir=BACKUP_DIR):
+    """Writes an incremental change segment in a worker thread. Returns None if nothing changed."""
+    async with _lock:
+        return await asyncio.to_thread(create_segment, db_path, backup_dir)
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import config
+import database
+from services.metrics import Gauge
+
+logger = logging.getLogger('discord')
+
+LEASE_NAME = "global_tasks"
+LEASE_TTL = float(os.getenv("LEADER_LEASE_SECONDS", "30")) # a dead leader is replaced within this time
+
+IS_LEADER = Gauge('bot_leader', 'Whether this process runs the global background tasks (1) or not (0).')
+
+def owns_guild(bot, guild_id):
+    """Whether the guild is on one of this process's shards (always true when not sharded)."""
+    shard_count = getattr(bot, 'shard_count', None)
+    if not shard_count:
+        return True
+    shard_ids = getattr(bot, 'shard_ids', None) or range(shard_count)
+    return (guild_id >> 22) % shard_count in shard_ids
+
+def shard_filter(bot):
+    """(shard_count, shard_ids) of this process for DB queries, or None if it runs every shard."""
+    shard_ids = getattr(bot, 'shard_ids', None)
+    if not shard_ids:
+        return None
+    return bot.shard_count, list(shard_ids)
+
+class LeaderElection:
+    """
+    Elects the one process of a shard cluster that runs the global background tasks
+    (trade and departed-user cleanup, event scraping/notifications, backups).
+    Leadership is a lease row in the shared database, renewed every ttl/3. When the leader
+    dies its lease expires and another process takes over. A leader stalled for longer than
+    the ttl may overlap with its successor for one iteration, so gated tasks must stay idempotent.
+    """
+    def __init__(self, name=LEASE_NAME, ttl=LEASE_TTL, holder=None):
+        self.name = name
+        self.ttl = ttl
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:cluster-{config.CLUSTER_ID}"
+        self._leader = False
+        self._valid_until = 0.0 # monotonic time our lease expires at, if not renewed
+        self._task = None
+
+    @property
+    def is_leader(self):
+        return self._leader and time.monotonic() < self._valid_until
+
+    def start(self):
+        """Starts renewing the lease (must be called from the event loop)."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stops renewing and hands the lease over right away instead of letting it expire."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._leader:
+            try:
+                await database.release_lease(self.name, self.holder)
+            except Exception as e:
+                logger.error(f"Failed to release leader lease: {e}")
+            self._set(False)
+
+    async def _run(self):
+        while True:
+            await self.renew()
+            await asyncio.sleep(self.ttl / 3)
+
+    async def renew(self):
+        started = time.monotonic()
+        try:
+            acquired = await database.acquire_lease(self.name, self.holder, self.ttl)
+        except Exception as e:
+            # Keep leading until our last lease runs out; nobody else can take it before that
+            logger.error(f"Leader lease renewal failed: {e}")
+            acquired = self._leader and started < self._valid_until
+        else:
+            if acquired:
+                self._valid_until = started + self.ttl
+        self._set(acquired)
+        return acquired
+
+    def _set(self, leader):
+        if leader != self._leader:
+            logger.info(f"{'Acquired' if leader else 'Lost'} leadership of {self.name} ({self.holder}).")
+        self._leader = leader
+        IS_LEADER.set(1 if leader else 0)
+
+leader = LeaderElection()
@@ -0,0 +1,266 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import deque
+from pathlib import Path
+from services.metrics import Counter, Gauge, Histogram
+from services.stats import RollingStats, StatsRegistry
+
+logger = logging.getLogger('discord')
+
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_MS", "100")) / 1000
+SLOW_LOG_SIZE = 50
+SNAPSHOT_FILE = "data/db_stats.json"
+_EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'REPLACE')
+EXPLAIN_INTERVAL = 600 # seconds between query plans of the same slow statement
+
+DB_QUERY_SECONDS = Histogram('bot_db_query_seconds', 'Statement execution + fetch time.', ['helper'])
+DB_SLOW_QUERIES = Counter('bot_db_slow_queries_total', 'Statements slower than SLOW_QUERY_MS.', ['helper'])
+DB_CONNECT_SECONDS = Histogram('bot_db_connect_seconds', 'Time to open a connection.')
+DB_COMMIT_SECONDS = Histogram('bot_db_commit_seconds', 'Commit time.')
+DB_CONNECTIONS_OPEN = Gauge('bot_db_connections_open', 'Currently open database connections.')
+
+def normalize_sql(sql):
+    return re.sub(r'\s+', ' ', sql).strip()
+
+class DBMetrics:
+    """
+    Process wide database timings:
+    statements (per helper + SQL), helpers (connection hold time per database.py function),
+    connect (connection acquisition), commit (commit/fsync) and a log of slow statements.
+    """
+    def __init__(self):
+        self.statements = StatsRegistry()
+        self.helpers = StatsRegistry()
+        self.connect = RollingStats()
+        self.commit = RollingStats()
+        self.slow_queries = deque(maxlen=SLOW_LOG_SIZE)
+        self.started_at = time.time()
+        self._explained_at = {} # normalized SQL -> time of its last query plan
+        self._explains = set()
+
+    def reset(self):
+        self.__init__()
+
+    def record_connect(self, seconds):
+        self.connect.add(seconds)
+        DB_CONNECT_SECONDS.observe(seconds)
+
+    def snapshot(self):
+        return {
+            'generated_at': time.time(),
+            'since': self.started_at,
+            'slow_query_threshold': SLOW_QUERY_SECONDS,
+            'connect': self.connect.snapshot(),
+            'commit': self.commit.snapshot(),
+            'helpers': self.helpers.snapshot(),
+            'statements': self.statements.snapshot(),
+            'slow_queries': list(self.slow_queries),
+        }
+
+    def explain_later(self, entry, db_path, sql, params):
+        """
+        Fills in entry['plan'] from a separate read-only connection, in the background, at most
+        once per EXPLAIN_INTERVAL per statement. Returns False if the statement was explained recently.
+        """
+        now = time.monotonic()
+        last = self._explained_at.get(entry['sql'])
+        if last is not None and now - last < EXPLAIN_INTERVAL:
+            return False
+        self._explained_at[entry['sql']] = now
+        task = asyncio.create_task(self._explain(entry, db_path, sql, params))
+        self._explains.add(task)
+        task.add_done_callback(self._explains.discard)
+        return True
+
+    async def _explain(self, entry, db_path, sql, params):
+        try:
+            entry['plan'] = await asyncio.to_thread(_explain_sync, db_path, sql, params)
+        except Exception as e:
+            logger.debug(f"EXPLAIN of slow query failed: {e}")
+        _log_slow(entry)
+
+    async def wait_explains(self):
+        """Waits for the query plans still being collected."""
+        if self._explains:
+            await asyncio.gather(*self._explains, return_exceptions=True)
+
+    def write_snapshot(self, path=SNAPSHOT_FILE):
+        """Writes the snapshot as JSON (atomically). Sync: run it in a thread."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+
+db_metrics = DBMetrics()
+
+def _explain_sync(db_path, sql, params):
+    # Own read-only connection: never runs inside (and lengthens) the caller's transaction
+    conn = sqlite3.connect(f"{Path(db_path).absolute().as_uri()}?mode=ro", uri=True, timeout=1)
+    try:
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or ())]
+    finally:
+        conn.close()
+
+def _log_slow(entry):
+    logger.warning(f"Slow query ({entry['seconds'] * 1000:.0f} ms) in {entry['helper']}: {entry['sql'][:200]} | plan: {entry['plan']}")
+
+class _Statement:
+    def __init__(self, conn, sql, params, many):
+        self.conn = conn
+        self.sql = sql
+        self.params = params
+        self.many = many
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self.rows = 0
+        self.error = False
+        self.finished = False
+
+    async def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        sql = normalize_sql(self.sql)
+        db_metrics.statements.add(f"{self.conn.helper} | {sql[:120]}", self.elapsed, rows=self.rows, error=self.error)
+        DB_QUERY_SECONDS.observe(self.elapsed, helper=self.conn.helper)
+
+        if self.elapsed < SLOW_QUERY_SECONDS:
+            return
+        DB_SLOW_QUERIES.inc(helper=self.conn.helper)
+        entry = {
+            'at': time.time(),
+            'helper': self.conn.helper,
+            'sql': sql,
+            'seconds': self.elapsed,
+            'rows': self.rows,
+            'plan': None,
+        }
+        db_metrics.slow_queries.append(entry)
+        explain = not self.many and not self.error and self.conn.path and sql.upper().startswith(_EXPLAINABLE)
+        if not (explain and db_metrics.explain_later(entry, self.conn.path, self.sql, self.params)):
+            _log_slow(entry)
+
+class InstrumentedCursor:
+    """Counts fetched rows and fetch time towards the statement that produced the cursor."""
+    def __init__(self, cursor, statement):
+        self._cursor = cursor
+        self.statement = statement
+
+    async def _timed(self, coro):
+        started = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.statement.elapsed += time.perf_counter() - started
+
+    async def fetchone(self):
+        row = await self._timed(self._cursor.fetchone())
+        if row is not None:
+            self.statement.rows += 1
+        return row
+
+    async def fetchall(self):
+        rows = await self._timed(self._cursor.fetchall())
+        self.statement.rows += len(rows)
+        return rows
+
+    async def fetchmany(self, size=None):
+        rows = await self._timed(self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany())
+        self.statement.rows += len(rows)
+        return rows
+
+    async def close(self):
+        await self._cursor.close()
+        await self.statement.finish()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class _ExecuteContext:
+    """Like aiosqlite's execute() result: can be awaited or used with `async with`."""
+    def __init__(self, conn, sql, params, many):
+        self.conn = conn
+        self.sql = sql
+        self.params = params
+        self.many = many
+        self.cursor = None
+
+    async def _execute(self):
+        await self.conn.finish_pending()
+        statement = _Statement(self.conn, self.sql, self.params, self.many)
+        try:
+            if self.many:
+                cursor = await self.conn.raw.executemany(self.sql, self.params)
+            elif self.params is None:
+                cursor = await self.conn.raw.execute(self.sql)
+            else:
+                cursor = await self.conn.raw.execute(self.sql, self.params)
+        except Exception:
+            statement.elapsed = time.perf_counter() - statement.started
+            statement.error = True
+            await statement.finish()
+            raise
+        statement.elapsed = time.perf_counter() - statement.started
+        if cursor.rowcount and cursor.rowcount > 0:
+            statement.rows = cursor.rowcount
+        self.cursor = InstrumentedCursor(cursor, statement)
+        self.conn.pending.append(statement)
+        return self.cursor
+
+    def __await__(self):
+        return self._execute().__await__()
+
+    async def __aenter__(self):
+        return await self._execute()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.cursor:
+            await self.cursor.close()
+
+class InstrumentedConnection:
+    """Wraps an aiosqlite connection and times execute/executemany/commit."""
+    def __init__(self, raw, helper, path=None):
+        self.raw = raw
+        self.helper = helper
+        self.path = path # database file, for query plans of slow statements
+        self.pending = []
+        self.opened = time.perf_counter()
+        DB_CONNECTIONS_OPEN.inc()
+
+    async def finish_pending(self):
+        pending, self.pending = self.pending, []
+        for statement in pending:
+            await statement.finish()
+
+    def execute(self, sql, parameters=None):
+        return _ExecuteContext(self, sql, parameters, many=False)
+
+    def executemany(self, sql, parameters):
+        return _ExecuteContext(self, sql, parameters, many=True)
+
+    async def commit(self):
+        await self.finish_pending()
+        started = time.perf_counter()
+        try:
+            await self.raw.commit()
+        finally:
+            elapsed = time.perf_counter() - started
+            db_metrics.commit.add(elapsed)
+            DB_COMMIT_SECONDS.observe(elapsed)
+
+    async def close(self):
+        try:
+            await self.finish_pending()
+        finally:
+            await self.raw.close()
+            DB_CONNECTIONS_OPEN.dec()
+            db_metrics.helpers.add(self.helper, time.perf_counter() - self.opened)
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
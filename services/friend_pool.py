@@ -0,0 +1,101 @@
+import os
+import random
+import time
+from services.metrics import Counter, Gauge
+
+# Other cluster processes can't invalidate our pool, so it is also reloaded after this many seconds
+POOL_TTL = float(os.getenv("FRIEND_POOL_TTL", "60"))
+
+POOL_SIZE = Gauge('bot_friend_pool_accounts', 'Accounts in the loaded friend pool.')
+POOL_LOADS = Counter('bot_friend_pool_loads_total', 'Friend pool reloads from the DB.')
+
+class FriendPool:
+    """
+    In-memory pool of accounts that want more friends.
+    Each (team, region) filter gets its own shuffled rotation with a cursor,
+    so consecutive samples walk through everyone before anyone repeats
+    and a sample costs O(k) instead of a table scan.
+    The pool is loaded from the DB on demand and dropped by invalidate()
+    whenever an account's opt-in, team or region changes in this process.
+    Changes made by other processes show up when it expires after `ttl` seconds;
+    a reload keeps the rotations going instead of starting new ones.
+    """
+    def __init__(self, ttl=POOL_TTL):
+        self.ttl = ttl
+        self._accounts = None # account id -> (user_id, team, region)
+        self._rotations = {} # (team, region) -> [shuffled ids, cursor]
+        self._generation = 0
+        self._loaded_at = 0.0
+
+    @property
+    def loaded(self):
+        return self._accounts is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def load(self, rows, generation):
+        """Loads rows (id, user_id, team, region). Ignored if the pool was invalidated since `generation`."""
+        if generation != self._generation:
+            return False
+        self._accounts = {r['id']: (r['user_id'], r['team'], r['region']) for r in rows}
+        self._loaded_at = time.monotonic()
+        # Accounts that had no turn yet keep their place, new ones join the rest of the round
+        for key, rotation in self._rotations.items():
+            ids, cursor = rotation
+            matching = self._matching(*key)
+            done = [i for i in ids[:cursor] if i in matching]
+            rest = [i for i in ids[cursor:] if i in matching]
+            new = list(matching.difference(ids))
+            random.shuffle(new)
+            rotation[0] = done + rest + new
+            rotation[1] = len(done)
+        POOL_LOADS.inc()
+        return True
+
+    def invalidate(self):
+        self._generation += 1
+        self._accounts = None
+        self._rotations = {}
+
+    def _matching(self, team, region):
+        return {
+            account_id for account_id, (_, t, r) in self._accounts.items()
+            if (team is None or t == team) and (region is None or r == region)
+        }
+
+    def _rotation(self, team, region):
+        key = (team, region)
+        rotation = self._rotations.get(key)
+        if rotation is None:
+            ids = list(self._matching(team, region))
+            random.shuffle(ids)
+            rotation = self._rotations[key] = [ids, 0]
+        return rotation
+
+    def sample(self, k, team=None, region=None, exclude_user_id=None):
+        """Returns up to k account ids, continuing the rotation of the given filter."""
+        if self._accounts is None:
+            return []
+        rotation = self._rotation(team, region)
+        ids = rotation[0]
+        picked = []
+        seen = 0
+        while len(picked) < k and seen < len(ids):
+            if rotation[1] >= len(ids):
+                # Everyone had a turn: reshuffle for the next round
+                random.shuffle(ids)
+                rotation[1] = 0
+            account_id = ids[rotation[1]]
+            rotation[1] += 1
+            seen += 1
+            if account_id in picked:
+                continue
+            if exclude_user_id is not None and self._accounts[account_id][0] == exclude_user_id:
+                continue
+            picked.append(account_id)
+        return picked
+
+friend_pool = FriendPool()
+POOL_SIZE.set_function(lambda: len(friend_pool._accounts) if friend_pool._accounts is not None else 0)
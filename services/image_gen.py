@@ -1,48 +1,77 @@
-import aiohttp
 import asyncio
-import os
 import math
 import logging
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
 # from data.pokemon import POKEMON_IMAGES, POKEMON_IDS # REMOVED: Using DB data
-import qrcode
-import json
+from services.metrics import RENDER_SECONDS
+from services.qr_cache import qr_cache
+from services.sprites import SPRITE_DIR, get_sprite_store, sprite_filename, resolve_sprite_url
 
 logger = logging.getLogger('discord')
 
-SPRITE_DIR = "data/sprites"
-MAX_ITEMS = 100
+ITEMS_PER_PAGE = 36 # 6x6 grid, one page is rendered/uploaded at a time
+
+# Card layout
+CELL_W, CELL_H = 120, 150
+MARGIN = 20
+HEADER_H = 60 # Increased height for QR code
+QR_SIZE = 50 # Smaller QR for header
+TITLE_H = 20
+FOOTER_H = 30
+TOP_SECTION_H = HEADER_H + 10 + TITLE_H + 10
+
+BG_COLOR = (54, 57, 63)
+CELL_COLOR = (47, 49, 54)
+FOOTER_TEXT = "senpai.cz/pogo"
+
+# name: (file, size)
+FONT_SPECS = {
+    'title': ("DejaVuSans-Bold.ttf", 16),
+    'user': ("DejaVuSans-Bold.ttf", 18),
+    'fc': ("DejaVuSans-Bold.ttf", 12),   # Font for FC next to QR
+    'text': ("DejaVuSans.ttf", 14),
+    'small': ("DejaVuSans.ttf", 10),
+    'badge': ("DejaVuSans-Bold.ttf", 10),
+    'footer': ("DejaVuSans.ttf", 12),
+}
+
+# key: (label, bg_color, text_color)
+BADGES = {
+    'giga': ("Giga", (0, 0, 0), (255, 255, 255)),
+    'dyna': ("Dyna", (255, 20, 147), (255, 255, 255)),
+    'shiny': ("Shiny", (255, 215, 0), (0, 0, 0)),
+    'mirror': ("Mirro", (192, 192, 192), (0, 0, 0)),
+    'purified': ("Purif", (255, 255, 255), (0, 0, 0)),
+    'background': ("Backg", (0, 100, 0), (255, 255, 255)),
+    'adventure': ("Adven", (173, 216, 230), (0, 0, 0)),
+}
+
+def load_fonts():
+    """Loads all card fonts from disk, falling back to the PIL default font."""
+    fonts = {}
+    for name, (filename, size) in FONT_SPECS.items():
+        try:
+            fonts[name] = ImageFont.truetype(filename, size)
+        except OSError:
+            fonts[name] = ImageFont.load_default()
+    return fonts
 
 class ImageGenerator:
     def __init__(self):
         self.sprite_dir = SPRITE_DIR
-        if not os.path.exists(self.sprite_dir):
-            os.makedirs(self.sprite_dir)
-
-    async def _download_image(self, session, url, filepath):
-        try:
-            # logger.info(f"Downloading image from {url} to {filepath}")
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    data = await resp.read()
-                    # Write in executor to avoid blocking disk IO on main thread
-                    await asyncio.to_thread(self._write_file, filepath, data)
-                    return True
-                else:
-                    logger.warning(f"Failed to download image from {url}: Status {resp.status}")
-        except Exception as e:
-            logger.error(f"Error downloading image {url}: {e}")
-        return False
+        self.sprites = get_sprite_store()
 
-    def _write_file(self, filepath, data):
-        with open(filepath, 'wb') as f:
-            f.write(data)
+        # Static assets are loaded/rendered once and reused for every card.
+        self.fonts = load_fonts()
+        self._badges = {key: self._render_badge(*spec) for key, spec in BADGES.items()}
+        self._cell_tile = self._render_cell_tile()
+        self._header_cache = {}
+        self._footer_cache = {}
 
     async def prepare_sprites(self, listings):
         """Downloads missing sprites asynchronously."""
-        tasks = []
-        needed = set()
+        targets = {}
 
         for item in listings:
             # Prefer explicit pokedex_num if available (aliases sometimes confusing)
@@ -59,77 +88,42 @@ class ImageGenerator:
             is_shiny = item['is_shiny']
             costume = item.get('costume')
 
-            # Construct filename: {id}_{form}_{costume}_{shiny}.png
-            # Sanitize form name
-            safe_form = pform.replace(" ", "_").lower()
-            safe_costume = costume.replace(" ", "_").lower() if costume else "none"
+            filename = sprite_filename(pid, pform, costume, is_shiny)
+            if filename in targets or self.sprites.has(filename):
+                continue
 
-            # Add v1 prefix to bust cache if old files were wrong
-            filename = f"v1_{pid}_{safe_form}_{safe_costume}_{'shiny' if is_shiny else 'normal'}.png"
-            filepath = os.path.join(self.sprite_dir, filename)
+            # Get URL from item (it comes from DB join)
+            url = resolve_sprite_url(item.get('image_url'), item.get('shiny_image_url'),
+                                     item.get('costumes_json'), costume, is_shiny)
+            if url:
+                targets[filename] = url
+            else:
+                logger.warning(f"No image_url for Pokemon ID {pid} ({pform})")
 
-            if (pid, pform, is_shiny, costume) in needed:
-                continue
-            needed.add((pid, pform, is_shiny, costume))
-
-            if not os.path.exists(filepath):
-                # Get URL from item (it comes from DB join)
-                url = None
-
-                # 1. Costume lookup
-                if costume and item.get('costumes_json'):
-                    try:
-                        costumes = json.loads(item['costumes_json'])
-                        for c in costumes:
-                            if c['name'] == costume:
-                                if is_shiny and c.get('shiny_image_url'):
-                                    url = c['shiny_image_url']
-                                elif c.get('image_url'):
-                                    url = c['image_url']
-                                break
-                    except json.JSONDecodeError:
-                        pass
-
-                # 2. Fallback to normal
-                if not url:
-                    if is_shiny and item.get('shiny_image_url'):
-                        url = item.get('shiny_image_url')
-
-                if not url:
-                    url = item.get('image_url')
-
-                if url:
-                    tasks.append((url, filepath))
-                else:
-                    logger.warning(f"No image_url for Pokemon ID {pid} ({pform})")
-
-        if tasks:
-            async with aiohttp.ClientSession() as session:
-                download_tasks = [self._download_image(session, url, path) for url, path in tasks]
-                await asyncio.gather(*download_tasks)
+        if targets:
+            await self.sprites.ensure(targets.items())
 
     def _get_sprite_sync(self, pokemon_id, pokemon_form, is_shiny, costume=None):
         """Sync function to load image from disk."""
-        safe_form = pokemon_form.replace(" ", "_").lower()
-        safe_costume = costume.replace(" ", "_").lower() if costume else "none"
-        # Ensure we use the v1 prefix
-        filename = f"v1_{pokemon_id}_{safe_form}_{safe_costume}_{'shiny' if is_shiny else 'normal'}.png"
-        filepath = os.path.join(self.sprite_dir, filename)
+        filename = sprite_filename(pokemon_id, pokemon_form, costume, is_shiny)
+        if not self.sprites.has(filename):
+            return None
 
-        if os.path.exists(filepath):
-            try:
-                img = Image.open(filepath).convert("RGBA")
-                return img
-            except Exception as e:
-                logger.error(f"Error opening image {filepath}: {e}")
+        filepath = self.sprites.path_for(filename)
+        try:
+            img = Image.open(filepath).convert("RGBA")
+            return img
+        except Exception as e:
+            logger.error(f"Error opening image {filepath}: {e}")
         return None
 
-    def _draw_badge(self, draw, text, center_xy, bg_color, text_color, font):
-        """Draws a small pill/badge with text."""
-        x, y = center_xy
+    def _render_badge(self, text, bg_color, text_color):
+        """Pre-renders a small pill/badge with text."""
+        font = self.fonts['badge']
+        measure = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
 
         # Calculate text size
-        bbox = draw.textbbox((0,0), text, font=font)
+        bbox = measure.textbbox((0,0), text, font=font)
         tw = bbox[2] - bbox[0]
         th = bbox[3] - bbox[1]
 
@@ -139,19 +133,48 @@ class ImageGenerator:
         w = tw + pad_x * 2
         h = th + pad_y * 2
 
-        x0, y0 = x - w/2, y - h/2
-        x1, y1 = x + w/2, y + h/2
-
-        draw.rectangle([x0, y0, x1, y1], fill=bg_color)
-
-        # Center text
-        tx = x - tw/2
-        ty = y - th/2 - 1 # visual adjustment
-        draw.text((tx, ty), text, font=font, fill=text_color)
+        badge = Image.new('RGBA', (w + 1, h + 1), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(badge)
+        draw.rectangle([0, 0, w, h], fill=bg_color)
+        draw.text((pad_x, pad_y - 1), text, font=font, fill=text_color) # visual adjustment
+        return badge
+
+    def _render_cell_tile(self):
+        tile = Image.new('RGBA', (CELL_W, CELL_H), BG_COLOR)
+        draw = ImageDraw.Draw(tile)
+        draw.rectangle([(2, 2), (CELL_W - 2, CELL_H - 2)], fill=CELL_COLOR, outline=None)
+        return tile
+
+    def _get_header(self, width, team_color_rgb):
+        """Team colored strip, cached per card width and team color."""
+        key = (width, tuple(team_color_rgb))
+        header = self._header_cache.get(key)
+        if header is None:
+            header = Image.new('RGBA', (width, HEADER_H + 1), tuple(team_color_rgb))
+            self._header_cache[key] = header
+        return header
+
+    def _get_footer(self, width):
+        footer = self._footer_cache.get(width)
+        if footer is None:
+            footer = Image.new('RGBA', (width, FOOTER_H), BG_COLOR)
+            draw = ImageDraw.Draw(footer)
+            draw.text((width // 2, FOOTER_H / 2), FOOTER_TEXT, font=self.fonts['footer'], fill=(180, 180, 180), anchor="mm")
+            self._footer_cache[width] = footer
+        return footer
+
+    def _paste_badge(self, img, key, center_xy):
+        """Composites a pre-rendered badge centered on the given point."""
+        badge = self._badges[key]
+        x, y = center_xy
+        img.alpha_composite(badge, (int(x - (badge.width - 1) / 2), int(y - (badge.height - 1) / 2)))
 
-    def _generate_card_sync(self, listings, title, user_name, team_color_rgb, friend_code):
-        """Sync implementation of image generation."""
-        num_items = len(listings)
+    def _generate_card_sync(self, listings, title, user_name, team_color_rgb, friend_code, layout_items=None):
+        """
+        Sync implementation of image generation.
+        layout_items lets all pages of a multi-page card share the same column count.
+        """
+        num_items = layout_items or len(listings)
         if num_items <= 9:
             cols = 3
         elif num_items <= 16:
@@ -161,51 +184,24 @@ class ImageGenerator:
         else:
             cols = 6
 
-        rows = math.ceil(num_items / cols)
-
-        # Dimensions
-        CELL_W, CELL_H = 120, 150
-        MARGIN = 20
-        HEADER_H = 60 # Increased height for QR code
-
-        # QR in Header
-        QR_SIZE = 50 # Smaller QR for header
-
-        TITLE_H = 20
-        FOOTER_H = 30
-
-        # Title Section Height (Title + Padding)
-        TOP_SECTION_H = HEADER_H + 10 + TITLE_H + 10
+        rows = math.ceil(len(listings) / cols)
 
         IMG_W = cols * CELL_W + 2 * MARGIN
         IMG_H = TOP_SECTION_H + rows * CELL_H + MARGIN + FOOTER_H
 
-        bg_color = (54, 57, 63)
-        img = Image.new('RGBA', (IMG_W, IMG_H), bg_color)
+        img = Image.new('RGBA', (IMG_W, IMG_H), BG_COLOR)
         draw = ImageDraw.Draw(img)
 
         # --- Fonts ---
-        try:
-            # Reduced font sizes as requested
-            font_title = ImageFont.truetype("DejaVuSans-Bold.ttf", 16) # Slightly larger title
-            font_user = ImageFont.truetype("DejaVuSans-Bold.ttf", 18) # Larger user name
-            font_fc = ImageFont.truetype("DejaVuSans-Bold.ttf", 12)   # Font for FC next to QR
-            font_text = ImageFont.truetype("DejaVuSans.ttf", 14)
-            font_small = ImageFont.truetype("DejaVuSans.ttf", 10)
-            font_badge = ImageFont.truetype("DejaVuSans-Bold.ttf", 10)
-            font_footer = ImageFont.truetype("DejaVuSans.ttf", 12)
-        except OSError:
-            font_title = ImageFont.load_default()
-            font_user = ImageFont.load_default()
-            font_fc = ImageFont.load_default()
-            font_text = ImageFont.load_default()
-            font_small = ImageFont.load_default()
-            font_badge = ImageFont.load_default()
-            font_footer = ImageFont.load_default()
+        font_title = self.fonts['title']
+        font_user = self.fonts['user']
+        font_fc = self.fonts['fc']
+        font_text = self.fonts['text']
+        font_small = self.fonts['small']
 
         # --- Header ---
         # Team Colored Strip
-        draw.rectangle([(0, 0), (IMG_W, HEADER_H)], fill=team_color_rgb)
+        img.paste(self._get_header(IMG_W, team_color_rgb), (0, 0))
 
         # User Name inside Header (Left Aligned)
         draw.text((MARGIN, HEADER_H / 2), user_name, font=font_user, fill=(255, 255, 255), anchor="lm")
@@ -213,8 +209,7 @@ class ImageGenerator:
         # --- QR Code & FC in Header ---
         if friend_code:
             try:
-                qr = qrcode.make(friend_code)
-                qr = qr.resize((QR_SIZE, QR_SIZE), Image.Resampling.LANCZOS)
+                qr = qr_cache.get_image(friend_code, QR_SIZE)
 
                 # Position: Right side with margin
                 qr_x = IMG_W - MARGIN - QR_SIZE
@@ -248,7 +243,7 @@ class ImageGenerator:
             x = MARGIN + col * CELL_W
             y = grid_start_y + row * CELL_H
 
-            draw.rectangle([(x + 2, y + 2), (x + CELL_W - 2, y + CELL_H - 2)], fill=(47, 49, 54), outline=None)
+            img.paste(self._cell_tile, (x, y))
 
             # Prefer explicit pokedex_num if available
             pokemon_id = item.get('pokedex_num') or item.get('pokemon_id')
@@ -303,62 +298,77 @@ class ImageGenerator:
 
             # Giga: Top Left
             if is_gigantamax:
-                self._draw_badge(draw, "Giga", (x + 25, y + 15), (0, 0, 0), (255, 255, 255), font_badge)
+                self._paste_badge(img, 'giga', (x + 25, y + 15))
 
             # Dyna: Top Center
             if is_dynamax and not is_gigantamax:
-                self._draw_badge(draw, "Dyna", (x + CELL_W/2, y + 15), (255, 20, 147), (255, 255, 255), font_badge)
+                self._paste_badge(img, 'dyna', (x + CELL_W/2, y + 15))
 
             # Shiny: Top Right
             if is_shiny:
-                self._draw_badge(draw, "Shiny", (x + CELL_W - 25, y + 15), (255, 215, 0), (0, 0, 0), font_badge)
+                self._paste_badge(img, 'shiny', (x + CELL_W - 25, y + 15))
 
             # Mirror: Middle Right
             if is_mirror:
-                self._draw_badge(draw, "Mirro", (x + CELL_W - 25, y + 55), (192, 192, 192), (0, 0, 0), font_badge)
+                self._paste_badge(img, 'mirror', (x + CELL_W - 25, y + 55))
 
             # Purified: Bottom Left
             if is_purified:
-                self._draw_badge(draw, "Purif", (x + 25, y + 95), (255, 255, 255), (0, 0, 0), font_badge)
+                self._paste_badge(img, 'purified', (x + 25, y + 95))
 
             # Background: Bottom Center
             if is_background:
-                self._draw_badge(draw, "Backg", (x + CELL_W/2, y + 95), (0, 100, 0), (255, 255, 255), font_badge)
+                self._paste_badge(img, 'background', (x + CELL_W/2, y + 95))
 
             # Adventure Effect: Bottom Right
             if is_adventure_effect:
-                self._draw_badge(draw, "Adven", (x + CELL_W - 25, y + 95), (173, 216, 230), (0, 0, 0), font_badge)
+                self._paste_badge(img, 'adventure', (x + CELL_W - 25, y + 95))
 
         # --- Footer ---
-        footer_text = "senpai.cz/pogo"
-        footer_y = IMG_H - FOOTER_H / 2
-        draw.text((IMG_W // 2, footer_y), footer_text, font=font_footer, fill=(180, 180, 180), anchor="mm")
+        img.paste(self._get_footer(IMG_W), (0, IMG_H - FOOTER_H))
 
         out = BytesIO()
         img.save(out, format='PNG', optimize=True)
         out.seek(0)
         return out
 
-    async def generate_card(self, listings, title, user_name, team_color_rgb, friend_code=None):
+    async def generate_card(self, listings, title, user_name, team_color_rgb, friend_code=None, layout_items=None):
         """
-        Generates a trade card image (Async Wrapper).
+        Generates a single trade card image (Async Wrapper).
+        For long lists use generate_card_pages.
         """
         if not listings:
             return None
 
-        # Limit items
-        if len(listings) > MAX_ITEMS:
-            listings = listings[:MAX_ITEMS]
-
         # 1. Download missing sprites (Network IO)
-        await self.prepare_sprites(listings)
+        with RENDER_SECONDS.time(stage='sprites'):
+            await self.prepare_sprites(listings)
 
         # 2. Generate image (CPU/Disk IO) - Run in executor
         loop = asyncio.get_running_loop()
-        image_buffer = await loop.run_in_executor(
-            None,
-            self._generate_card_sync,
-            listings, title, user_name, team_color_rgb, friend_code
-        )
+        with RENDER_SECONDS.time(stage='render'):
+            image_buffer = await loop.run_in_executor(
+                None,
+                self._generate_card_sync,
+                listings, title, user_name, team_color_rgb, friend_code, layout_items
+            )
 
         return image_buffer
+
+    async def generate_card_pages(self, listings, title, user_name, team_color_rgb, friend_code=None, page_size=ITEMS_PER_PAGE):
+        """
+        Renders the listings as a sequence of fixed-size pages.
+        Async generator yielding (page_number, total_pages, image_buffer); each page is
+        rendered only when the previous one has been consumed, so peak memory is one page.
+        """
+        if not listings:
+            return
+
+        total_pages = math.ceil(len(listings) / page_size)
+        layout_items = min(len(listings), page_size)
+
+        for page in range(total_pages):
+            chunk = listings[page * page_size:(page + 1) * page_size]
+            page_title = title if total_pages == 1 else f"{title} ({page + 1}/{total_pages})"
+            buffer = await self.generate_card(chunk, page_title, user_name, team_color_rgb, friend_code, layout_items)
+            yield page + 1, total_pages, buffer
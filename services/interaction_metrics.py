@@ -0,0 +1,157 @@
+import functools
+import logging
+import time
+import discord
+from discord import app_commands
+from services.metrics import Counter, Histogram
+from services.stats import StatsRegistry
+
+logger = logging.getLogger('discord')
+
+INTERACTION_DEADLINE = 3.0 # seconds Discord gives us to acknowledge an interaction
+_TIMING_KEY = 'metrics_timing'
+
+INTERACTION_SECONDS = Histogram('bot_interaction_handler_seconds', 'App command / view callback duration.', ['name'])
+INTERACTION_FIRST_RESPONSE = Histogram('bot_interaction_first_response_seconds', 'Time to the first interaction response.', ['name'],
+                                       buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 5.0, 10.0))
+INTERACTION_OUTCOMES = Counter('bot_interactions_total', 'Handled interactions by outcome.', ['name', 'outcome'])
+
+class _Timing:
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.deferred = None # seconds from dispatch to defer()
+        self.responded = None # seconds from dispatch to the first response of any kind
+        self.error = False
+
+class InteractionMetrics:
+    """
+    Latency of app commands and view callbacks, keyed by "/command" or view class name:
+    handler (total callback time), defer (time to defer) and first_response (time to the
+    first acknowledgement), plus how often the 3s deadline was missed or never answered.
+    """
+    def __init__(self):
+        self.handler = StatsRegistry()
+        self.defer = StatsRegistry()
+        self.first_response = StatsRegistry()
+        self.late = {}
+        self.unanswered = {}
+
+    def reset(self):
+        self.__init__()
+
+    def begin(self, interaction, name):
+        timing = _Timing(name)
+        interaction.extras[_TIMING_KEY] = timing
+        return timing
+
+    def responded(self, interaction, kind):
+        timing = interaction.extras.get(_TIMING_KEY)
+        if timing is None:
+            return
+        elapsed = time.perf_counter() - timing.started
+        if kind == 'defer' and timing.deferred is None:
+            timing.deferred = elapsed
+        if timing.responded is None:
+            timing.responded = elapsed
+
+    def mark_error(self, interaction):
+        timing = interaction.extras.get(_TIMING_KEY)
+        if timing is not None:
+            timing.error = True
+
+    def finish(self, timing):
+        name = timing.name
+        elapsed = time.perf_counter() - timing.started
+        self.handler.add(name, elapsed, error=timing.error)
+        INTERACTION_SECONDS.observe(elapsed, name=name)
+        if timing.error:
+            INTERACTION_OUTCOMES.inc(name=name, outcome='error')
+        if timing.deferred is not None:
+            self.defer.add(name, timing.deferred)
+        if timing.responded is None:
+            self.unanswered[name] = self.unanswered.get(name, 0) + 1
+            INTERACTION_OUTCOMES.inc(name=name, outcome='unanswered')
+            return
+        self.first_response.add(name, timing.responded)
+        INTERACTION_FIRST_RESPONSE.observe(timing.responded, name=name)
+        if timing.responded >= INTERACTION_DEADLINE:
+            self.late[name] = self.late.get(name, 0) + 1
+            INTERACTION_OUTCOMES.inc(name=name, outcome='late')
+            logger.warning(f"Interaction {name} acknowledged after {timing.responded:.2f}s (deadline {INTERACTION_DEADLINE:.0f}s)")
+
+    def snapshot(self):
+        """Per name: handler stats plus defer/first response percentiles and deadline counters."""
+        data = {}
+        for name, stats in self.handler.items():
+            entry = stats.snapshot()
+            entry['defer'] = self.defer.get(name).percentiles()
+            entry['first_response'] = self.first_response.get(name).percentiles()
+            entry['late'] = self.late.get(name, 0)
+            entry['unanswered'] = self.unanswered.get(name, 0)
+            data[name] = entry
+        return data
+
+interaction_metrics = InteractionMetrics()
+
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """CommandTree that times every app command invocation (autocomplete excluded)."""
+    async def _call(self, interaction):
+        if interaction.type is discord.InteractionType.autocomplete:
+            return await super()._call(interaction)
+
+        timing = interaction_metrics.begin(interaction, f"/{interaction.data.get('name', '?')}")
+        try:
+            await super()._call(interaction)
+        except Exception:
+            timing.error = True
+            raise
+        finally:
+            command = interaction.command
+            if command is not None:
+                timing.name = f"/{command.qualified_name}"
+            if interaction.command_failed:
+                timing.error = True
+            interaction_metrics.finish(timing)
+
+def _timed_response(method, kind):
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        result = await method(self, *args, **kwargs)
+        interaction_metrics.responded(self._parent, kind)
+        return result
+    return wrapper
+
+def _timed_view_task(method):
+    @functools.wraps(method)
+    async def wrapper(self, item, interaction):
+        timing = interaction_metrics.begin(interaction, type(self).__name__)
+        try:
+            return await method(self, item, interaction)
+        finally:
+            interaction_metrics.finish(timing)
+    return wrapper
+
+def _timed_view_error(method):
+    @functools.wraps(method)
+    async def wrapper(self, interaction, error, item):
+        interaction_metrics.mark_error(interaction)
+        return await method(self, interaction, error, item)
+    return wrapper
+
+_installed = False
+
+def install():
+    """Hooks view dispatch and InteractionResponse so views and responses are timed. Idempotent."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    response = discord.InteractionResponse
+    response.defer = _timed_response(response.defer, 'defer')
+    for name in ('send_message', 'edit_message', 'send_modal'):
+        setattr(response, name, _timed_response(getattr(response, name), name))
+
+    discord.ui.View._scheduled_task = _timed_view_task(discord.ui.View._scheduled_task)
+    discord.ui.View.on_error = _timed_view_error(discord.ui.View.on_error)
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from services.metrics import Counter, LOOP_LAG, LOOP_LAG_LAST
+
+logger = logging.getLogger('discord')
+
+HEARTBEAT_INTERVAL = 0.1 # seconds between event loop heartbeats
+BLOCK_THRESHOLD = float(os.getenv("LOOP_BLOCK_MS", "250")) / 1000 # heartbeat delay that counts as blocked
+STACK_DEPTH = 12 # frames kept per blocker sample
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOOP_BLOCKS = Counter('bot_event_loop_blocks_total', 'Event loop stalls longer than the watchdog threshold.')
+
+def _is_project_frame(filename):
+    filename = os.path.abspath(filename)
+    return filename.startswith(PROJECT_ROOT) and 'site-packages' not in filename
+
+def blocker_key(stack):
+    """Innermost frame of our own code (fallback: innermost frame) identifying a blocker."""
+    for frame in reversed(stack):
+        if _is_project_frame(frame.filename):
+            break
+    else:
+        frame = stack[-1]
+    return f"{os.path.relpath(frame.filename, PROJECT_ROOT)}:{frame.lineno} {frame.name}"
+
+class Blocker:
+    def __init__(self, key, stack):
+        self.key = key
+        self.stack = stack # formatted frames of the latest sample
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last_seen = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last_seen = time.time()
+
+class LoopWatchdog:
+    """
+    Detects callbacks that block the event loop.
+    A coroutine on the loop beats every HEARTBEAT_INTERVAL (also feeding the loop lag metrics);
+    a daemon thread notices when the beat is late by more than `threshold`, grabs the loop
+    thread's current stack with sys._current_frames() and attributes the stall to it.
+    """
+    def __init__(self, threshold=BLOCK_THRESHOLD, interval=HEARTBEAT_INTERVAL):
+        self.threshold = threshold
+        self.interval = interval
+        self.blockers = {}
+        self.blocks = 0
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._loop_thread_id = None
+        self._heartbeat_task = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        """Starts the heartbeat (must be called from the event loop) and the watchdog thread."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopping.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+    async def _heartbeat(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - started - self.interval)
+            LOOP_LAG.observe(lag)
+            LOOP_LAG_LAST.set(lag)
+            self._last_beat = now
+
+    def _capture(self):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        return traceback.extract_stack(frame)[-STACK_DEPTH:]
+
+    def _watch(self):
+        episode = None # (beat the stall started after, stack)
+        while not self._stopping.wait(self.interval / 2):
+            last_beat = self._last_beat
+            if episode is not None and last_beat != episode[0]:
+                # Loop is running again: the stall lasted from the missed beat until now
+                self._record(episode[1], last_beat - episode[0] - self.interval)
+                episode = None
+
+            if episode is None and time.monotonic() - last_beat > self.interval + self.threshold:
+                stack = self._capture()
+                if stack:
+                    episode = (last_beat, stack)
+
+    def _record(self, stack, seconds):
+        if seconds < self.threshold:
+            return
+        key = blocker_key(stack)
+        with self._lock:
+            blocker = self.blockers.get(key)
+            if blocker is None:
+                blocker = self.blockers[key] = Blocker(key, [])
+            blocker.stack = traceback.format_list(stack)
+            blocker.add(seconds)
+            self.blocks += 1
+        LOOP_BLOCKS.inc()
+        logger.warning(f"Event loop blocked for {seconds * 1000:.0f} ms in {key}")
+
+    def top(self, n=5):
+        """Blockers with the most total blocked time."""
+        with self._lock:
+            return sorted(self.blockers.values(), key=lambda b: b.total, reverse=True)[:n]
+
+    def reset(self):
+        with self._lock:
+            self.blockers = {}
+            self.blocks = 0
+
+loop_watchdog = LoopWatchdog()
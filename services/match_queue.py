@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import time
+from collections import deque
+import database
+from services.metrics import REGISTRY, Counter, Gauge, Histogram
+from services.stats import percentile
+from services.cluster import shard_filter
+
+logger = logging.getLogger('discord')
+
+MATCH_WORKERS = 4
+POLL_INTERVAL = 5 # seconds, picks up retries and jobs enqueued by other code paths
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 10 # seconds, doubled on every attempt
+RETRY_MAX_DELAY = 600
+WAIT_SAMPLES = 500
+
+MATCH_JOBS = Counter('bot_match_jobs_total', 'Finished match job attempts.', ['result'])
+MATCH_WAIT_SECONDS = Histogram('bot_match_job_wait_seconds', 'Time from enqueue (or retry) to claim.')
+MATCH_QUEUE_DEPTH = Gauge('bot_match_queue_jobs', 'Jobs in the match queue by state.', ['state'])
+
+def retry_delay(attempts):
+    return min(RETRY_BASE_DELAY * (2 ** attempts), RETRY_MAX_DELAY)
+
+class MatchQueue:
+    """
+    Durable match work queue.
+    Jobs live in the match_queue table, so nothing is lost on restart.
+    A pool of workers claims due jobs and runs `handler(job)` on them;
+    a failing job is retried with exponential backoff and dropped after MAX_ATTEMPTS.
+    """
+    def __init__(self, bot, handler, workers=MATCH_WORKERS):
+        self.bot = bot
+        self.handler = handler
+        self.worker_count = workers
+        self._workers = []
+        self._wakeup = asyncio.Event()
+
+        # In-memory metrics since start
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.waits = deque(maxlen=WAIT_SAMPLES) # enqueue -> claim, seconds
+        self.runtimes = deque(maxlen=WAIT_SAMPLES) # handler duration, seconds
+
+    async def start(self):
+        # Each shard process works (and recovers) only the jobs of its own guilds
+        released = await database.release_match_jobs(shard_filter(self.bot))
+        if released:
+            logger.info(f"Match queue: released {released} jobs claimed before restart.")
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.worker_count)]
+        REGISTRY.add_collector(self.collect_metrics)
+
+    async def stop(self):
+        REGISTRY.remove_collector(self.collect_metrics)
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def enqueue(self, listing_id, guild_id):
+        await self.enqueue_many([(listing_id, guild_id)])
+
+    async def enqueue_many(self, jobs):
+        """Queues (listing_id, guild_id) pairs and wakes the workers."""
+        jobs = list(jobs)
+        if not jobs:
+            return
+        await database.enqueue_matches(jobs, time.time())
+        self._wakeup.set()
+
+    async def _next_job(self):
+        while True:
+            jobs = await database.claim_match_jobs(time.time(), limit=1, shards=shard_filter(self.bot))
+            if jobs:
+                return jobs[0]
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _worker(self, number):
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                job = await self._next_job()
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Match worker {number} error: {e}")
+                await asyncio.sleep(POLL_INTERVAL)
+
+    async def _run(self, job):
+        started = time.time()
+        wait = max(0.0, started - job['enqueued_at'])
+        self.waits.append(wait)
+        MATCH_WAIT_SECONDS.observe(wait)
+        try:
+            await self.handler(job)
+        except asyncio.CancelledError:
+            # Shutting down: leave the job for release_match_jobs on next start
+            raise
+        except Exception as e:
+            self.failed += 1
+            attempts = job['attempts'] + 1
+            if attempts >= MAX_ATTEMPTS:
+                self.dropped += 1
+                MATCH_JOBS.inc(result='dropped')
+                logger.error(f"Match job for listing {job['listing_id']} failed {attempts}x, dropping: {e}")
+                # The trade may have been created by this very run, so take it from the row, not the claimed job
+                trade_id = await database.complete_match_job(job['listing_id'])
+                if trade_id and await database.cancel_trade(trade_id):
+                    logger.warning(f"Cancelled trade {trade_id} of dropped match job, listings reactivated.")
+            else:
+                MATCH_JOBS.inc(result='retry')
+                delay = retry_delay(job['attempts'])
+                logger.warning(f"Match job for listing {job['listing_id']} failed (attempt {attempts}), retrying in {delay}s: {e}")
+                await database.retry_match_job(job['listing_id'], time.time() + delay, str(e)[:500])
+            return
+        finally:
+            self.runtimes.append(time.time() - started)
+
+        self.processed += 1
+        MATCH_JOBS.inc(result='ok')
+        await database.complete_match_job(job['listing_id'])
+
+    async def collect_metrics(self):
+        row = await database.get_match_queue_stats(time.time())
+        for state in ('queued', 'due', 'claimed', 'retrying'):
+            MATCH_QUEUE_DEPTH.set(row[state] or 0, state=state)
+
+    async def stats(self):
+        """Queue length from the DB plus wait/run time percentiles of recent jobs."""
+        now = time.time()
+        row = await database.get_match_queue_stats(now)
+        oldest = row['oldest_enqueued_at']
+        return {
+            'queued': row['queued'],
+            'due': row['due'],
+            'in_progress': row['claimed'],
+            'retrying': row['retrying'],
+            'oldest_age': now - oldest if oldest else 0.0,
+            'processed': self.processed,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'wait_p50': percentile(self.waits, 50),
+            'wait_p95': percentile(self.waits, 95),
+            'wait_max': max(self.waits, default=0.0),
+            'run_p50': percentile(self.runtimes, 50),
+            'run_p95': percentile(self.runtimes, 95),
+            'workers': sum(1 for t in self._workers if not t.done()),
+        }
@@ -37,29 +37,22 @@ async def find_match(new_listing_id):
             exclude_user_id=new_listing['user_id']
         )
 
-        match = None
         for candidate in candidates:
             # Check history to avoid re-matching failed pairs
             history = await database.check_trade_history(new_listing['id'], candidate['id'])
-            if not history:
-                match = candidate
-                break
+            if history:
+                continue
 
-        if match:
-            # We found a match!
-            logger.info(f"Match found for listing {new_listing_id} -> {match['id']}")
-
-            # Set both to PENDING
-            await database.update_listing_status(new_listing['id'], 'PENDING')
-            await database.update_listing_status(match['id'], 'PENDING')
-
-            # Create trade record
-            trade_id = await database.create_trade(new_listing['id'], match['id'], channel_id=None)
-
-            return trade_id, match
+            # Lock both listings + create the trade atomically; a candidate taken meanwhile
+            # (by a worker of another shard process) just moves us on to the next one
+            trade_id = await database.lock_trade(new_listing['id'], candidate['id'])
+            if trade_id:
+                logger.info(f"Match found for listing {new_listing_id} -> {candidate['id']}")
+                return trade_id, candidate
 
     except Exception as e:
         logger.error(f"Error in find_match: {e}")
-        return None, None
+        # Let the match queue retry the job
+        raise
 
     return None, None
@@ -0,0 +1,79 @@
+import discord
+import datetime
+import logging
+import contextlib
+
+logger = logging.getLogger('discord')
+
+BULK_DELETE_LIMIT = 100
+# Discord refuses bulk deletes of messages older than 14 days. Keep a small safety margin.
+BULK_DELETE_MAX_AGE = datetime.timedelta(days=14) - datetime.timedelta(minutes=5)
+
+def split_by_bulk_age(message_ids):
+    """Splits message ids into (bulk_deletable, too_old) using the snowflake timestamp."""
+    limit = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+    young, old = [], []
+    for message_id in message_ids:
+        if discord.utils.snowflake_time(message_id) > limit:
+            young.append(message_id)
+        else:
+            old.append(message_id)
+    return young, old
+
+def is_permanent_failure(error):
+    """4xx other than rate limits (missing access, ...): retrying won't help."""
+    return isinstance(error, discord.HTTPException) and 400 <= error.status < 500 and error.status != 429
+
+async def _delete_one(channel, message_id, budget):
+    """Returns None if the message is gone, else the error."""
+    try:
+        async with budget:
+            await channel.get_partial_message(message_id).delete()
+        return None
+    except discord.NotFound:
+        # Already gone, nothing to do
+        return None
+    except discord.HTTPException as e:
+        logger.warning(f"Could not delete message {message_id} in channel {channel.id}: {e}")
+        return e
+
+async def purge_messages(channel, message_ids, reason=None, budget=None):
+    """
+    Deletes exactly the given message ids from a channel.
+    Messages younger than 14 days are bulk deleted in batches of 100,
+    older ones fall back to individual deletes.
+    budget is an optional semaphore shared by callers to cap concurrent API calls.
+    Returns (done, failed): ids that are gone (deleted or already missing) and ids that failed
+    permanently. The remaining ids failed transiently (rate limit, server error) and can be retried.
+    """
+    budget = budget or contextlib.nullcontext()
+    young, old = split_by_bulk_age(message_ids)
+    done = []
+    failed = []
+
+    for i in range(0, len(young), BULK_DELETE_LIMIT):
+        batch = young[i:i + BULK_DELETE_LIMIT]
+        try:
+            async with budget:
+                await channel.delete_messages([discord.Object(id=m) for m in batch], reason=reason)
+            done.extend(batch)
+        except discord.NotFound:
+            # Single-message path (or whole batch unknown)
+            done.extend(batch)
+        except discord.HTTPException as e:
+            logger.warning(f"Bulk delete failed in channel {channel.id}, deleting one by one: {e}")
+            old.extend(batch)
+
+    for message_id in old:
+        error = await _delete_one(channel, message_id, budget)
+        if error is None:
+            done.append(message_id)
+        elif is_permanent_failure(error):
+            failed.append(message_id)
+
+    return done, failed
+
+async def delete_messages_by_id(channel, message_ids, reason=None, budget=None):
+    """Like purge_messages, but only returns the list of ids that are gone."""
+    done, _ = await purge_messages(channel, message_ids, reason=reason, budget=budget)
+    return done
@@ -0,0 +1,252 @@
+import asyncio
+import functools
+import logging
+import math
+import threading
+import time
+from aiohttp import web
+
+logger = logging.getLogger('discord')
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if value != value:
+        return "NaN"
+    return repr(float(value))
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock() # cache/render code updates metrics from executor threads
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def get(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        """Yields (suffix, label values, extra label, value)."""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", key, None, value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, key, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}")
+        return "\n".join(lines)
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        super().__init__(name, documentation, labelnames, registry)
+        self._function = None
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function):
+        """Computes the value at scrape time instead (only for gauges without labels)."""
+        self._function = function
+
+    def samples(self):
+        if self._function is None:
+            yield from super().samples()
+            return
+        try:
+            yield "", (), None, self._function()
+        except Exception as e:
+            logger.error(f"Metric {self.name} callback failed: {e}")
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def get(self, **labels):
+        """Returns (count, sum) of a label set."""
+        state = self._values.get(self._key(labels))
+        return (state[2], state[1]) if state else (0, 0.0)
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+    def samples(self):
+        with self._lock:
+            items = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield "_bucket", key, f'le="{_format_value(bound)}"', cumulative
+            yield "_sum", key, None, total
+            yield "_count", key, None, count
+
+class _Timer:
+    """Observes the duration of a `with` block."""
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+
+class Registry:
+    """
+    Process wide metric registry.
+    Collectors are async callables run before every scrape, for values that need I/O (queue depths).
+    """
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+
+    def register(self, metric):
+        # Re-registering a name (module/cog reload) replaces the old metric
+        self._metrics[metric.name] = metric
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def add_collector(self, collector):
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector):
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    async def collect(self):
+        for collector in list(self._collectors):
+            try:
+                await collector()
+            except Exception as e:
+                logger.error(f"Metrics collector {getattr(collector, '__qualname__', collector)} failed: {e}")
+
+    def render(self):
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+REGISTRY = Registry()
+
+# --- Process wide metrics ---
+TASK_RUNS = Counter('bot_task_runs_total', 'Background task loop iterations.', ['task', 'result'])
+TASK_DURATION = Histogram('bot_task_duration_seconds', 'Background task loop iteration duration.', ['task'])
+TASK_LAST_SUCCESS = Gauge('bot_task_last_success_timestamp_seconds', 'Unix time of the last successful iteration.', ['task'])
+# Fed by the loop watchdog heartbeat (services/loop_watchdog.py)
+LOOP_LAG = Histogram('bot_event_loop_lag_seconds', 'Delay of event loop wakeups beyond their schedule.',
+                     buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+LOOP_LAG_LAST = Gauge('bot_event_loop_lag_last_seconds', 'Most recent event loop lag probe.')
+GATEWAY_LATENCY = Gauge('bot_gateway_latency_seconds', 'Discord gateway heartbeat latency.')
+SCRAPE_REQUESTS = Counter('bot_scrape_requests_total', 'Scraper HTTP requests by HTTP status (or "error").', ['source', 'status'])
+SCRAPE_REQUEST_SECONDS = Histogram('bot_scrape_request_seconds', 'Scraper HTTP request duration.', ['source'])
+SCRAPE_ITEMS = Counter('bot_scrape_items_total', 'Scraped items (pokemon families, events) by result.', ['source', 'result'])
+RENDER_SECONDS = Histogram('bot_image_render_seconds', 'Trade card generation time by stage.', ['stage'])
+
+def track_loop(name):
+    """
+    Decorator for tasks.loop coroutines (put it under @tasks.loop):
+    counts runs/failures, times each iteration and records the last success.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                TASK_RUNS.inc(task=name, result='error')
+                raise
+            finally:
+                TASK_DURATION.observe(time.perf_counter() - started, task=name)
+            TASK_RUNS.inc(task=name, result='ok')
+            TASK_LAST_SUCCESS.set(time.time(), task=name)
+            return result
+        return wrapper
+    return decorator
+
+class MetricsServer:
+    """Serves GET /metrics in Prometheus text format."""
+    def __init__(self, registry=REGISTRY, host='127.0.0.1', port=9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def _handle(self, request):
+        await self.registry.collect()
+        return web.Response(text=self.registry.render(), content_type='text/plain', charset='utf-8')
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        logger.info(f"Metrics exporter listening on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
@@ -6,6 +6,8 @@ import database
 import re
 from urllib.parse import unquote
 import json
+import time
+from services.metrics import SCRAPE_ITEMS, SCRAPE_REQUESTS, SCRAPE_REQUEST_SECONDS
 
 logger = logging.getLogger('discord')
 logging.basicConfig(level=logging.INFO)
@@ -38,9 +40,11 @@ async def scrape_pokemon_data(pokedex_num=None, progress_callback=None):
                 # Scrape single Pokemon
                 try:
                     await process_pokemon_family(db, session, pokedex_num)
+                    SCRAPE_ITEMS.inc(source='pokemongohub', result='ok')
                     if progress_callback:
                         await progress_callback(1, 1)
                 except Exception as e:
+                    SCRAPE_ITEMS.inc(source='pokemongohub', result='error')
                     logger.error(f"Error processing #{pokedex_num}: {e}")
             else:
                 # Scrape all Pokemon with Concurrency
@@ -51,7 +55,9 @@ async def scrape_pokemon_data(pokedex_num=None, progress_callback=None):
                     async with sem:
                         try:
                             await process_pokemon_family(db, session, current_id)
+                            SCRAPE_ITEMS.inc(source='pokemongohub', result='ok')
                         except Exception as e:
+                            SCRAPE_ITEMS.inc(source='pokemongohub', result='error')
                             logger.error(f"Error processing #{current_id}: {e}")
 
                 tasks = [sem_process(i) for i in range(1, total + 1)]
@@ -71,8 +77,10 @@ async def fetch_url(session, url):
     """
     Helper to fetch a URL with error handling and rate limiting.
     """
+    started = time.perf_counter()
     try:
         async with session.get(url) as response:
+            SCRAPE_REQUESTS.inc(source='pokemongohub', status=response.status)
             if response.status == 404:
                 return None
             if response.status != 200:
@@ -80,8 +88,11 @@ async def fetch_url(session, url):
                 return None
             return await response.text()
     except Exception as e:
+        SCRAPE_REQUESTS.inc(source='pokemongohub', status='error')
         logger.error(f"Error fetching {url}: {e}")
         return None
+    finally:
+        SCRAPE_REQUEST_SECONDS.observe(time.perf_counter() - started, source='pokemongohub')
 
 # A list of common suffixes for variants.
 COMMON_VARIANTS = [
@@ -0,0 +1,110 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+import qrcode
+from PIL import Image
+from services.metrics import Counter
+
+logger = logging.getLogger('discord')
+
+QR_CACHE_DIR = "data/qr"
+MAX_MEMORY_ENTRIES = 512
+
+QR_LOOKUPS = Counter('bot_qr_cache_lookups_total', 'QR cache lookups by the layer that served them.', ['result'])
+
+def _file_name(friend_code):
+    # Hash of the exact payload: differently formatted codes render different QRs,
+    # and the friend code itself stays out of the file name
+    return hashlib.sha256(str(friend_code).encode('utf-8')).hexdigest()[:32]
+
+def render_qr_png(friend_code):
+    """Renders the QR code for a friend code as PNG bytes."""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(friend_code)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+class QRCache:
+    """
+    Friend code QR cache.
+    PNG bytes are kept on disk (data/qr/<hash of fc>.png), resized RGBA images are kept
+    in memory keyed by (friend_code, size). Methods are sync and thread safe,
+    so they can be used from the image generation executor.
+    """
+    def __init__(self, cache_dir=QR_CACHE_DIR, max_entries=MAX_MEMORY_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, friend_code):
+        return os.path.join(self.cache_dir, f"{_file_name(friend_code)}.png")
+
+    def get_png(self, friend_code):
+        """Returns PNG bytes of the full size QR code."""
+        path = self._path(friend_code)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            QR_LOOKUPS.inc(result='disk')
+            return data
+        except FileNotFoundError:
+            pass
+
+        QR_LOOKUPS.inc(result='render')
+        data = render_qr_png(friend_code)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.error(f"Could not write QR cache file {path}: {e}")
+        return data
+
+    def get_image(self, friend_code, size=None):
+        """Returns an RGBA image of the QR code, resized to size x size if given."""
+        key = (friend_code, size)
+        with self._lock:
+            img = self._images.get(key)
+            if img is not None:
+                self._images.move_to_end(key)
+                QR_LOOKUPS.inc(result='memory')
+                return img
+
+        img = Image.open(BytesIO(self.get_png(friend_code))).convert("RGBA")
+        if size:
+            img = img.resize((size, size), Image.Resampling.LANCZOS)
+
+        with self._lock:
+            self._images[key] = img
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+        return img
+
+    def invalidate(self, friend_code):
+        """Drops all cached renders of a friend code."""
+        with self._lock:
+            for key in [k for k in self._images if k[0] == friend_code]:
+                del self._images[key]
+        try:
+            os.remove(self._path(friend_code))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Could not remove QR cache file for {friend_code}: {e}")
+
+qr_cache = QRCache()
@@ -3,6 +3,7 @@ from bs4 import BeautifulSoup
 import datetime
 import pytz
 import logging
+from services.metrics import SCRAPE_ITEMS, SCRAPE_REQUESTS, SCRAPE_REQUEST_SECONDS
 
 logger = logging.getLogger('discord')
 
@@ -52,11 +53,13 @@ async def scrape_leekduck():
 
     try:
         async with aiohttp.ClientSession() as session:
-            async with session.get(LEEKDUCK_URL) as response:
-                if response.status != 200:
-                    logger.error(f"Failed to fetch LeekDuck: {response.status}")
-                    return []
-                html = await response.text()
+            with SCRAPE_REQUEST_SECONDS.time(source='leekduck'):
+                async with session.get(LEEKDUCK_URL) as response:
+                    SCRAPE_REQUESTS.inc(source='leekduck', status=response.status)
+                    if response.status != 200:
+                        logger.error(f"Failed to fetch LeekDuck: {response.status}")
+                        return []
+                    html = await response.text()
 
         soup = BeautifulSoup(html, 'html.parser')
 
@@ -122,12 +125,15 @@ async def scrape_leekduck():
                     })
 
             except Exception as e:
+                SCRAPE_ITEMS.inc(source='leekduck', result='error')
                 logger.error(f"Error parsing event item: {e}")
                 continue
 
+        SCRAPE_ITEMS.inc(len(events), source='leekduck', result='ok')
         logger.info(f"Scraped {len(events)} events from LeekDuck.")
         return events
 
     except Exception as e:
+        SCRAPE_REQUESTS.inc(source='leekduck', status='error')
         logger.error(f"Error scraping LeekDuck: {e}")
         return []
@@ -0,0 +1,244 @@
+import aiohttp
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from io import BytesIO
+from PIL import Image
+from services.metrics import Counter
+
+logger = logging.getLogger('discord')
+
+SPRITE_DIR = "data/sprites"
+MANIFEST_FILE = os.path.join(SPRITE_DIR, "manifest.json")
+DOWNLOAD_CONCURRENCY = 8
+
+SPRITE_DOWNLOADS = Counter('bot_sprite_downloads_total', 'Sprite downloads by result.', ['result'])
+
+def sprite_filename(pokemon_id, pokemon_form, costume, is_shiny):
+    """Constructs the cache filename: v1_{id}_{form}_{costume}_{shiny}.png"""
+    # Sanitize form name
+    safe_form = (pokemon_form or 'Normal').replace(" ", "_").lower()
+    safe_costume = costume.replace(" ", "_").lower() if costume else "none"
+
+    # Add v1 prefix to bust cache if old files were wrong
+    return f"v1_{pokemon_id}_{safe_form}_{safe_costume}_{'shiny' if is_shiny else 'normal'}.png"
+
+def resolve_sprite_url(image_url, shiny_image_url, costumes_json, costume, is_shiny):
+    """Picks the best image URL for a variant (costume first, then shiny, then normal)."""
+    url = None
+
+    # 1. Costume lookup
+    if costume and costumes_json:
+        try:
+            costumes = json.loads(costumes_json)
+            for c in costumes:
+                if c['name'] == costume:
+                    if is_shiny and c.get('shiny_image_url'):
+                        url = c['shiny_image_url']
+                    elif c.get('image_url'):
+                        url = c['image_url']
+                    break
+        except json.JSONDecodeError:
+            pass
+
+    # 2. Fallback to normal
+    if not url:
+        if is_shiny and shiny_image_url:
+            url = shiny_image_url
+
+    if not url:
+        url = image_url
+
+    return url
+
+def species_sprite_targets(species):
+    """Yields (filename, url) for every normal/shiny/costume variant of a species row."""
+    pid = species['pokedex_num']
+    form = species['form']
+    costume_names = [None]
+    if species.get('costumes'):
+        try:
+            costume_names += [c['name'] for c in json.loads(species['costumes'])]
+        except json.JSONDecodeError:
+            pass
+
+    for costume in costume_names:
+        for is_shiny in (False, True):
+            url = resolve_sprite_url(species.get('image_url'), species.get('shiny_image_url'),
+                                     species.get('costumes'), costume, is_shiny)
+            if url:
+                yield sprite_filename(pid, form, costume, is_shiny), url
+
+class SpriteStore:
+    """
+    Local sprite cache backed by a manifest file.
+    The manifest records url, path, size and sha256 of every downloaded sprite,
+    so lookups don't need to stat the filesystem.
+    Entries are written from worker threads (to_thread), so writes and full walks go
+    through self._lock; single lookups on the event loop don't need it.
+    """
+    def __init__(self, sprite_dir=SPRITE_DIR, manifest_file=MANIFEST_FILE):
+        self.sprite_dir = sprite_dir
+        self.manifest_file = manifest_file
+        if not os.path.exists(self.sprite_dir):
+            os.makedirs(self.sprite_dir)
+        self.entries = self._load_manifest()
+        self._lock = threading.Lock()
+        self._session = None
+        self._sem = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Error loading sprite manifest, starting empty: {e}")
+            return {}
+
+    def _save_manifest_sync(self):
+        tmp = f"{self.manifest_file}.tmp"
+        with self._lock:
+            entries = dict(self.entries)
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+        os.replace(tmp, self.manifest_file)
+
+    async def save_manifest(self):
+        await asyncio.to_thread(self._save_manifest_sync)
+
+    def path_for(self, filename):
+        return os.path.join(self.sprite_dir, filename)
+
+    def has(self, filename, url=None):
+        entry = self.entries.get(filename)
+        if not entry:
+            return False
+        return url is None or entry['url'] == url
+
+    def _adopt_sync(self, filename, url):
+        """Registers a sprite that is on disk but missing from the manifest (e.g. pre-manifest cache)."""
+        path = self.path_for(filename)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return False
+        entry = {'url': url, 'path': path, 'size': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+        with self._lock:
+            self.entries[filename] = entry
+        return True
+
+    def _store_sync(self, filename, url, data):
+        """Validates the payload is an image and writes it atomically."""
+        Image.open(BytesIO(data)).verify()
+        path = self.path_for(filename)
+        tmp = f"{path}.part"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        entry = {'url': url, 'path': path, 'size': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+        with self._lock:
+            self.entries[filename] = entry
+
+    def _verify_sync(self):
+        """Drops manifest entries whose file is missing or doesn't match size/hash."""
+        with self._lock:
+            entries = list(self.entries.items())
+        bad = []
+        for filename, entry in entries:
+            try:
+                with open(entry['path'], 'rb') as f:
+                    data = f.read()
+                if len(data) != entry['size'] or hashlib.sha256(data).hexdigest() != entry['sha256']:
+                    bad.append((filename, entry))
+            except OSError:
+                bad.append((filename, entry))
+        with self._lock:
+            for filename, entry in bad:
+                # Re-downloaded while we were checking -> keep the new entry
+                if self.entries.get(filename) is entry:
+                    del self.entries[filename]
+        return len(bad)
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        return self._session
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def download(self, filename, url):
+        async with self._sem:
+            try:
+                async with self._get_session().get(url) as resp:
+                    if resp.status != 200:
+                        logger.warning(f"Failed to download image from {url}: Status {resp.status}")
+                        SPRITE_DOWNLOADS.inc(result='http_error')
+                        return False
+                    data = await resp.read()
+                # Validate + write in executor to avoid blocking disk IO on main thread
+                await asyncio.to_thread(self._store_sync, filename, url, data)
+                SPRITE_DOWNLOADS.inc(result='ok')
+                return True
+            except Exception as e:
+                logger.error(f"Error downloading image {url}: {e}")
+        SPRITE_DOWNLOADS.inc(result='error')
+        return False
+
+    async def ensure(self, targets):
+        """
+        Makes sure all (filename, url) targets are cached.
+        Returns number of sprites downloaded.
+        """
+        missing = []
+        for filename, url in targets:
+            if self.has(filename, url):
+                continue
+            if filename not in self.entries and await asyncio.to_thread(self._adopt_sync, filename, url):
+                continue
+            missing.append((filename, url))
+
+        if not missing:
+            return 0
+
+        results = await asyncio.gather(*[self.download(f, u) for f, u in missing])
+        await self.save_manifest()
+        return sum(1 for r in results if r)
+
+    async def warm(self, species_rows):
+        """
+        Background warm-up: verifies the cache and downloads every species,
+        costume and shiny variant that is not cached yet.
+        Returns (downloaded, missing_after, dropped_corrupt).
+        """
+        dropped = await asyncio.to_thread(self._verify_sync)
+        if dropped:
+            logger.warning(f"Sprite manifest: dropped {dropped} corrupt/missing sprites.")
+
+        targets = {}
+        for species in species_rows:
+            for filename, url in species_sprite_targets(species):
+                targets[filename] = url
+
+        downloaded = await self.ensure(targets.items())
+        missing = sum(1 for f, u in targets.items() if not self.has(f, u))
+        if dropped and not downloaded:
+            await self.save_manifest()
+        logger.info(f"Sprite warm-up done: {downloaded} downloaded, {missing} unavailable, {len(targets)} total.")
+        return downloaded, missing, dropped
+
+_store = None
+
+def get_sprite_store():
+    """Shared SpriteStore instance (one manifest per process)."""
+    global _store
+    if _store is None:
+        _store = SpriteStore()
+    return _store
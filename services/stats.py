@@ -0,0 +1,81 @@
+from collections import deque
+
+DEFAULT_WINDOW = 1000
+
+def _pick(ordered, pct):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def percentile(values, pct):
+    return _pick(sorted(values), pct)
+
+class RollingStats:
+    """
+    Latency samples of one operation.
+    Counters (count, errors, total, max) cover the whole process lifetime,
+    percentiles are computed over the last `window` samples.
+    """
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+
+    def add(self, seconds, rows=0, error=False):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.rows += rows
+        if seconds > self.max:
+            self.max = seconds
+        if error:
+            self.errors += 1
+
+    def percentiles(self):
+        ordered = sorted(self.samples)
+        return {f"p{p}": _pick(ordered, p) for p in (50, 95, 99)}
+
+    def snapshot(self):
+        data = {
+            'count': self.count,
+            'errors': self.errors,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'rows': self.rows,
+        }
+        data.update(self.percentiles())
+        return data
+
+class StatsRegistry:
+    """Named RollingStats, created on first use."""
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._stats = {}
+
+    def get(self, name):
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = RollingStats(self.window)
+        return stats
+
+    def add(self, name, seconds, rows=0, error=False):
+        self.get(name).add(seconds, rows=rows, error=error)
+
+    def items(self):
+        return self._stats.items()
+
+    def reset(self):
+        self._stats = {}
+
+    def snapshot(self):
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    def top(self, n=10, key='total'):
+        """Returns the n (name, snapshot) pairs with the highest `key`."""
+        snapshots = self.snapshot()
+        return sorted(snapshots.items(), key=lambda item: item[1][key], reverse=True)[:n]
@@ -0,0 +1,68 @@
+import time
+import database
+from services.metrics import Counter
+
+SESSION_TTL = 300 # seconds, bounds staleness from changes made outside the trade view
+
+SESSION_LOOKUPS = Counter('bot_trade_session_lookups_total', 'Trade session cache lookups.', ['result'])
+
+class TradeSession:
+    """Everything a trade channel's buttons need: the trade, both listings and the participants."""
+    def __init__(self, trade, listing_a, listing_b):
+        self.trade = trade
+        self.listing_a = listing_a
+        self.listing_b = listing_b
+        self.participants = {l['user_id'] for l in (listing_a, listing_b) if l}
+        self.loaded_at = time.monotonic()
+
+    @property
+    def is_complete(self):
+        """False if one of the listings no longer exists."""
+        return self.listing_a is not None and self.listing_b is not None
+
+    @property
+    def is_open(self):
+        return self.trade['status'] == 'OPEN'
+
+    def listing_ids(self):
+        return self.trade['listing_a_id'], self.trade['listing_b_id']
+
+class TradeSessionCache:
+    """
+    Per-channel TradeSession cache.
+    Sessions are loaded with one query on first use and dropped when the trade
+    changes state (complete, cancel, expiry) or a listing in it is edited/deleted.
+    """
+    def __init__(self, ttl=SESSION_TTL):
+        self.ttl = ttl
+        self._sessions = {}
+
+    async def get(self, channel_id):
+        """Returns the TradeSession of a channel, or None if it is not a trade channel."""
+        session = self._sessions.get(channel_id)
+        if session and time.monotonic() - session.loaded_at < self.ttl:
+            SESSION_LOOKUPS.inc(result='hit')
+            return session
+        SESSION_LOOKUPS.inc(result='miss')
+
+        trade, listing_a, listing_b = await database.get_trade_context(channel_id)
+        if not trade:
+            self._sessions.pop(channel_id, None)
+            return None
+
+        session = TradeSession(trade, listing_a, listing_b)
+        if session.is_complete:
+            self._sessions[channel_id] = session
+        else:
+            # Don't cache broken sessions
+            self._sessions.pop(channel_id, None)
+        return session
+
+    def invalidate(self, channel_id):
+        self._sessions.pop(channel_id, None)
+
+    def invalidate_listing(self, listing_id):
+        for channel_id in [c for c, s in self._sessions.items() if listing_id in s.listing_ids()]:
+            del self._sessions[channel_id]
+
+trade_sessions = TradeSessionCache()
@@ -0,0 +1,135 @@
+import asyncio
+import datetime
+import unittest
+import os
+from types import SimpleNamespace
+import discord
+import database
+from services.message_purge import purge_messages
+from cogs.autodelete import AutoDelete
+
+class TestAutodeleteLedger(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.original_db_name = database.DB_NAME
+        database.DB_NAME = "test_autodelete_ledger.db"
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        await database.init_db()
+
+    async def asyncTearDown(self):
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        database.DB_NAME = self.original_db_name
+
+    async def test_due_messages(self):
+        await database.add_autodelete_messages([
+            (1, 100, 1000),
+            (2, 100, 2000),
+            (3, 100, 3000),
+            (4, 200, 1000),
+        ])
+        # Duplicates are ignored
+        await database.add_autodelete_messages([(1, 100, 1000)])
+
+        due = await database.get_due_autodelete_messages(100, 2500)
+        self.assertEqual(due, [1, 2])
+
+        due = await database.get_due_autodelete_messages(100, 2500, limit=1)
+        self.assertEqual(due, [1])
+
+        await database.delete_autodelete_messages([1, 2])
+        self.assertEqual(await database.get_due_autodelete_messages(100, 5000), [3])
+
+        await database.clear_autodelete_channel(200)
+        self.assertEqual(await database.get_due_autodelete_messages(200, 5000), [])
+
+    async def test_backlog_and_watermark(self):
+        await database.set_autodelete_config(100, 1, 10)
+        await database.set_autodelete_config(200, 1, 60)
+        await database.add_autodelete_messages([
+            (1, 100, 1000),
+            (2, 100, 1500),
+            (3, 200, 1000),
+        ])
+
+        # now=2000: channel 100 cutoff 1400 -> 1 due, channel 200 cutoff -1600 -> 0 due
+        backlog = await database.get_autodelete_backlog(2000)
+        self.assertEqual(backlog, {100: 1, 200: 0})
+
+        await database.set_autodelete_watermark(100, 1400)
+        configs = {c['channel_id']: c for c in await database.get_autodelete_configs()}
+        self.assertEqual(configs[100]['swept_until'], 1400)
+        self.assertIsNone(configs[200]['swept_until'])
+
+        # Changing duration keeps the watermark
+        await database.set_autodelete_config(100, 1, 20)
+        configs = {c['channel_id']: c for c in await database.get_autodelete_configs()}
+        self.assertEqual(configs[100]['swept_until'], 1400)
+
+    async def test_retry_attempts(self):
+        await database.add_autodelete_messages([(1, 100, 1000), (2, 100, 1000)])
+        self.assertEqual(await database.retry_autodelete_messages([1], max_attempts=2), 0)
+        self.assertEqual(await database.get_due_autodelete_messages(100, 5000), [1, 2])
+        self.assertEqual(await database.retry_autodelete_messages([1, 2], max_attempts=2), 1)
+        self.assertEqual(await database.get_due_autodelete_messages(100, 5000), [2])
+
+    async def test_purge_classifies_failures(self):
+        def http_error(status):
+            return discord.HTTPException(SimpleNamespace(status=status, reason="error"), "error")
+
+        errors = {1: None, 2: http_error(403), 3: http_error(503), 4: http_error(429)}
+
+        class Message:
+            def __init__(self, message_id):
+                self.id = message_id
+
+            async def delete(self):
+                if errors[self.id]:
+                    raise errors[self.id]
+
+        channel = SimpleNamespace(id=100, get_partial_message=Message)
+        # Snowflakes this small are older than 14 days, so every id takes the single delete path
+        done, failed = await purge_messages(channel, [1, 2, 3, 4])
+        self.assertEqual(done, [1])
+        self.assertEqual(failed, [2])
+
+    async def test_history_watermark_holds_at_transient_failure(self):
+        await database.set_autodelete_config(100, 1, 10)
+        base = 1_700_000_000
+        created = {10: base + 10, 20: base + 20, 30: base + 30}
+        failing = {20}
+
+        class Message:
+            def __init__(self, message_id):
+                self.id = message_id
+                self.created_at = datetime.datetime.fromtimestamp(created[message_id], datetime.timezone.utc)
+
+            async def delete(self):
+                if self.id in failing:
+                    raise discord.HTTPException(SimpleNamespace(status=503, reason="error"), "error")
+
+        class Channel:
+            id = 100
+
+            def get_partial_message(self, message_id):
+                return Message(message_id)
+
+            async def history(self, limit, after, before, oldest_first):
+                for message_id in sorted(created):
+                    if (after is None or created[message_id] > after.timestamp()) and created[message_id] < before.timestamp():
+                        yield Message(message_id)
+
+        cog = SimpleNamespace(listening_since={}, api_budget=asyncio.Semaphore(1))
+        config = (await database.get_autodelete_configs())[0]
+        self.assertEqual(await AutoDelete._sweep_history(cog, Channel(), config, base + 100), 2)
+        config = (await database.get_autodelete_configs())[0]
+        self.assertEqual(config['swept_until'], base + 19)
+
+        # Next tick rescans from the failed message on
+        failing.clear()
+        self.assertEqual(await AutoDelete._sweep_history(cog, Channel(), config, base + 100), 2)
+        config = (await database.get_autodelete_configs())[0]
+        self.assertEqual(config['swept_until'], base + 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+import asyncio
+import datetime
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from functools import partial
+from unittest.mock import patch
+import database
+from cogs.admin import Admin
+from services.backup import (backup_changes, backup_database, backup_taken_at, bundle_segments, iter_upload_parts, last_delivered, list_backups,
+                            list_segments, record_delivered, restore_backup, rotate_backups)
+
+TEST_DB = "test_backup.db"
+
+class TestBackup(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.original_db_name = database.DB_NAME
+        database.DB_NAME = TEST_DB
+        if os.path.exists(TEST_DB):
+            os.remove(TEST_DB)
+        await database.init_db()
+        self.backup_dir = tempfile.mkdtemp()
+
+    async def asyncTearDown(self):
+        shutil.rmtree(self.backup_dir, ignore_errors=True)
+        if os.path.exists(TEST_DB):
+            os.remove(TEST_DB)
+        database.DB_NAME = self.original_db_name
+
+    async def test_backup_and_restore(self):
+        await database.add_user_account(user_id=1, friend_code="111122223333", team="Mystic", region="Praha", account_name="Ash")
+        info = await backup_database(label="pre-update", backup_dir=self.backup_dir)
+        self.assertEqual(list_backups(self.backup_dir, "pre-update"), [info.path])
+        with gzip.open(info.path, 'rb') as f:
+            self.assertEqual(len(f.read()), info.db_size)
+
+        await database.add_user_account(user_id=2, friend_code="444455556666", team="Valor", region="Brno", account_name="Misty")
+        self.assertEqual(len(await database.get_user_accounts(2)), 1)
+
+        await asyncio.to_thread(restore_backup, info.path)
+        self.assertEqual(len(await database.get_user_accounts(1)), 1)
+        self.assertEqual(await database.get_user_accounts(2), [])
+        self.assertFalse(os.path.exists(f"{TEST_DB}.restore"))
+
+    async def test_backup_during_writes(self):
+        async def writer():
+            for i in range(200):
+                await database.add_user_account(user_id=100 + i, friend_code=f"{i:012d}", team="Mystic", region="Praha", account_name=f"T{i}")
+
+        task = asyncio.create_task(writer())
+        info = await backup_database(backup_dir=self.backup_dir)
+        await task
+
+        snapshot = os.path.join(self.backup_dir, "check.db")
+        with gzip.open(info.path, 'rb') as src, open(snapshot, 'wb') as dest:
+            shutil.copyfileobj(src, dest)
+        conn = sqlite3.connect(snapshot)
+        try:
+            self.assertEqual(conn.execute("PRAGMA integrity_check").fetchone()[0], "ok")
+            self.assertLessEqual(conn.execute("SELECT COUNT(*) FROM users").fetchone()[0], 200)
+        finally:
+            conn.close()
+
+    def _dump(self, path):
+        conn = sqlite3.connect(path)
+        try:
+            return {table: conn.execute(f"SELECT * FROM {table} ORDER BY rowid").fetchall()
+                    for table in ("users", "listings", "trades", "pokemon_species")}
+        finally:
+            conn.close()
+
+    async def test_incremental_restore(self):
+        await database.add_user_account(user_id=1, friend_code="111122223333", team="Mystic", region="Praha", account_name="Ash")
+        full = await backup_database(label="daily", backup_dir=self.backup_dir)
+
+        species_id = await database.upsert_pokemon_species(25, "Pikachu", "Normal", "Electric")
+        account = (await database.get_user_accounts(1))[0]
+        await database.add_user_account(user_id=2, friend_code="444455556666", team="Valor", region="Brno", account_name="Misty")
+        listing_id = await database.add_listing(1, account['id'], "HAVE", species_id)
+        first = await backup_changes(backup_dir=self.backup_dir)
+        # Full snapshots don't trim the changelog: the first insert is in both and skipped on replay
+        self.assertEqual(first.count, 4)
+
+        await database.update_user_account(account['id'], team="Instinct")
+        other = (await database.get_user_accounts(2))[0]
+        async with database.get_db() as db:
+            await db.execute("DELETE FROM users WHERE id = ?", (other['id'],))
+            await db.commit()
+        second = await backup_changes(backup_dir=self.backup_dir)
+        self.assertEqual(second.first, first.last + 1)
+        self.assertIsNone(await backup_changes(backup_dir=self.backup_dir))
+
+        segments = list_segments(self.backup_dir, since=full.path)
+        self.assertEqual(segments, [first.path, second.path])
+
+        restored = os.path.join(self.backup_dir, "restored.db")
+        applied = await asyncio.to_thread(restore_backup, full.path, restored, segments)
+        self.assertEqual(applied, 5)
+        self.assertEqual(self._dump(restored), self._dump(TEST_DB))
+
+        # Bundled segments replay the same, and trainer search follows the replayed rows
+        bundle_dir = os.path.join(self.backup_dir, "bundle")
+        os.makedirs(bundle_dir)
+        bundle = bundle_segments(segments, bundle_dir)
+        os.remove(restored)
+        await asyncio.to_thread(restore_backup, full.path, restored, [bundle])
+        self.assertEqual(self._dump(restored), self._dump(TEST_DB))
+        conn = sqlite3.connect(restored)
+        try:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM users_fts WHERE users_fts MATCH 'Misty'").fetchone()[0], 0)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM changelog").fetchone()[0], 0)
+            self.assertEqual(conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changelog'").fetchone()[0], second.last)
+        finally:
+            conn.close()
+
+        # Point in time: stop after the first segment
+        os.remove(restored)
+        await asyncio.to_thread(restore_backup, full.path, restored, segments, first.last)
+        dump = self._dump(restored)
+        self.assertEqual(len(dump['users']), 2)
+        self.assertEqual([row[0] for row in dump['listings']], [listing_id])
+
+        # Rebase (restoring the live database): the second segment belongs to the discarded
+        # history, so it is moved aside and new changes continue after its seqs
+        os.remove(restored)
+        await asyncio.to_thread(restore_backup, full.path, restored, segments, first.last, rebase=True)
+        self.assertEqual(list_segments(self.backup_dir), [first.path])
+        conn = sqlite3.connect(restored)
+        try:
+            self.assertEqual(conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changelog'").fetchone()[0], second.last)
+        finally:
+            conn.close()
+
+    async def test_delivered_backup(self):
+        self.assertIsNone(last_delivered(self.backup_dir))
+        info = await backup_database(backup_dir=self.backup_dir)
+        record_delivered(info.path, self.backup_dir)
+        self.assertEqual(last_delivered(self.backup_dir), info.path)
+        # Rotated away locally -> nothing to base change bundles on
+        os.remove(info.path)
+        self.assertIsNone(last_delivered(self.backup_dir))
+
+    async def test_work_tables_not_logged(self):
+        await database.enqueue_matches([(1, 10)], now=0)
+        await database.add_autodelete_messages([(100, 10, 0)])
+        async with database.get_db() as db:
+            async with db.execute("SELECT COUNT(*) AS c FROM changelog") as cursor:
+                self.assertEqual((await cursor.fetchone())['c'], 0)
+
+    def test_rotation_keeps_newest_per_label(self):
+        for day in range(1, 6):
+            for label in ("daily", "pre-update"):
+                open(os.path.join(self.backup_dir, f"trade_bot-2024010{day}-120000-{label}.db.gz"), 'wb').close()
+        open(os.path.join(self.backup_dir, "unrelated.txt"), 'wb').close()
+        open(os.path.join(self.backup_dir, "trade_bot-20240103-110000-1-10.changes.jsonl.gz"), 'wb').close()
+        open(os.path.join(self.backup_dir, "trade_bot-20240104-130000-11-20.changes.jsonl.gz"), 'wb').close()
+
+        removed = rotate_backups(self.backup_dir, keep=2)
+        self.assertEqual(len(removed), 7)
+        self.assertEqual([os.path.basename(p) for p in list_segments(self.backup_dir)], ["trade_bot-20240104-130000-11-20.changes.jsonl.gz"])
+        self.assertEqual([os.path.basename(p) for p in list_backups(self.backup_dir, "daily")],
+                         ["trade_bot-20240105-120000-daily.db.gz", "trade_bot-20240104-120000-daily.db.gz"])
+        self.assertEqual(len(list_backups(self.backup_dir, "pre-update")), 2)
+        self.assertTrue(os.path.exists(os.path.join(self.backup_dir, "unrelated.txt")))
+
+    def test_backup_taken_at(self):
+        path = os.path.join(self.backup_dir, "trade_bot-20240105-120000-daily.db.gz")
+        self.assertEqual(backup_taken_at(path), datetime.datetime(2024, 1, 5, 12, 0, 0))
+
+    def test_upload_parts(self):
+        path = os.path.join(self.backup_dir, "trade_bot-20240101-120000-manual.db.gz")
+        data = os.urandom(2500)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        parts = list(iter_upload_parts(path, part_size=1000))
+        self.assertEqual([name for name, _ in parts], [f"{os.path.basename(path)}.00{i}" for i in (1, 2, 3)])
+        self.assertEqual(b"".join(buffer.getvalue() for _, buffer in parts), data)
+
+        single = list(iter_upload_parts(path, part_size=4000))
+        self.assertEqual([name for name, _ in single], [os.path.basename(path)])
+
+    async def test_send_backup_join_hint(self):
+        path = os.path.join(self.backup_dir, "trade_bot-20240101-120000-manual.db.gz")
+        with open(path, 'wb') as f:
+            f.write(os.urandom(2500))
+
+        class Destination:
+            def __init__(self):
+                self.files = []
+                self.messages = []
+
+            async def send(self, content=None, file=None):
+                if file:
+                    self.files.append(file.filename)
+                else:
+                    self.messages.append(content)
+
+        destination = Destination()
+        with patch('cogs.admin.iter_upload_parts', partial(iter_upload_parts, part_size=1000)):
+            await Admin._send_backup(None, destination, path, "backup")
+
+        name = os.path.basename(path)
+        self.assertEqual(destination.files, [f"{name}.001", f"{name}.002", f"{name}.003"])
+        self.assertEqual(destination.messages, [f"Backup split into 3 parts, join them with `cat {name}.0* > {name}`."])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import copy
+import unittest
+import database
+from benchmarks.run import compare, run_benchmark
+
+class TestBenchmarkHarness(unittest.IsolatedAsyncioTestCase):
+    async def test_small_run_exercises_every_operation(self):
+        original_db = database.DB_NAME
+        report = await run_benchmark('default', operations=150, concurrency=4, api_latency=0,
+                                     species=20, users=10, listings=40)
+        self.assertEqual(database.DB_NAME, original_db)
+
+        operations = report['operations']
+        self.assertTrue({'create_listing', 'match', 'autocomplete'} <= set(operations))
+        for name, stats in operations.items():
+            self.assertEqual(stats['errors'], 0, name)
+        self.assertIsNotNone(operations['create_listing']['first_response'])
+
+    def test_compare_flags_regressions(self):
+        baseline = {'operations': {'match': {'p95': 0.1, 'throughput': 50.0}}}
+        report = copy.deepcopy(baseline)
+        self.assertEqual(compare(report, baseline), [])
+
+        report['operations']['match']['p95'] = 0.2
+        report['operations']['match']['throughput'] = 20.0
+        self.assertEqual(len(compare(report, baseline)), 2)
+
+if __name__ == '__main__':
+    unittest.main()
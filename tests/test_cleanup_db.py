@@ -0,0 +1,86 @@
+import unittest
+import os
+import database
+
+class TestCleanupQueries(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.original_db_name = database.DB_NAME
+        database.DB_NAME = "test_cleanup_db.db"
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        await database.init_db()
+        self.pikachu_id = await database.upsert_pokemon_species(25, "Pikachu", "Normal", "Electric")
+
+    async def asyncTearDown(self):
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        database.DB_NAME = self.original_db_name
+
+    async def _create_account(self, user_id):
+        await database.add_user_account(user_id=user_id, friend_code="123456789012", team="Mystic", region="Praha", account_name="Main")
+        accounts = await database.get_user_accounts(user_id)
+        return accounts[0]['id']
+
+    async def test_purge_departed_user_listings(self):
+        acc1 = await self._create_account(1)
+        acc2 = await self._create_account(2)
+
+        # User 1 left guild 10 two days ago; has listings in guild 10 and guild 20
+        l_gone = await database.add_listing(1, acc1, 'HAVE', self.pikachu_id, guild_id=10)
+        await database.update_listing_message(l_gone, 555, 777)
+        l_other_guild = await database.add_listing(1, acc1, 'HAVE', self.pikachu_id, guild_id=20)
+        # User 2 left just now -> untouched
+        l_recent = await database.add_listing(2, acc2, 'WANT', self.pikachu_id, guild_id=10)
+
+        await database.add_user_departure(1, 10)
+        await database.add_user_departure(2, 10)
+        async with database.get_db() as db:
+            await db.execute("UPDATE user_departures SET departed_at = datetime('now', '-48 hours') WHERE user_id = 1")
+            await db.commit()
+
+        deleted, departed = await database.purge_departed_user_listings(hours=24)
+
+        self.assertEqual(departed, 1)
+        self.assertEqual([l['id'] for l in deleted], [l_gone])
+        self.assertEqual(deleted[0]['message_id'], 555)
+        self.assertIsNone(await database.get_listing(l_gone))
+        self.assertIsNotNone(await database.get_listing(l_other_guild))
+        self.assertIsNotNone(await database.get_listing(l_recent))
+
+        async with database.get_db() as db:
+            async with db.execute("SELECT user_id FROM user_departures") as cursor:
+                remaining = await cursor.fetchall()
+        self.assertEqual([d['user_id'] for d in remaining], [2])
+
+    async def test_close_expired_trades(self):
+        acc1 = await self._create_account(1)
+        acc2 = await self._create_account(2)
+
+        have = await database.add_listing(1, acc1, 'HAVE', self.pikachu_id, guild_id=10)
+        want = await database.add_listing(2, acc2, 'WANT', self.pikachu_id, guild_id=10)
+        fresh_a = await database.add_listing(1, acc1, 'HAVE', self.pikachu_id, guild_id=10)
+        fresh_b = await database.add_listing(2, acc2, 'WANT', self.pikachu_id, guild_id=10)
+        for listing_id in (have, want, fresh_a, fresh_b):
+            await database.update_listing_status(listing_id, 'PENDING')
+
+        old_trade = await database.create_trade(have, want, 900)
+        fresh_trade = await database.create_trade(fresh_a, fresh_b, 901)
+        async with database.get_db() as db:
+            await db.execute("UPDATE trades SET created_at = datetime('now', '-8 days') WHERE id = ?", (old_trade,))
+            await db.commit()
+
+        trades, listings = await database.close_expired_trades(days=7)
+
+        self.assertEqual([t['id'] for t in trades], [old_trade])
+        self.assertEqual(sorted(l['id'] for l in listings), sorted([have, want]))
+        self.assertEqual(listings[0]['guild_id'], 10)
+        self.assertEqual((await database.get_trade_by_channel(900))['status'], 'CLOSED')
+        self.assertEqual((await database.get_trade_by_channel(901))['status'], 'OPEN')
+        self.assertEqual((await database.get_listing(have))['status'], 'ACTIVE')
+        self.assertEqual((await database.get_listing(fresh_a))['status'], 'PENDING')
+
+        # Second run is a no-op
+        self.assertEqual(await database.close_expired_trades(days=7), ([], []))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import time
+import unittest
+import database
+from services.cluster import LeaderElection, owns_guild, shard_filter
+from scripts.run_cluster import split_shards
+
+TEST_DB = "test_cluster.db"
+
+class FakeShardedBot:
+    def __init__(self, shard_count, shard_ids):
+        self.shard_count = shard_count
+        self.shard_ids = shard_ids
+
+class TestCluster(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.original_db_name = database.DB_NAME
+        database.DB_NAME = TEST_DB
+        if os.path.exists(TEST_DB):
+            os.remove(TEST_DB)
+        await database.init_db()
+
+    async def asyncTearDown(self):
+        if os.path.exists(TEST_DB):
+            os.remove(TEST_DB)
+        database.DB_NAME = self.original_db_name
+
+    async def test_wal_mode(self):
+        async with database.get_db() as db:
+            async with db.execute("PRAGMA journal_mode") as cursor:
+                self.assertEqual((await cursor.fetchone())['journal_mode'], 'wal')
+
+    async def test_lease_takeover_after_expiry(self):
+        self.assertTrue(await database.acquire_lease("tasks", "a", ttl=30))
+        self.assertFalse(await database.acquire_lease("tasks", "b", ttl=30))
+        self.assertTrue(await database.acquire_lease("tasks", "a", ttl=30)) # renewal
+
+        # Expired lease goes to the next process asking
+        async with database.get_db() as db:
+            await db.execute("UPDATE leases SET expires_at = ?", (time.time() - 1,))
+            await db.commit()
+        self.assertTrue(await database.acquire_lease("tasks", "b", ttl=30))
+        self.assertFalse(await database.acquire_lease("tasks", "a", ttl=30))
+
+        await database.release_lease("tasks", "b")
+        self.assertTrue(await database.acquire_lease("tasks", "a", ttl=30))
+
+    async def test_leader_election(self):
+        first = LeaderElection(ttl=30, holder="first")
+        second = LeaderElection(ttl=30, holder="second")
+        self.assertTrue(await first.renew())
+        self.assertFalse(await second.renew())
+        self.assertTrue(first.is_leader)
+        self.assertFalse(second.is_leader)
+
+        # Clean shutdown hands over immediately
+        await first.stop()
+        self.assertFalse(first.is_leader)
+        self.assertTrue(await second.renew())
+        self.assertTrue(second.is_leader)
+
+    def test_shard_ownership(self):
+        guild_id = (123456789 << 22) | 42 # shard = (guild_id >> 22) % shard_count
+        self.assertTrue(owns_guild(object(), guild_id))
+        self.assertTrue(owns_guild(FakeShardedBot(4, [123456789 % 4]), guild_id))
+        self.assertFalse(owns_guild(FakeShardedBot(4, [(123456789 + 1) % 4]), guild_id))
+        self.assertIsNone(shard_filter(object()))
+        self.assertEqual(shard_filter(FakeShardedBot(4, [0, 1])), (4, [0, 1]))
+
+    def test_split_shards(self):
+        self.assertEqual(split_shards(10, 3), [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        self.assertEqual(split_shards(2, 4), [[0], [1]])
+
+    async def test_match_jobs_claimed_by_owning_shard(self):
+        guilds = [(shard << 22) for shard in range(4)]
+        await database.enqueue_matches([(i + 1, guild_id) for i, guild_id in enumerate(guilds)], now=0)
+
+        jobs = await database.claim_match_jobs(time.time(), limit=10, shards=(4, [1, 3]))
+        self.assertEqual(sorted(job['guild_id'] for job in jobs), [guilds[1], guilds[3]])
+
+        # Restart of this shard process only releases its own claims
+        await database.claim_match_jobs(time.time(), limit=10)
+        self.assertEqual(await database.release_match_jobs(shards=(4, [1, 3])), 2)
+
+    async def test_lock_trade_once(self):
+        species_id = await database.upsert_pokemon_species(25, "Pikachu", "Normal", "Electric")
+        listings = []
+        for user_id in (1, 2, 3):
+            await database.add_user_account(user_id=user_id, friend_code=f"{user_id:012d}", team="Mystic", region="Praha")
+            account = (await database.get_user_accounts(user_id))[0]
+            listings.append(await database.add_listing(user_id, account['id'], "HAVE" if user_id == 1 else "WANT", species_id))
+
+        self.assertIsNotNone(await database.lock_trade(listings[1], listings[0]))
+        # Another worker that picked the same candidate loses
+        self.assertIsNone(await database.lock_trade(listings[2], listings[0]))
+        self.assertEqual((await database.get_listing(listings[2]))['status'], 'ACTIVE')
+
+if __name__ == '__main__':
+    unittest.main()
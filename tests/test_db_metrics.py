@@ -0,0 +1,72 @@
+import os
+import unittest
+from unittest.mock import patch
+import database
+import services.db_metrics as db_metrics_module
+from services.db_metrics import db_metrics
+
+class TestDBMetrics(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.original_db_name = database.DB_NAME
+        database.DB_NAME = "test_db_metrics.db"
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        await database.init_db()
+        db_metrics.reset()
+
+    async def asyncTearDown(self):
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        database.DB_NAME = self.original_db_name
+        db_metrics.reset()
+
+    async def test_statements_recorded_per_helper(self):
+        await database.add_user_account(user_id=1, friend_code="111111111111", team="Mystic", region="Praha", account_name="Ash")
+        accounts = await database.get_user_accounts(1)
+        self.assertEqual(len(accounts), 1)
+
+        names = [name for name, _ in db_metrics.statements.items()]
+        select = [n for n in names if n.startswith("get_user_accounts | SELECT")]
+        self.assertEqual(len(select), 1)
+        self.assertEqual(db_metrics.statements.get(select[0]).rows, 1)
+        self.assertTrue(any(n.startswith("add_user_account | INSERT") for n in names))
+
+        self.assertGreaterEqual(db_metrics.helpers.get("get_user_accounts").count, 1)
+        self.assertGreaterEqual(db_metrics.connect.count, 2)
+        self.assertGreaterEqual(db_metrics.commit.count, 1)
+
+    async def test_slow_query_logged_with_plan(self):
+        with patch.object(db_metrics_module, 'SLOW_QUERY_SECONDS', 0):
+            await database.get_user_accounts(1)
+            await database.get_user_accounts(1)
+            await db_metrics.wait_explains()
+
+        slow = [e for e in db_metrics.slow_queries if e['helper'] == 'get_user_accounts']
+        self.assertEqual(len(slow), 2)
+        self.assertTrue(slow[0]['plan'])
+        # Explained once per EXPLAIN_INTERVAL
+        self.assertIsNone(slow[1]['plan'])
+
+    async def test_explain_failure_is_contained(self):
+        def broken(*args):
+            raise RuntimeError("database is locked")
+
+        with patch.object(db_metrics_module, 'SLOW_QUERY_SECONDS', 0), patch.object(db_metrics_module, '_explain_sync', broken):
+            self.assertEqual(await database.get_user_accounts(1), [])
+            await db_metrics.wait_explains()
+
+        slow = [e for e in db_metrics.slow_queries if e['helper'] == 'get_user_accounts']
+        self.assertIsNone(slow[0]['plan'])
+
+    async def test_snapshot_written(self):
+        await database.get_user_accounts(1)
+        path = "test_db_stats.json"
+        try:
+            db_metrics.write_snapshot(path)
+            self.assertTrue(os.path.exists(path))
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import unittest
+import database
+from services.friend_pool import POOL_TTL, friend_pool
+
+class TestFriendPool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.original_db_name = database.DB_NAME
+        database.DB_NAME = "test_friend_pool.db"
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        await database.init_db()
+        friend_pool.invalidate()
+
+        for user_id in range(1, 11):
+            team = "Mystic" if user_id % 2 else "Valor"
+            await database.add_user_account(user_id=user_id, friend_code=f"{user_id:012d}", team=team,
+                                            region="Kraj Vysočina", account_name=f"Trainer{user_id}",
+                                            want_more_friends=user_id <= 8)
+
+    async def asyncTearDown(self):
+        friend_pool.invalidate()
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        database.DB_NAME = self.original_db_name
+
+    async def test_rotation_covers_everyone(self):
+        first = await database.get_users_wanting_friends(limit=3)
+        second = await database.get_users_wanting_friends(limit=3)
+        third = await database.get_users_wanting_friends(limit=2)
+        seen = [u['user_id'] for u in first + second + third]
+        # One full round: every opted-in account exactly once
+        self.assertEqual(sorted(seen), list(range(1, 9)))
+
+    async def test_filters_and_invalidation(self):
+        mystic = await database.get_users_wanting_friends(limit=25, team="Mystic", exclude_user_id=1)
+        self.assertEqual(sorted(u['user_id'] for u in mystic), [3, 5, 7])
+        self.assertEqual(await database.get_users_wanting_friends(limit=25, region="Praha"), [])
+
+        # Opting out drops the account from the pool
+        account = (await database.get_user_accounts(3))[0]
+        await database.update_user_account(account['id'], want_more_friends=False)
+        mystic = await database.get_users_wanting_friends(limit=25, team="Mystic")
+        self.assertEqual(sorted(u['user_id'] for u in mystic), [1, 5, 7])
+
+    async def test_stale_pool_never_shows_opted_out(self):
+        await database.get_users_wanting_friends(limit=1)
+        # Changed behind the pool's back (e.g. by another cluster process)
+        async with database.get_db() as db:
+            await db.execute("UPDATE users SET want_more_friends = 0 WHERE user_id = 1")
+            await db.execute("UPDATE users SET team = 'Valor' WHERE user_id = 3")
+            await db.commit()
+
+        everyone = await database.get_users_wanting_friends(limit=25)
+        self.assertNotIn(1, [u['user_id'] for u in everyone])
+        mystic = await database.get_users_wanting_friends(limit=25, team="Mystic")
+        self.assertEqual(sorted(u['user_id'] for u in mystic), [5, 7])
+
+    async def test_expired_pool_reloads_and_keeps_rotation(self):
+        first = await database.get_users_wanting_friends(limit=3)
+        # Registered by another cluster process: no invalidate() here
+        async with database.get_db() as db:
+            await db.execute("UPDATE users SET want_more_friends = 1 WHERE user_id = 9")
+            await db.commit()
+        friend_pool.ttl = 0
+        try:
+            rest = await database.get_users_wanting_friends(limit=6)
+        finally:
+            friend_pool.ttl = POOL_TTL
+        # The round goes on with the accounts not shown yet, plus the new one
+        self.assertEqual(sorted(u['user_id'] for u in first + rest), list(range(1, 10)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import unittest
+import database
+from scripts.generate_dataset import DatasetConfig, generate_dataset, zipf_weights
+
+TEST_DB = "test_generate_dataset.db"
+
+class TestGenerateDataset(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.original_db_name = database.DB_NAME
+        if os.path.exists(TEST_DB):
+            os.remove(TEST_DB)
+
+    async def asyncTearDown(self):
+        if os.path.exists(TEST_DB):
+            os.remove(TEST_DB)
+        database.DB_NAME = self.original_db_name
+
+    async def test_small_dataset(self):
+        config = DatasetConfig(seed=7, users=50, listings=2000, open_trades=20, closed_trades=30,
+                               events=10, autodelete_channels=3, ledger_messages=200, departures=5)
+        counts = await generate_dataset(TEST_DB, config)
+        self.assertEqual(database.DB_NAME, self.original_db_name)
+        self.assertEqual(counts['users'], 50)
+        self.assertGreaterEqual(counts['accounts'], 50)
+        self.assertEqual(counts['listings'], 2000 + 2 * 50)
+
+        database.DB_NAME = TEST_DB
+        async with database.get_db() as db:
+            async with db.execute("SELECT COUNT(*) AS c FROM listings") as cursor:
+                self.assertEqual((await cursor.fetchone())['c'], counts['listings'])
+            # Every trade pairs a HAVE and a WANT of the same species
+            async with db.execute("""
+                SELECT COUNT(*) AS c FROM trades t
+                JOIN listings a ON a.id = t.listing_a_id JOIN listings b ON b.id = t.listing_b_id
+                WHERE a.species_id = b.species_id AND a.listing_type = 'HAVE' AND b.listing_type = 'WANT'
+            """) as cursor:
+                self.assertEqual((await cursor.fetchone())['c'], 50)
+            async with db.execute("SELECT COUNT(*) AS c FROM trades WHERE status = 'OPEN' AND channel_id IS NOT NULL") as cursor:
+                self.assertEqual((await cursor.fetchone())['c'], 20)
+            # Popular species dominate
+            async with db.execute("SELECT COUNT(*) AS c FROM listings GROUP BY species_id ORDER BY c DESC LIMIT 1") as cursor:
+                top = (await cursor.fetchone())['c']
+        self.assertGreater(top, 10 * counts['listings'] / counts['species'])
+
+    def test_zipf_weights(self):
+        weights = zipf_weights(3, 1.0)
+        self.assertAlmostEqual(weights[0], 1.0)
+        self.assertAlmostEqual(weights[-1], 1 + 1 / 2 + 1 / 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import patch
+import services.interaction_metrics as metrics_module
+from services.interaction_metrics import InteractionMetrics
+
+class FakeInteraction:
+    def __init__(self):
+        self.extras = {}
+
+class TestInteractionMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = InteractionMetrics()
+        self.clock = 100.0
+        patcher = patch.object(metrics_module.time, 'perf_counter', lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_defer_and_first_response(self):
+        interaction = FakeInteraction()
+        timing = self.metrics.begin(interaction, '/nabidka')
+        self.clock += 0.2
+        self.metrics.responded(interaction, 'defer')
+        self.clock += 1.0
+        self.metrics.responded(interaction, 'send_message') # followup-like, first response already set
+        self.clock += 0.5
+        self.metrics.finish(timing)
+
+        stats = self.metrics.snapshot()['/nabidka']
+        self.assertEqual(stats['count'], 1)
+        self.assertAlmostEqual(stats['defer']['p50'], 0.2)
+        self.assertAlmostEqual(stats['first_response']['p50'], 0.2)
+        self.assertAlmostEqual(stats['max'], 1.7)
+        self.assertEqual(stats['late'], 0)
+
+    def test_late_unanswered_and_errors(self):
+        late = FakeInteraction()
+        timing = self.metrics.begin(late, 'TradeView')
+        self.clock += 3.5
+        self.metrics.responded(late, 'edit_message')
+        self.metrics.finish(timing)
+
+        silent = FakeInteraction()
+        timing = self.metrics.begin(silent, 'TradeView')
+        self.metrics.mark_error(silent)
+        self.metrics.finish(timing)
+
+        stats = self.metrics.snapshot()['TradeView']
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['late'], 1)
+        self.assertEqual(stats['unanswered'], 1)
+        self.assertEqual(stats['defer']['p50'], 0.0)
+
+    def test_untracked_interaction_ignored(self):
+        self.metrics.responded(FakeInteraction(), 'defer')
+        self.assertEqual(self.metrics.snapshot(), {})
+
+if __name__ == '__main__':
+    unittest.main()
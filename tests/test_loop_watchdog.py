@@ -0,0 +1,37 @@
+import asyncio
+import time
+import unittest
+from services.loop_watchdog import LoopWatchdog
+
+def busy_parse():
+    time.sleep(0.3)
+
+class TestLoopWatchdog(unittest.IsolatedAsyncioTestCase):
+    async def test_blocking_call_is_attributed(self):
+        watchdog = LoopWatchdog(threshold=0.1, interval=0.02)
+        watchdog.start()
+        try:
+            await asyncio.sleep(0.1)
+            busy_parse()
+            await asyncio.sleep(0.2)
+        finally:
+            watchdog.stop()
+
+        top = watchdog.top()
+        self.assertEqual(watchdog.blocks, 1)
+        self.assertIn("tests/test_loop_watchdog.py", top[0].key)
+        self.assertIn("busy_parse", top[0].key)
+        self.assertGreaterEqual(top[0].max, 0.15)
+        self.assertTrue(any("time.sleep" in line for line in top[0].stack))
+
+    async def test_no_blocks_when_idle(self):
+        watchdog = LoopWatchdog(threshold=0.1, interval=0.02)
+        watchdog.start()
+        try:
+            await asyncio.sleep(0.2)
+        finally:
+            watchdog.stop()
+        self.assertEqual(watchdog.top(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import time
+import unittest
+import database
+import services.match_queue as match_queue
+from benchmarks.fake_discord import FakeAPI, FakeBot as FakeDiscordBot, FakeGuild, FakeUser
+from cogs.listings import Listings
+from services.match_queue import MatchQueue
+
+class FakeBot:
+    async def wait_until_ready(self):
+        return
+
+class TestMatchQueue(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.original_db_name = database.DB_NAME
+        database.DB_NAME = "test_match_queue.db"
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        await database.init_db()
+
+    async def asyncTearDown(self):
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        database.DB_NAME = self.original_db_name
+
+    async def test_claim_is_exclusive_and_survives_restart(self):
+        now = time.time()
+        await database.enqueue_matches([(1, 10), (2, 10)], now)
+
+        first = await database.claim_match_jobs(now, limit=1)
+        second = await database.claim_match_jobs(now, limit=5)
+        self.assertEqual([j['listing_id'] for j in first], [1])
+        self.assertEqual([j['listing_id'] for j in second], [2])
+        self.assertEqual(await database.claim_match_jobs(now), [])
+
+        # Crash before completing -> jobs are released on next start
+        self.assertEqual(await database.release_match_jobs(), 2)
+        stats = await database.get_match_queue_stats(now)
+        self.assertEqual((stats['queued'], stats['due'], stats['claimed']), (2, 2, 0))
+
+    async def test_workers_process_and_retry(self):
+        calls = []
+        done = asyncio.Event()
+
+        async def handler(job):
+            calls.append((job['listing_id'], job['attempts']))
+            if job['listing_id'] == 2:
+                raise RuntimeError("discord down")
+            done.set()
+
+        queue = MatchQueue(FakeBot(), handler, workers=2)
+        await queue.start()
+        try:
+            await queue.enqueue_many([(1, 10), (2, 10)])
+            await asyncio.wait_for(done.wait(), timeout=5)
+            # Let the failing job be rescheduled
+            for _ in range(50):
+                if queue.failed:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await queue.stop()
+
+        self.assertIn((1, 0), calls)
+        self.assertIn((2, 0), calls)
+        stats = await queue.stats()
+        self.assertEqual(stats['processed'], 1)
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(stats['queued'], 1)
+        self.assertEqual(stats['retrying'], 1)
+        self.assertEqual(stats['due'], 0)
+
+        async with database.get_db() as db:
+            async with db.execute("SELECT * FROM match_queue") as cursor:
+                job = await cursor.fetchone()
+        self.assertEqual(job['listing_id'], 2)
+        self.assertEqual(job['last_error'], "discord down")
+        self.assertGreater(job['available_at'], time.time() + match_queue.RETRY_BASE_DELAY - 5)
+
+    async def test_dropped_job_cancels_its_trade(self):
+        species_id = await database.upsert_pokemon_species(25, "Pikachu", "Normal", "Electric")
+        await database.add_user_account(user_id=1, friend_code="111111111111", team="Mystic", region="Praha", account_name="Ash")
+        await database.add_user_account(user_id=2, friend_code="222222222222", team="Valor", region="Brno", account_name="Misty")
+        have = await database.add_listing(1, (await database.get_user_accounts(1))[0]['id'], 'HAVE', species_id, guild_id=10)
+        want = await database.add_listing(2, (await database.get_user_accounts(2))[0]['id'], 'WANT', species_id, guild_id=10)
+
+        now = time.time()
+        await database.enqueue_matches([(have, 10)], now)
+        async with database.get_db() as db:
+            await db.execute("UPDATE match_queue SET attempts = ?", (match_queue.MAX_ATTEMPTS - 1,))
+            await db.commit()
+        job = (await database.claim_match_jobs(now))[0]
+
+        async def handler(job):
+            # Trade created, then the channel setup fails
+            for listing_id in (have, want):
+                await database.update_listing_status(listing_id, 'PENDING')
+            trade_id = await database.create_trade(have, want, None)
+            await database.set_match_job_trade(have, trade_id)
+            raise RuntimeError("missing permissions")
+
+        queue = MatchQueue(FakeBot(), handler)
+        await queue._run(job)
+
+        self.assertEqual(queue.dropped, 1)
+        self.assertEqual((await queue.stats())['queued'], 0)
+        async with database.get_db() as db:
+            async with db.execute("SELECT status FROM trades") as cursor:
+                self.assertEqual([t['status'] for t in await cursor.fetchall()], ['CLOSED'])
+        for listing_id in (have, want):
+            self.assertEqual((await database.get_listing(listing_id))['status'], 'ACTIVE')
+
+    async def test_failed_channel_setup_retries_without_second_channel(self):
+        api = FakeAPI(latency=0)
+        bot = FakeDiscordBot(api)
+        guild = FakeGuild(api)
+        bot.add_guild(guild)
+        species_id = await database.upsert_pokemon_species(25, "Pikachu", "Normal", "Electric")
+        listings = {}
+        for user_id, listing_type in ((1, 'HAVE'), (2, 'WANT')):
+            guild.add_member(FakeUser(user_id))
+            await database.add_user_account(user_id=user_id, friend_code=f"{user_id:012d}", team="Mystic", region="Praha", account_name=f"T{user_id}")
+            account_id = (await database.get_user_accounts(user_id))[0]['id']
+            listings[listing_type] = await database.add_listing(user_id, account_id, listing_type, species_id, guild_id=guild.id)
+
+        cog = Listings(bot)
+        await database.enqueue_matches([(listings['WANT'], guild.id)], time.time())
+        job = (await database.claim_match_jobs(time.time()))[0]
+
+        # The channel gets created, then the welcome message fails
+        create_text_channel = guild.create_text_channel
+        async def create_broken_channel(*args, **kwargs):
+            channel = await create_text_channel(*args, **kwargs)
+            async def send(*args, **kwargs):
+                raise RuntimeError("missing access")
+            channel.send = send
+            return channel
+        guild.create_text_channel = create_broken_channel
+        with self.assertRaises(RuntimeError):
+            await cog._process_match_job(job)
+        self.assertEqual(guild.channels, {})
+
+        # Retry: the trade exists already and gets exactly one channel
+        guild.create_text_channel = create_text_channel
+        async with database.get_db() as db:
+            async with db.execute("SELECT * FROM match_queue") as cursor:
+                job = await cursor.fetchone()
+        self.assertIsNotNone(job['trade_id'])
+        await cog._process_match_job(job)
+        self.assertEqual(len(guild.channels), 1)
+        trade = await database.get_trade(job['trade_id'])
+        self.assertEqual(trade['channel_id'], next(iter(guild.channels)))
+
+if __name__ == '__main__':
+    unittest.main()
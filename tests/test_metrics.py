@@ -0,0 +1,63 @@
+import unittest
+from services.metrics import Counter, Gauge, Histogram, Registry, TASK_RUNS, track_loop
+
+class TestMetricsRegistry(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_counter_and_gauge_render(self):
+        counter = Counter('test_requests_total', 'Requests.', ['result'], registry=self.registry)
+        counter.inc(result='ok')
+        counter.inc(2, result='ok')
+        counter.inc(result='e"rr')
+        gauge = Gauge('test_depth', 'Depth.', registry=self.registry)
+        gauge.set_function(lambda: 7)
+
+        text = self.registry.render()
+        self.assertIn('# TYPE test_requests_total counter', text)
+        self.assertIn('test_requests_total{result="ok"} 3.0', text)
+        self.assertIn('test_requests_total{result="e\\"rr"} 1.0', text)
+        self.assertIn('test_depth 7.0', text)
+        with self.assertRaises(ValueError):
+            counter.inc(status='ok')
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram('test_seconds', 'Durations.', ['stage'], registry=self.registry, buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 5.0):
+            histogram.observe(value, stage='render')
+
+        text = self.registry.render()
+        self.assertIn('test_seconds_bucket{stage="render",le="0.1"} 1', text)
+        self.assertIn('test_seconds_bucket{stage="render",le="1.0"} 3', text)
+        self.assertIn('test_seconds_bucket{stage="render",le="+Inf"} 4', text)
+        self.assertIn('test_seconds_count{stage="render"} 4', text)
+        self.assertEqual(histogram.get(stage='render')[0], 4)
+
+    async def test_collectors_run_before_render(self):
+        gauge = Gauge('test_queue', 'Queue.', ['state'], registry=self.registry)
+
+        async def collect():
+            gauge.set(3, state='due')
+
+        async def broken():
+            raise RuntimeError("db down")
+
+        self.registry.add_collector(broken)
+        self.registry.add_collector(collect)
+        await self.registry.collect()
+        self.assertIn('test_queue{state="due"} 3', self.registry.render())
+
+    async def test_track_loop(self):
+        @track_loop('test_loop')
+        async def iteration(fail):
+            if fail:
+                raise RuntimeError("boom")
+
+        await iteration(False)
+        with self.assertRaises(RuntimeError):
+            await iteration(True)
+        self.assertEqual(TASK_RUNS.get(task='test_loop', result='ok'), 1)
+        self.assertEqual(TASK_RUNS.get(task='test_loop', result='error'), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import sys
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 # Mock dependencies before importing the cog
 mock_discord = MagicMock()
@@ -12,14 +12,17 @@ class MockCog:
 
 mock_discord.ext.commands.Cog = MockCog
 
-sys.modules["discord"] = mock_discord
-sys.modules["discord.app_commands"] = mock_discord.app_commands
-sys.modules["discord.ext"] = mock_discord.ext
-sys.modules["discord.ext.commands"] = mock_discord.ext.commands
-sys.modules["database"] = mock_database
+mocked_modules = {
+    "discord": mock_discord,
+    "discord.app_commands": mock_discord.app_commands,
+    "discord.ext": mock_discord.ext,
+    "discord.ext.commands": mock_discord.ext.commands,
+    "database": mock_database,
+}
 
-# Now we can import Pokedex
-from cogs.pokedex import Pokedex
+# Now we can import Pokedex (mocks are removed again afterwards so other test modules get the real ones)
+with patch.dict(sys.modules, mocked_modules):
+    from cogs.pokedex import Pokedex
 import unittest
 
 class TestPokedexColors(unittest.TestCase):
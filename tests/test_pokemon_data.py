@@ -0,0 +1,34 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from data.pokemon_build import build_database, is_stale
+from data.pokemon_source import POKEMON_NAMES as SOURCE_NAMES
+
+class TestPokemonData(unittest.TestCase):
+    def test_build_and_staleness(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "pokemon.db")
+            self.assertTrue(is_stale(db_path))
+            self.assertEqual(build_database(db_path), len(SOURCE_NAMES))
+            self.assertFalse(is_stale(db_path))
+
+            conn = sqlite3.connect(db_path)
+            try:
+                row = conn.execute("SELECT id, name, shiny_url FROM pokemon WHERE name = 'Pikachu'").fetchone()
+            finally:
+                conn.close()
+            self.assertEqual(row[:2], (25, 'Pikachu'))
+            self.assertIn('shiny', row[2])
+
+    def test_lazy_mappings(self):
+        from data.pokemon import POKEMON_NAMES, POKEMON_IDS, POKEMON_IMAGES
+        self.assertEqual(POKEMON_NAMES['Pikachu'], 25)
+        self.assertEqual(POKEMON_IDS.get(25), 'Pikachu')
+        self.assertIsNone(POKEMON_IDS.get(99999))
+        self.assertEqual(POKEMON_IMAGES[1]['name'], 'Bulbasaur')
+        self.assertEqual(len(POKEMON_IDS), len(SOURCE_NAMES))
+        self.assertEqual(dict(POKEMON_NAMES), SOURCE_NAMES)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import os
+import shutil
+import tempfile
+import unittest
+from services.qr_cache import QRCache
+
+class TestQRCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = QRCache(cache_dir=self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_formats_do_not_share_a_file(self):
+        spaced = self.cache.get_png("1234 5678 9012")
+        dashed = self.cache.get_png("1234-5678-9012")
+        self.assertNotEqual(self.cache._path("1234 5678 9012"), self.cache._path("1234-5678-9012"))
+        # Served from disk: each format still gets its own render back
+        self.assertEqual(self.cache.get_png("1234 5678 9012"), spaced)
+        self.assertEqual(self.cache.get_png("1234-5678-9012"), dashed)
+        self.assertNotIn("1234", os.path.basename(self.cache._path("1234 5678 9012")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,9 @@
 import asyncio
+import os
 import unittest
 from unittest.mock import MagicMock, patch, AsyncMock
 import database
+import migrations
 
 class TestDatabaseSchema(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
@@ -41,5 +43,45 @@ class TestDatabaseSchema(unittest.IsolatedAsyncioTestCase):
         listing_2 = await database.get_listing(l_id_2)
         self.assertEqual(listing_2['count'], 5)
 
+class TestSchemaVersion(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.original_db_name = database.DB_NAME
+        database.DB_NAME = "test_schema_version.db"
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+
+    async def asyncTearDown(self):
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        database.DB_NAME = self.original_db_name
+
+    async def test_current_schema_skips_migrations(self):
+        await database.init_db()
+        async with database.get_db() as db:
+            async with db.execute("SELECT version FROM schema_version") as cursor:
+                self.assertEqual([r['version'] for r in await cursor.fetchall()], [m.version for m in migrations.MIGRATIONS])
+            await db.execute("DROP INDEX idx_start_time")
+            await db.commit()
+
+        # Second start takes the fast path: nothing is re-created
+        await database.init_db()
+        async with database.get_db() as db:
+            async with db.execute("SELECT name FROM sqlite_master WHERE name = 'idx_start_time'") as cursor:
+                self.assertIsNone(await cursor.fetchone())
+        self.assertTrue(database._users_fts_enabled)
+
+    async def test_failed_migration_rolls_back(self):
+        async def broken(db):
+            await db.execute("CREATE TABLE half_done (id INTEGER)")
+            raise RuntimeError("boom")
+
+        steps = migrations.MIGRATIONS + [migrations.Migration(migrations.LATEST_VERSION + 1, "broken", broken)]
+        async with database.get_db() as db:
+            with self.assertRaises(RuntimeError):
+                await migrations.migrate(db, steps)
+            async with db.execute("SELECT name FROM sqlite_master WHERE name = 'half_done'") as cursor:
+                self.assertIsNone(await cursor.fetchone())
+            self.assertEqual([m.version for m in await migrations._pending(db, steps)], [migrations.LATEST_VERSION + 1])
+
 if __name__ == '__main__':
     unittest.main()
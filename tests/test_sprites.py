@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from PIL import Image
+from services.sprites import SpriteStore, sprite_filename, resolve_sprite_url, species_sprite_targets
+
+def png_bytes():
+    buf = BytesIO()
+    Image.new('RGBA', (4, 4), (255, 0, 0, 255)).save(buf, format='PNG')
+    return buf.getvalue()
+
+class TestSprites(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SpriteStore(sprite_dir=self.tmp.name, manifest_file=os.path.join(self.tmp.name, "manifest.json"))
+
+    async def asyncTearDown(self):
+        await self.store.close()
+        self.tmp.cleanup()
+
+    def test_filename_and_url(self):
+        self.assertEqual(sprite_filename(25, "Normal", None, True), "v1_25_normal_none_shiny.png")
+        costumes = json.dumps([{'name': 'Party Hat', 'image_url': 'c', 'shiny_image_url': 'cs'}])
+        self.assertEqual(resolve_sprite_url('n', 's', costumes, 'Party Hat', True), 'cs')
+        self.assertEqual(resolve_sprite_url('n', 's', costumes, None, True), 's')
+        self.assertEqual(resolve_sprite_url('n', None, None, None, True), 'n')
+
+        species = {'pokedex_num': 25, 'form': 'Normal', 'image_url': 'n', 'shiny_image_url': 's', 'costumes': costumes}
+        targets = dict(species_sprite_targets(species))
+        self.assertEqual(len(targets), 4)
+        self.assertEqual(targets["v1_25_normal_party_hat_shiny.png"], 'cs')
+
+    async def test_manifest_integrity(self):
+        self.store._store_sync("a.png", "url_a", png_bytes())
+        self.assertTrue(self.store.has("a.png", "url_a"))
+        self.assertFalse(self.store.has("a.png", "other_url"))
+
+        await self.store.save_manifest()
+        reloaded = SpriteStore(sprite_dir=self.store.sprite_dir, manifest_file=self.store.manifest_file)
+        self.assertTrue(reloaded.has("a.png"))
+
+        # Corrupt the file -> verify drops it
+        with open(self.store.path_for("a.png"), 'wb') as f:
+            f.write(b"garbage")
+        self.assertEqual(reloaded._verify_sync(), 1)
+        self.assertFalse(reloaded.has("a.png"))
+
+    async def test_rejects_non_image(self):
+        with self.assertRaises(Exception):
+            self.store._store_sync("b.png", "url_b", b"<html>not found</html>")
+        self.assertFalse(self.store.has("b.png"))
+
+if __name__ == '__main__':
+    unittest.main()
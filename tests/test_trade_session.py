@@ -0,0 +1,73 @@
+import os
+import unittest
+import database
+from services.trade_sessions import TradeSessionCache
+
+class TestTradeSession(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.original_db_name = database.DB_NAME
+        database.DB_NAME = "test_trade_session.db"
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        await database.init_db()
+
+        species_id = await database.upsert_pokemon_species(25, "Pikachu", "Normal", "Electric")
+        await database.add_user_account(user_id=1, friend_code="111111111111", team="Mystic", region="Praha", account_name="Ash")
+        await database.add_user_account(user_id=2, friend_code="222222222222", team="Valor", region="Brno", account_name="Misty")
+        acc1 = (await database.get_user_accounts(1))[0]['id']
+        acc2 = (await database.get_user_accounts(2))[0]['id']
+
+        self.have = await database.add_listing(1, acc1, 'HAVE', species_id, guild_id=10, count=2)
+        self.want = await database.add_listing(2, acc2, 'WANT', species_id, guild_id=10)
+        for listing_id in (self.have, self.want):
+            await database.update_listing_status(listing_id, 'PENDING')
+        self.trade_id = await database.create_trade(self.have, self.want, 900)
+
+    async def asyncTearDown(self):
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        database.DB_NAME = self.original_db_name
+
+    async def test_context_single_query(self):
+        trade, listing_a, listing_b = await database.get_trade_context(900)
+        self.assertEqual(trade['id'], self.trade_id)
+        self.assertEqual(trade['status'], 'OPEN')
+        self.assertEqual(listing_a['id'], self.have)
+        self.assertEqual(listing_a['friend_code'], "111111111111")
+        self.assertEqual(listing_b['pokemon_name'], "Pikachu")
+        self.assertEqual(listing_b['status'], 'PENDING')
+        self.assertEqual(await database.get_trade_context(999), (None, None, None))
+
+    async def test_cache_and_invalidation(self):
+        cache = TradeSessionCache()
+        session = await cache.get(900)
+        self.assertEqual(session.participants, {1, 2})
+        self.assertIs(await cache.get(900), session)
+
+        cache.invalidate_listing(self.want)
+        self.assertIsNot(await cache.get(900), session)
+
+    async def test_cancel_and_complete_transactions(self):
+        self.assertTrue(await database.cancel_trade(self.trade_id))
+        self.assertEqual((await database.get_listing(self.have))['status'], 'ACTIVE')
+        # Second click: already closed
+        self.assertFalse(await database.cancel_trade(self.trade_id))
+
+        trade_id = await database.create_trade(self.have, self.want, 901)
+        result = await database.complete_trade(trade_id)
+        self.assertEqual([(l['id'], l['count'], l['deleted']) for l in result],
+                         [(self.have, 1, False), (self.want, 0, True)])
+        have = await database.get_listing(self.have)
+        self.assertEqual((have['count'], have['status']), (1, 'ACTIVE'))
+        self.assertIsNone(await database.get_listing(self.want))
+
+    async def test_complete_double_click(self):
+        await database.update_listing_count(self.want, 3)
+        self.assertIsNotNone(await database.complete_trade(self.trade_id))
+        # Both listings keep stock, so the trade row survives; a second click must not decrement again
+        self.assertIsNone(await database.complete_trade(self.trade_id))
+        self.assertEqual((await database.get_listing(self.have))['count'], 1)
+        self.assertEqual((await database.get_listing(self.want))['count'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import unittest
+import database
+
+class TestUserSearch(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.original_db_name = database.DB_NAME
+        database.DB_NAME = "test_user_search.db"
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        await database.init_db()
+
+        await database.add_user_account(user_id=1, friend_code="111122223333", team="Mystic", region="Praha", account_name="AshKetchum")
+        await database.add_user_account(user_id=2, friend_code="444455556666", team="Valor", region="Brno", account_name="Ash")
+        await database.add_user_account(user_id=3, friend_code="777788889999", team="Instinct", region="Ostrava", account_name="Misty")
+
+    async def asyncTearDown(self):
+        if os.path.exists(database.DB_NAME):
+            os.remove(database.DB_NAME)
+        database.DB_NAME = self.original_db_name
+
+    async def test_ranked_search(self):
+        self.assertTrue(database._users_fts_enabled)
+
+        results = await database.search_user_accounts("ash")
+        self.assertEqual([r['account_name'] for r in results][0], "Ash")
+        self.assertEqual(results[0]['exact_match'], 1)
+        self.assertEqual({r['account_name'] for r in results}, {"Ash", "AshKetchum"})
+
+        # Friend code, limit pushed into SQL
+        self.assertEqual([r['user_id'] for r in await database.search_user_accounts("5555")], [2])
+        self.assertEqual(len(await database.search_user_accounts("ash", limit=1)), 1)
+
+        # Short query -> LIKE fallback
+        self.assertEqual({r['account_name'] for r in await database.search_user_accounts("st")}, {"Misty"})
+
+        # FTS syntax in user input is treated as text
+        self.assertEqual(await database.search_user_accounts('as" OR "mi'), [])
+
+    async def test_index_follows_updates(self):
+        accounts = await database.get_user_accounts(3)
+        await database.update_user_account(accounts[0]['id'], account_name="Brock")
+
+        self.assertEqual(await database.search_user_accounts("Misty"), [])
+        self.assertEqual([r['user_id'] for r in await database.search_user_accounts("brock")], [3])
+
+        async with database.get_db() as db:
+            await db.execute("DELETE FROM users WHERE id = ?", (accounts[0]['id'],))
+            await db.commit()
+        self.assertEqual(await database.search_user_accounts("brock"), [])
+
+if __name__ == '__main__':
+    unittest.main()